@@ -34,6 +34,12 @@ AGENT_STATE_OPTS = [
                  help=_('Seconds between nodes reporting state to server; '
                         'should be less than agent_down_time, best if it '
                         'is half or less than agent_down_time.')),
+    cfg.BoolOpt('use_reports_topic', default=False,
+                help=_('Send state reports to the dedicated state reports '
+                       'RPC topic instead of the plugin topic, so that they '
+                       'are not queued behind other agent requests. '
+                       'Requires a plugin consuming that topic, such as '
+                       'ML2.')),
 ]
 
 INTERFACE_DRIVER_OPTS = [
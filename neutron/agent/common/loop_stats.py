@@ -0,0 +1,181 @@
+# Copyright 2014 OpenStack Foundation.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import contextlib
+import cProfile
+import heapq
+import os
+import time
+
+from neutron.agent.linux import utils
+from neutron.openstack.common import jsonutils
+from neutron.openstack.common import log as logging
+
+
+LOG = logging.getLogger(__name__)
+
+
+class IterationStats(object):
+    """Phase timings and counters collected for one loop iteration.
+
+    Phases may be entered more than once per iteration; their elapsed
+    times are summed. Phases whose name starts with 'rpc_' are reported
+    separately as RPC latencies.
+    """
+
+    def __init__(self, iter_num):
+        self.iter_num = iter_num
+        self.start = time.time()
+        self.elapsed = None
+        self.phases = collections.defaultdict(float)
+        self.counters = collections.defaultdict(int)
+        self._process_count = utils.get_process_count()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.time() - start
+
+    def incr(self, name, count=1):
+        self.counters[name] += count
+
+    def finish(self):
+        self.elapsed = time.time() - self.start
+        self.counters['subprocesses'] += (utils.get_process_count() -
+                                          self._process_count)
+
+    def to_dict(self):
+        rpc = dict((name[len('rpc_'):], elapsed)
+                   for name, elapsed in self.phases.items()
+                   if name.startswith('rpc_'))
+        phases = dict((name, elapsed) for name, elapsed in self.phases.items()
+                      if not name.startswith('rpc_'))
+        return {'iteration': self.iter_num,
+                'start': self.start,
+                'elapsed': self.elapsed,
+                'phases': phases,
+                'rpc': rpc,
+                'counters': dict(self.counters)}
+
+
+class NullIterationStats(IterationStats):
+    """Stand-in used outside of a collected iteration."""
+
+    def __init__(self):
+        super(NullIterationStats, self).__init__(None)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        yield
+
+    def incr(self, name, count=1):
+        pass
+
+
+class LoopStatsCollector(object):
+    """Collects per-iteration statistics of an agent processing loop.
+
+    Each finished iteration is kept in a bounded history and, when
+    stats_file is set, appended to it as a line of JSON. When
+    profile_slowest is positive every iteration runs under cProfile and
+    the profiles of the N slowest iterations seen so far are kept in
+    profile_dir as '<name>-<iteration>.prof'.
+    """
+
+    def __init__(self, name, stats_file=None, profile_slowest=0,
+                 profile_dir=None, history_size=100):
+        self.name = name
+        self.stats_file = stats_file
+        self.profile_slowest = profile_slowest
+        self.profile_dir = profile_dir
+        self.history = collections.deque(maxlen=history_size)
+        self.current = NullIterationStats()
+        self._profiler = None
+        # heap of (elapsed, iteration, path) for the retained profiles
+        self._profiles = []
+        if self.profile_slowest > 0 and not self.profile_dir:
+            LOG.warning(_("No profile directory configured for %s, "
+                          "iteration profiling disabled"), name)
+            self.profile_slowest = 0
+
+    def start_iteration(self, iter_num):
+        self.current = IterationStats(iter_num)
+        if self.profile_slowest > 0:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self.current
+
+    def finish_iteration(self):
+        stats = self.current
+        if isinstance(stats, NullIterationStats):
+            return
+        if self._profiler:
+            self._profiler.disable()
+        stats.finish()
+        self.history.append(stats)
+        if self._profiler:
+            self._save_profile(stats, self._profiler)
+            self._profiler = None
+        if self.stats_file:
+            self._write_stats(stats)
+        self.current = NullIterationStats()
+        return stats
+
+    def _write_stats(self, stats):
+        try:
+            with open(self.stats_file, 'a') as f:
+                f.write(jsonutils.dumps(stats.to_dict()) + '\n')
+        except (IOError, OSError) as e:
+            LOG.warning(_("Unable to write %(name)s loop stats to "
+                          "%(file)s: %(error)s"),
+                        {'name': self.name, 'file': self.stats_file,
+                         'error': e})
+
+    def _save_profile(self, stats, profiler):
+        entry = (stats.elapsed, stats.iter_num,
+                 os.path.join(self.profile_dir, '%s-%s.prof' %
+                              (self.name, stats.iter_num)))
+        if len(self._profiles) >= self.profile_slowest:
+            if entry[0] <= self._profiles[0][0]:
+                return
+            evicted = heapq.heapreplace(self._profiles, entry)
+            self._remove_profile(evicted[2])
+        else:
+            heapq.heappush(self._profiles, entry)
+        try:
+            if not os.path.isdir(self.profile_dir):
+                os.makedirs(self.profile_dir, 0o755)
+            profiler.dump_stats(entry[2])
+        except (IOError, OSError) as e:
+            LOG.warning(_("Unable to save profile of %(name)s iteration "
+                          "%(iter)s: %(error)s"),
+                        {'name': self.name, 'iter': stats.iter_num,
+                         'error': e})
+
+    @staticmethod
+    def _remove_profile(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    @property
+    def slowest_profiles(self):
+        """Paths of the retained profiles, slowest iteration first."""
+        return [path for _elapsed, _iter, path in
+                sorted(self._profiles, reverse=True)]
@@ -15,6 +15,7 @@
 
 import sys
 
+import collections
 import datetime
 import eventlet
 eventlet.monkey_patch()
@@ -443,8 +444,10 @@ class L3NATAgent(firewall_l3_agent.FWaaSL3AgentRpcCallback, manager.Manager):
               - add_arp_entry
               - del_arp_entry
               Needed by the L3 service when dealing with DVR
+        1.3 - update_arp_entries: a batch of DVR ARP entry updates for
+              one router.
     """
-    RPC_API_VERSION = '1.2'
+    RPC_API_VERSION = '1.3'
 
     OPTS = [
         cfg.StrOpt('agent_mode', default='legacy',
@@ -471,6 +474,11 @@ class L3NATAgent(firewall_l3_agent.FWaaSL3AgentRpcCallback, manager.Manager):
                    default=3,
                    help=_("Send this many gratuitous ARPs for HA setup, if "
                           "less than or equal to 0, the feature is disabled")),
+        cfg.IntOpt('send_arp_rate_limit',
+                   default=100,
+                   help=_("Maximum number of addresses per second for which "
+                          "gratuitous ARPs are started. Less than or equal "
+                          "to 0 means no limit.")),
         cfg.StrOpt('router_id', default='',
                    help=_("If namespaces is disabled, the l3 agent can only"
                           " configure a router that has the matching router "
@@ -543,6 +551,9 @@ class L3NATAgent(firewall_l3_agent.FWaaSL3AgentRpcCallback, manager.Manager):
         self.fip_priorities = set(range(FIP_PR_START, FIP_PR_END))
 
         self._queue = RouterProcessingQueue()
+        # Gratuitous ARPs waiting to be sent by the single GARP sender
+        self._garp_queue = collections.OrderedDict()
+        self._garp_sender_running = False
         super(L3NATAgent, self).__init__(conf=self.conf)
 
         self.target_ex_net_id = None
@@ -794,14 +805,13 @@ class L3NATAgent(firewall_l3_agent.FWaaSL3AgentRpcCallback, manager.Manager):
             self.plugin_rpc.get_ports_by_subnet(self.context,
                                                 subnet_id))
 
-        for p in subnet_ports:
-            if (p['device_owner'] not in (
-                l3_constants.DEVICE_OWNER_ROUTER_INTF,
-                l3_constants.DEVICE_OWNER_DVR_INTERFACE)):
-                for fixed_ip in p['fixed_ips']:
-                    self._update_arp_entry(ri, fixed_ip['ip_address'],
-                                           p['mac_address'],
-                                           subnet_id, 'add')
+        self._update_arp_entries(
+            ri, [(fixed_ip['ip_address'], p['mac_address'], subnet_id, 'add')
+                 for p in subnet_ports
+                 if p['device_owner'] not in (
+                     l3_constants.DEVICE_OWNER_ROUTER_INTF,
+                     l3_constants.DEVICE_OWNER_DVR_INTERFACE)
+                 for fixed_ip in p['fixed_ips']])
 
     def _set_subnet_info(self, port):
         ips = port['fixed_ips']
@@ -1006,19 +1016,14 @@ class L3NATAgent(firewall_l3_agent.FWaaSL3AgentRpcCallback, manager.Manager):
 
         Configures iptables rules for the floating ips of the given router
         """
-        # Clear out all iptables rules for floating ips
-        ri.iptables_manager.ipv4['nat'].clear_rules_by_tag('floating_ip')
-
-        floating_ips = self.get_floating_ips(ri)
-        # Loop once to ensure that floating ips are configured.
-        for fip in floating_ips:
-            # Rebuild iptables rules for the floating ip.
+        rules = []
+        for fip in self.get_floating_ips(ri):
             fixed = fip['fixed_ip_address']
             fip_ip = fip['floating_ip_address']
-            for chain, rule in self.floating_forward_rules(fip_ip, fixed):
-                ri.iptables_manager.ipv4['nat'].add_rule(chain, rule,
-                                                         tag='floating_ip')
+            rules.extend(self.floating_forward_rules(fip_ip, fixed))
 
+        # Only the rules of added or removed floating ips are touched
+        ri.iptables_manager.ipv4['nat'].set_rules_by_tag('floating_ip', rules)
         ri.iptables_manager.apply()
 
     def process_router_floating_ip_addresses(self, ri, ex_gw_port):
@@ -1052,47 +1057,87 @@ class L3NATAgent(firewall_l3_agent.FWaaSL3AgentRpcCallback, manager.Manager):
                                  namespace=ri.ns_name)
         existing_cidrs = set([addr['cidr'] for addr in device.addr.list()])
         new_cidrs = set()
+        added_fips = []
 
-        # Loop once to ensure that floating ips are configured.
         for fip in floating_ips:
-            fip_ip = fip['floating_ip_address']
-            ip_cidr = str(fip_ip) + FLOATING_IP_CIDR_SUFFIX
-
+            ip_cidr = str(fip['floating_ip_address']) + FLOATING_IP_CIDR_SUFFIX
             new_cidrs.add(ip_cidr)
-
             if ip_cidr not in existing_cidrs:
-                net = netaddr.IPNetwork(ip_cidr)
-                try:
-                    device.addr.add(net.version, ip_cidr, str(net.broadcast))
-                except (processutils.UnknownArgumentError,
-                        processutils.ProcessExecutionError):
-                    # any exception occurred here should cause the floating IP
-                    # to be set in error state
-                    fip_statuses[fip['id']] = (
-                        l3_constants.FLOATINGIP_STATUS_ERROR)
-                    LOG.warn(_("Unable to configure IP address for "
-                               "floating IP: %s"), fip['id'])
-                    continue
-                if ri.router['distributed']:
-                    # Special Handling for DVR - update FIP namespace
-                    # and ri.namespace to handle DVR based FIP
-                    self.floating_ip_added_dist(ri, fip)
-                else:
-                    # As GARP is processed in a distinct thread the call below
-                    # won't raise an exception to be handled.
-                    self._send_gratuitous_arp_packet(
-                        ri.ns_name, interface_name, fip_ip)
+                added_fips.append((fip, ip_cidr))
             fip_statuses[fip['id']] = (
                 l3_constants.FLOATINGIP_STATUS_ACTIVE)
 
-        # Clean up addresses that no longer belong on the gateway interface.
-        for ip_cidr in existing_cidrs - new_cidrs:
-            if ip_cidr.endswith(FLOATING_IP_CIDR_SUFFIX):
+        # Addresses that no longer belong on the gateway interface.
+        removed_cidrs = [ip_cidr for ip_cidr in existing_cidrs - new_cidrs
+                         if ip_cidr.endswith(FLOATING_IP_CIDR_SUFFIX)]
+        failed_cidrs = self._update_floating_ip_addresses(
+            ri, device, interface_name,
+            [ip_cidr for fip, ip_cidr in added_fips], removed_cidrs)
+
+        for fip, ip_cidr in added_fips:
+            if ip_cidr in failed_cidrs:
+                # any exception occurred here should cause the floating IP
+                # to be set in error state
+                fip_statuses[fip['id']] = l3_constants.FLOATINGIP_STATUS_ERROR
+                LOG.warn(_("Unable to configure IP address for "
+                           "floating IP: %s"), fip['id'])
+                continue
+            if ri.router['distributed']:
+                # Special Handling for DVR - update FIP namespace
+                # and ri.namespace to handle DVR based FIP
+                self.floating_ip_added_dist(ri, fip)
+            else:
+                # As GARP is processed in a distinct thread the call below
+                # won't raise an exception to be handled.
+                self._send_gratuitous_arp_packet(
+                    ri.ns_name, interface_name, fip['floating_ip_address'])
+
+        if ri.router['distributed']:
+            for ip_cidr in removed_cidrs:
+                self.floating_ip_removed_dist(ri, ip_cidr)
+        return fip_statuses
+
+    def _update_floating_ip_addresses(self, ri, device, interface_name,
+                                      added_cidrs, removed_cidrs):
+        """Add and remove floating ip addresses with a single ip call.
+
+        If the batch fails, the addresses that did not make it are retried
+        one at a time.  Returns the set of cidrs that could not be added.
+        """
+        commands = []
+        for ip_cidr in added_cidrs:
+            net = netaddr.IPNetwork(ip_cidr)
+            commands.append(('addr', 'add', ip_cidr, 'brd', str(net.broadcast),
+                             'scope', 'global', 'dev', interface_name))
+        for ip_cidr in removed_cidrs:
+            commands.append(('addr', 'del', ip_cidr, 'dev', interface_name))
+        if not commands:
+            return set()
+        try:
+            ip_wrapper = ip_lib.IPWrapper(self.root_helper,
+                                          namespace=ri.ns_name)
+            ip_wrapper.batch(commands)
+            return set()
+        except RuntimeError:
+            LOG.warn(_("Batched floating IP address update failed on %s, "
+                       "retrying one address at a time"), interface_name)
+
+        current_cidrs = set([addr['cidr'] for addr in device.addr.list()])
+        failed_cidrs = set()
+        for ip_cidr in added_cidrs:
+            if ip_cidr in current_cidrs:
+                continue
+            net = netaddr.IPNetwork(ip_cidr)
+            try:
+                device.addr.add(net.version, ip_cidr, str(net.broadcast))
+            except (RuntimeError, processutils.UnknownArgumentError,
+                    processutils.ProcessExecutionError):
+                failed_cidrs.add(ip_cidr)
+        for ip_cidr in removed_cidrs:
+            if ip_cidr in current_cidrs:
                 net = netaddr.IPNetwork(ip_cidr)
                 device.addr.delete(net.version, ip_cidr)
-                if ri.router['distributed']:
-                    self.floating_ip_removed_dist(ri, ip_cidr)
-        return fip_statuses
+        return failed_cidrs
 
     def _get_ex_gw_port(self, ri):
         return ri.router.get('gw_port')
@@ -1120,9 +1165,31 @@ class L3NATAgent(firewall_l3_agent.FWaaSL3AgentRpcCallback, manager.Manager):
 
     def _send_gratuitous_arp_packet(self, ns_name, interface_name, ip_address,
                                     distributed=False):
-        if self.conf.send_arp_for_ha > 0:
-            eventlet.spawn_n(self._arping, ns_name, interface_name, ip_address,
-                             distributed)
+        """Queue a gratuitous ARP for the GARP sender."""
+        if self.conf.send_arp_for_ha <= 0:
+            return
+        self._garp_queue[(ns_name, interface_name, ip_address,
+                          distributed)] = None
+        if not self._garp_sender_running:
+            self._garp_sender_running = True
+            eventlet.spawn_n(self._send_queued_gratuitous_arps)
+
+    def _send_queued_gratuitous_arps(self):
+        """Start the queued arpings, send_arp_rate_limit per second.
+
+        A burst of floating IPs queued by a router resync shares this one
+        sender instead of forking an arping thread per address at once.
+        Duplicate requests still waiting in the queue are sent only once.
+        """
+        rate = self.conf.send_arp_rate_limit
+        try:
+            while self._garp_queue:
+                args, _value = self._garp_queue.popitem(last=False)
+                eventlet.spawn_n(self._arping, *args)
+                if rate > 0:
+                    eventlet.sleep(1.0 / rate)
+        finally:
+            self._garp_sender_running = False
 
     def get_internal_port(self, ri, subnet_id):
         """Return internal router port based on subnet_id."""
@@ -1217,11 +1284,10 @@ class L3NATAgent(firewall_l3_agent.FWaaSL3AgentRpcCallback, manager.Manager):
                 if snat_ports:
                     self._create_dvr_gateway(ri, ex_gw_port, interface_name,
                                              snat_ports)
-            for port in snat_ports:
-                for ip in port['fixed_ips']:
-                    self._update_arp_entry(ri, ip['ip_address'],
-                                           port['mac_address'],
-                                           ip['subnet_id'], 'add')
+            self._update_arp_entries(
+                ri, [(ip['ip_address'], port['mac_address'],
+                      ip['subnet_id'], 'add')
+                     for port in snat_ports for ip in port['fixed_ips']])
             return
 
         # Compute a list of addresses this router is supposed to have.
@@ -1596,7 +1662,6 @@ class L3NATAgent(firewall_l3_agent.FWaaSL3AgentRpcCallback, manager.Manager):
         if 'id' in port:
             ip_cidr = str(ip) + '/32'
             try:
-                # TODO(mrsmith): optimize the calls below for bulk calls
                 net = netaddr.IPNetwork(ip_cidr)
                 interface_name = self.get_internal_device_name(port['id'])
                 device = ip_lib.IPDevice(interface_name, self.root_helper,
@@ -1609,6 +1674,39 @@ class L3NATAgent(firewall_l3_agent.FWaaSL3AgentRpcCallback, manager.Manager):
                 LOG.exception(_("DVR: Failed updating arp entry"))
                 self.fullsync = True
 
+    def _update_arp_entries(self, ri, entries):
+        """Add or delete several arp entries with a single ip call.
+
+        entries is a list of (ip, mac, subnet_id, operation) tuples, applied
+        in order inside the router namespace.
+        """
+        commands = []
+        interfaces = {}
+        for ip, mac, subnet_id, operation in entries:
+            if subnet_id not in interfaces:
+                port = self.get_internal_port(ri, subnet_id)
+                interfaces[subnet_id] = (
+                    self.get_internal_device_name(port['id'])
+                    if port and 'id' in port else None)
+            interface_name = interfaces[subnet_id]
+            if not interface_name:
+                continue
+            if operation == 'add':
+                commands.append(('neigh', 'replace', ip, 'lladdr', mac,
+                                 'nud', 'permanent', 'dev', interface_name))
+            elif operation == 'delete':
+                commands.append(('neigh', 'del', ip, 'lladdr', mac,
+                                 'dev', interface_name))
+        if not commands:
+            return
+        try:
+            ip_wrapper = ip_lib.IPWrapper(self.root_helper,
+                                          namespace=ri.ns_name)
+            ip_wrapper.batch(commands)
+        except Exception:
+            LOG.exception(_("DVR: Failed updating arp entries"))
+            self.fullsync = True
+
     def add_arp_entry(self, context, payload):
         """Add arp entry into router namespace.  Called from RPC."""
         arp_table = payload['arp_table']
@@ -1631,6 +1729,15 @@ class L3NATAgent(firewall_l3_agent.FWaaSL3AgentRpcCallback, manager.Manager):
         if ri:
             self._update_arp_entry(ri, ip, mac, subnet_id, 'delete')
 
+    def update_arp_entries(self, context, payload):
+        """Apply a batch of arp entry updates.  Called from RPC."""
+        ri = self.router_info.get(payload['router_id'])
+        if ri:
+            self._update_arp_entries(
+                ri, [(entry['ip_address'], entry['mac_address'],
+                      entry['subnet_id'], entry['operation'])
+                     for entry in payload['arp_entries']])
+
     def routers_updated(self, context, routers):
         """Deal with routers modification and creation RPC message."""
         LOG.debug(_('Got routers updated notification :%s'), routers)
@@ -14,6 +14,7 @@
 #
 # @author: Mark McClain, DreamHost
 import collections
+import time
 
 import eventlet
 from oslo.config import cfg
@@ -119,7 +120,10 @@ class ProcessManager(object):
 
     @property
     def active(self):
-        pid = self.pid
+        return self.is_active_pid(self.pid)
+
+    def is_active_pid(self, pid):
+        """Returns True if pid is a running process spawned for this uuid."""
         if pid is None:
             return False
 
@@ -156,6 +160,13 @@ class ProcessMonitor(object):
         self._exit_handler = exit_handler
 
         self._process_managers = {}
+        # service_id->pid of the monitored processes last seen alive, so
+        # that checks don't have to read the pid files again
+        self._pids = {}
+
+        self._respawn_count = 0
+        self._last_check_duration = 0
+        self._max_check_duration = 0
 
         if self._config.check_child_processes:
             self._spawn_checking_thread()
@@ -177,11 +188,13 @@ class ProcessMonitor(object):
         process_manager.enable(reload_cfg=reload_cfg)
         service_id = ServiceId(uuid, service)
         self._process_managers[service_id] = process_manager
+        self._pids.pop(service_id, None)
 
     def disable(self, uuid, namespace=None, service=None):
         """Disables the process and stops monitoring it."""
         service_id = ServiceId(uuid, service)
         process_manager = self._process_managers.pop(service_id, None)
+        self._pids.pop(service_id, None)
 
         # we could be trying to disable a process_manager which was
         # started on a separate run of this agent, or during netns-cleanup
@@ -218,15 +231,37 @@ class ProcessMonitor(object):
     def get_pid(self, uuid, service=None):
         return self._get_process_manager_attribute('pid', uuid, service)
 
+    def get_statistics(self):
+        """Returns counters about the monitored processes."""
+        return {'processes': len(self._process_managers),
+                'respawns': self._respawn_count,
+                'last_check_duration': self._last_check_duration,
+                'max_check_duration': self._max_check_duration}
+
     def _spawn_checking_thread(self):
         eventlet.spawn(self._periodic_checking_thread)
 
+    def _is_alive(self, service_id, pm):
+        pid = self._pids.get(service_id)
+        if pid is not None and pm.is_active_pid(pid):
+            return True
+
+        # the process is unknown or its last known pid is gone, the pid
+        # file tells whether it was restarted behind our back
+        if pm.active:
+            self._pids[service_id] = pm.pid
+            return True
+        self._pids.pop(service_id, None)
+        return False
+
     @lockutils.synchronized("_check_child_processes")
     def _check_child_processes(self):
-        for service_id in self._process_managers:
+        start = time.time()
+        # enable() and disable() may change the managers while we yield
+        for service_id in list(self._process_managers):
             pm = self._process_managers.get(service_id)
 
-            if pm and not pm.active:
+            if pm and not self._is_alive(service_id, pm):
                 LOG.error(_LE("%(service)s for %(resource_type)s "
                               "with uuid %(uuid)s not found. "
                               "The process should not have died"),
@@ -236,6 +271,15 @@ class ProcessMonitor(object):
                 self._execute_action(service_id)
             eventlet.sleep(0)
 
+        self._last_check_duration = time.time() - start
+        self._max_check_duration = max(self._max_check_duration,
+                                       self._last_check_duration)
+        LOG.debug('Checked %(count)d %(resource_type)s child processes in '
+                  '%(duration).3f seconds',
+                  {'count': len(self._process_managers),
+                   'resource_type': self._resource_type,
+                   'duration': self._last_check_duration})
+
     def _periodic_checking_thread(self):
         while True:
             eventlet.sleep(self._config.check_child_processes_interval)
@@ -250,6 +294,7 @@ class ProcessMonitor(object):
         LOG.error(_LE("respawning %(service)s for uuid %(uuid)s"),
                   {'service': service_id.service,
                    'uuid': service_id.uuid})
+        self._respawn_count += 1
         self._process_managers[service_id].enable()
 
     def _exit_action(self, service_id):
@@ -167,6 +167,29 @@ class IPWrapper(SubProcessBase):
         if self.namespace:
             device.link.set_netns(self.namespace)
 
+    def batch(self, commands):
+        """Run several ip commands with a single 'ip -batch' call.
+
+        Each command is a sequence of ip arguments, e.g.
+        ('neigh', 'replace', '10.0.0.3', 'lladdr', mac, 'dev', 'qr-x').
+        -force makes ip carry on past a failing line; the call still
+        fails (and raises) once all lines have been processed.
+        """
+        if not commands:
+            return
+        if not self.root_helper:
+            raise exceptions.SudoRequired()
+        if self.namespace:
+            ip_cmd = ['ip', 'netns', 'exec', self.namespace, 'ip']
+        else:
+            ip_cmd = ['ip']
+        process_input = ''.join('%s\n' % ' '.join(str(a) for a in command)
+                                for command in commands)
+        return utils.execute(ip_cmd + ['-force', '-batch', '-'],
+                             root_helper=self.root_helper,
+                             process_input=process_input,
+                             log_fail_as_error=self.log_fail_as_error)
+
     def add_vxlan(self, name, vni, group=None, dev=None, ttl=None, tos=None,
                   local=None, port=None, proxy=False):
         cmd = ['add', name, 'type', 'vxlan', 'id', vni]
@@ -0,0 +1,110 @@
+# Copyright 2014 OpenStack Foundation.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import re
+
+import eventlet.queue
+
+from neutron.agent.linux import async_process
+from neutron.openstack.common import log as logging
+
+
+LOG = logging.getLogger(__name__)
+
+# Matches the device name in 'ip -o monitor link' output such as:
+#   5: tap0a1b2c3d-4e: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 ...
+#   Deleted 5: tap0a1b2c3d-4e: <BROADCAST,MULTICAST> mtu 1500 ...
+LINK_EVENT_RE = re.compile(r'^(?:\[LINK\]\s*)?(?:Deleted\s+)?\d+:\s+'
+                           r'(?P<name>[^:@\s]+)')
+
+
+def parse_link_event(line):
+    """Return the name of the device a link event refers to, or None."""
+    match = LINK_EVENT_RE.match(line)
+    if match:
+        return match.group('name')
+
+
+class IpLinkMonitor(async_process.AsyncProcess):
+    """Manages an invocation of 'ip -o monitor link'.
+
+    The kernel reports link creation, deletion and state changes over
+    rtnetlink, so output is only produced when something changes.
+    """
+
+    def __init__(self, root_helper=None, respawn_interval=None):
+        cmd = ['ip', '-o', 'monitor', 'link']
+        super(IpLinkMonitor, self).__init__(cmd,
+                                            root_helper=root_helper,
+                                            respawn_interval=respawn_interval)
+
+    def _read_stderr(self):
+        data = super(IpLinkMonitor, self)._read_stderr()
+        if data:
+            LOG.error(_('Error received from ip monitor: %s') % data)
+            # Do not return value to ensure that stderr output will
+            # stop the monitor.
+
+
+class SimpleLinkMonitor(IpLinkMonitor):
+    """Monitors link events for devices whose name has a given prefix.
+
+    The has_updates property indicates whether a matching device has
+    appeared, disappeared or changed state since the monitor started or
+    since the previous access.
+    """
+
+    def __init__(self, device_prefix, root_helper=None,
+                 respawn_interval=None):
+        super(SimpleLinkMonitor, self).__init__(
+            root_helper=root_helper,
+            respawn_interval=respawn_interval)
+        self.device_prefix = device_prefix
+
+    @property
+    def is_active(self):
+        return bool(self._kill_event and not self._kill_event.ready())
+
+    @property
+    def has_updates(self):
+        """Indicate whether a monitored device has changed.
+
+        True will be returned if the monitor process is not active.
+        This 'failing open' minimizes the risk of falsely indicating
+        the absence of updates at the expense of potential false
+        positives.
+        """
+        return bool(list(self.iter_stdout())) or not self.is_active
+
+    def wait_for_updates(self, timeout):
+        """Block until a monitored device changes or timeout expires.
+
+        Updates are left queued so that has_updates still reports them.
+        """
+        try:
+            device = self._stdout_lines.get(timeout=timeout)
+        except eventlet.queue.Empty:
+            return False
+        self._stdout_lines.put(device)
+        return True
+
+    def _read_stdout(self):
+        data = self._process.stdout.readline()
+        if not data:
+            return
+        device = parse_link_event(data.strip())
+        if device and device.startswith(self.device_prefix):
+            LOG.debug(_('Link event received for device %s'), device)
+            self._stdout_lines.put(device)
+        return data
@@ -253,9 +253,41 @@ class IptablesTable(object):
     def clear_rules_by_tag(self, tag):
         if not tag:
             return
-        rules = [rule for rule in self.rules if rule.tag == tag]
-        for rule in rules:
-            self.rules.remove(rule)
+        self.rules = [rule for rule in self.rules if rule.tag != tag]
+
+    def set_rules_by_tag(self, tag, rules):
+        """Make rules the complete set of wrapped rules carrying tag.
+
+        rules is a list of (chain, rule) tuples as given to add_rule.
+        Tagged rules that are still wanted keep their place in the table;
+        only the missing ones are appended and the stale ones dropped.
+        """
+        wanted = []
+        for chain, rule in rules:
+            if '$' in rule:
+                rule = ' '.join(
+                    self._wrap_target_chain(e, True) for e in rule.split(' '))
+            wanted.append((get_chain_name(chain), rule))
+        wanted_set = set(wanted)
+
+        present = set()
+        kept_rules = []
+        for r in self.rules:
+            if r.tag == tag:
+                key = (r.chain, r.rule)
+                if key not in wanted_set or key in present:
+                    continue
+                present.add(key)
+            kept_rules.append(r)
+        self.rules = kept_rules
+
+        for chain, rule in wanted:
+            if (chain, rule) not in present:
+                present.add((chain, rule))
+                if chain not in self.chains:
+                    raise LookupError(_('Unknown chain: %r') % chain)
+                self.rules.append(IptablesRule(chain, rule, True, False,
+                                               self.wrap_name, tag))
 
 
 class IptablesManager(object):
@@ -649,6 +681,56 @@ class IptablesManager(object):
 
         return cmd_tables
 
+    def get_traffic_counters_by_chain(self, chains, wrap=True):
+        """Return the traffic counters of several chains at once.
+
+        Every table holding one of the chains is read with a single
+        '<cmd>-save -c' and parsed in one pass, instead of running
+        'iptables -L' once per chain.  Counters are not zeroed, so callers
+        compute deltas between two readings.  Returns a dict mapping each
+        chain found to the sum of the counters of its rules.
+        """
+        names = dict((get_chain_name(chain, wrap), chain) for chain in chains)
+        s = [('iptables', self.ipv4)]
+        if self.use_ipv6:
+            s += [('ip6tables', self.ipv6)]
+
+        accs = {}
+        for cmd, tables in s:
+            for table_name in sorted(tables):
+                table = tables[table_name]
+                dumped = {}
+                for name in set(names) & table._select_chain_set(wrap):
+                    if wrap:
+                        dumped['%s-%s' % (table.wrap_name, name)] = name
+                    else:
+                        dumped[name] = name
+                if not dumped:
+                    continue
+
+                args = ['%s-save' % (cmd,), '-c', '-t', table_name]
+                if self.namespace:
+                    args = ['ip', 'netns', 'exec', self.namespace] + args
+                output = self.execute(args, root_helper=self.root_helper)
+                for line in output.split('\n'):
+                    # [<packets>:<bytes>] -A <chain> <rule>
+                    fields = line.split(' ', 3)
+                    if (len(fields) < 3 or fields[1] != '-A' or
+                            fields[2] not in dumped):
+                        continue
+                    counters = fields[0].strip('[]').split(':')
+                    if (len(counters) != 2 or not counters[0].isdigit() or
+                            not counters[1].isdigit()):
+                        continue
+                    acc = accs.setdefault(names[dumped[fields[2]]],
+                                          {'pkts': 0, 'bytes': 0})
+                    acc['pkts'] += int(counters[0])
+                    acc['bytes'] += int(counters[1])
+                for name in dumped.values():
+                    accs.setdefault(names[name], {'pkts': 0, 'bytes': 0})
+
+        return accs
+
     def get_traffic_counters(self, chain, wrap=True, zero=False):
         """Return the sum of the traffic counters of all rules of a chain."""
         cmd_tables = self._get_traffic_counters_cmd_tables(chain, wrap)
@@ -187,6 +187,28 @@ class OVSBridge(BaseOVS):
         except (ValueError, TypeError):
             return INVALID_OFPORT
 
+    def get_ports_ofport(self, port_names):
+        """Return a dict mapping each port name to its ofport.
+
+        All ofports are read with a single ovs-vsctl invocation.
+        """
+        args = []
+        for port_name in port_names:
+            args.extend(["--", "get", "Interface", port_name, "ofport"])
+        output = self.run_vsctl(args) if args else None
+        values = output.splitlines() if output else []
+        # Pad the results so that every port gets a value if the command
+        # failed or returned less output than expected
+        values.extend([None] * (len(port_names) - len(values)))
+        ofports = {}
+        for port_name, ofport in zip(port_names, values):
+            try:
+                int(ofport)
+                ofports[port_name] = ofport.strip()
+            except (ValueError, TypeError):
+                ofports[port_name] = INVALID_OFPORT
+        return ofports
+
     def get_datapath_id(self):
         return self.db_get_val('Bridge',
                                self.br_name, 'datapath_id').strip('"')
@@ -216,10 +238,8 @@ class OVSBridge(BaseOVS):
     def deferred(self, **kwargs):
         return DeferredOVSBridge(self, **kwargs)
 
-    def add_tunnel_port(self, port_name, remote_ip, local_ip,
-                        tunnel_type=constants.TYPE_GRE,
-                        vxlan_udp_port=constants.VXLAN_UDP_PORT,
-                        dont_fragment=True):
+    def _tunnel_port_vsctl_args(self, port_name, remote_ip, local_ip,
+                                tunnel_type, vxlan_udp_port, dont_fragment):
         vsctl_command = ["--", "--may-exist", "add-port", self.br_name,
                          port_name]
         vsctl_command.extend(["--", "set", "Interface", port_name,
@@ -234,7 +254,16 @@ class OVSBridge(BaseOVS):
                               "options:local_ip=%s" % local_ip,
                               "options:in_key=flow",
                               "options:out_key=flow"])
-        self.run_vsctl(vsctl_command)
+        return vsctl_command
+
+    def add_tunnel_port(self, port_name, remote_ip, local_ip,
+                        tunnel_type=constants.TYPE_GRE,
+                        vxlan_udp_port=constants.VXLAN_UDP_PORT,
+                        dont_fragment=True):
+        self.run_vsctl(self._tunnel_port_vsctl_args(port_name, remote_ip,
+                                                    local_ip, tunnel_type,
+                                                    vxlan_udp_port,
+                                                    dont_fragment))
         ofport = self.get_port_ofport(port_name)
         if (tunnel_type == constants.TYPE_VXLAN and
                 ofport == INVALID_OFPORT):
@@ -243,6 +272,31 @@ class OVSBridge(BaseOVS):
                         'installed.'))
         return ofport
 
+    def add_tunnel_ports(self, tunnels, local_ip,
+                         tunnel_type=constants.TYPE_GRE,
+                         vxlan_udp_port=constants.VXLAN_UDP_PORT,
+                         dont_fragment=True):
+        """Create several tunnel ports in a single ovsdb transaction.
+
+        :param tunnels: a list of (port_name, remote_ip) tuples.
+        :returns: a dict mapping each port name to its ofport.
+        """
+        if not tunnels:
+            return {}
+        vsctl_command = []
+        for port_name, remote_ip in tunnels:
+            vsctl_command.extend(self._tunnel_port_vsctl_args(
+                port_name, remote_ip, local_ip, tunnel_type,
+                vxlan_udp_port, dont_fragment))
+        self.run_vsctl(vsctl_command)
+        ofports = self.get_ports_ofport([name for name, _ip in tunnels])
+        if (tunnel_type == constants.TYPE_VXLAN and
+                INVALID_OFPORT in ofports.values()):
+            LOG.error(_('Unable to create VXLAN tunnel port. Please ensure '
+                        'that an openvswitch version that supports VXLAN is '
+                        'installed.'))
+        return ofports
+
     def add_patch_port(self, local_name, remote_name):
         self.run_vsctl(["add-port", self.br_name, local_name,
                         "--", "set", "Interface", local_name,
@@ -13,9 +13,11 @@
 #    under the License.
 
 import contextlib
+import time
 
 import eventlet
 
+from neutron.agent.linux import ip_monitor
 from neutron.agent.linux import ovsdb_monitor
 from neutron.plugins.openvswitch.common import constants
 
@@ -39,6 +41,25 @@ def get_polling_manager(minimize_polling=False,
             pm.stop()
 
 
+@contextlib.contextmanager
+def get_device_polling_manager(device_prefix, minimize_polling=False,
+                               root_helper=None, respawn_interval=None,
+                               resync_interval=None):
+    if minimize_polling:
+        pm = DevicePollingMinimizer(device_prefix,
+                                    root_helper=root_helper,
+                                    respawn_interval=respawn_interval,
+                                    resync_interval=resync_interval)
+        pm.start()
+    else:
+        pm = AlwaysPoll()
+    try:
+        yield pm
+    finally:
+        if minimize_polling:
+            pm.stop()
+
+
 class BasePollingManager(object):
 
     def __init__(self):
@@ -54,6 +75,10 @@ class BasePollingManager(object):
     def _is_polling_required(self):
         raise NotImplementedError()
 
+    def wait_for_updates(self, timeout):
+        """Wait up to timeout seconds for polling to become required."""
+        time.sleep(timeout)
+
     @property
     def is_polling_required(self):
         # Always consume the updates to minimize polling.
@@ -110,3 +135,46 @@ class InterfacePollingMinimizer(BasePollingManager):
         # collect output.
         eventlet.sleep()
         return self._monitor.has_updates
+
+
+class DevicePollingMinimizer(BasePollingManager):
+    """Monitors rtnetlink link events to determine when polling is required.
+
+    If resync_interval is set, polling is also required once that many
+    seconds have passed since polling was last completed, so that a full
+    rescan still happens periodically if events are missed.
+    """
+
+    def __init__(self, device_prefix, root_helper=None,
+                 respawn_interval=None, resync_interval=None):
+
+        super(DevicePollingMinimizer, self).__init__()
+        self._monitor = ip_monitor.SimpleLinkMonitor(
+            device_prefix,
+            root_helper=root_helper,
+            respawn_interval=respawn_interval)
+        self._resync_interval = resync_interval
+        self._last_polling = time.time()
+
+    def start(self):
+        self._monitor.start()
+
+    def stop(self):
+        self._monitor.stop()
+
+    def polling_completed(self):
+        super(DevicePollingMinimizer, self).polling_completed()
+        self._last_polling = time.time()
+
+    def wait_for_updates(self, timeout):
+        self._monitor.wait_for_updates(timeout)
+
+    def _resync_required(self):
+        return bool(self._resync_interval and
+                    time.time() - self._last_polling >= self._resync_interval)
+
+    def _is_polling_required(self):
+        # Maximize the chances of update detection having a chance to
+        # collect output.
+        eventlet.sleep()
+        return self._monitor.has_updates or self._resync_required()
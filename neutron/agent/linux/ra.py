@@ -61,6 +61,11 @@ def _is_slaac(ra_mode):
 
 
 def _generate_radvd_conf(router_id, router_ports, dev_name_helper):
+    """Write the radvd config of a router.
+
+    Returns the config file name and whether its content changed, the file
+    is left untouched when it already holds the same configuration.
+    """
     radvd_conf = utils.get_conf_file_name(cfg.CONF.ra_confs,
                                           router_id,
                                           'radvd.conf',
@@ -76,11 +81,17 @@ def _generate_radvd_conf(router_id, router_ports, dev_name_helper):
                 conf_str = default_fmt % interface_name
             buf.write('%s' % conf_str)
 
-    utils.replace_file(radvd_conf, buf.getvalue())
-    return radvd_conf
+    conf_value = buf.getvalue()
+    if conf_value == utils.get_value_from_conf_file(cfg.CONF.ra_confs,
+                                                    router_id,
+                                                    'radvd.conf'):
+        return radvd_conf, False
+    utils.replace_file(radvd_conf, conf_value)
+    return radvd_conf, True
 
 
-def _spawn_radvd(router_id, radvd_conf, router_ns, root_helper):
+def _spawn_radvd(router_id, radvd_conf, router_ns, root_helper,
+                 reload_cfg=True):
     def callback(pid_file):
         radvd_cmd = ['radvd',
                      '-C', '%s' % radvd_conf,
@@ -92,7 +103,8 @@ def _spawn_radvd(router_id, radvd_conf, router_ns, root_helper):
                                             root_helper,
                                             router_ns,
                                             'radvd')
-    radvd.enable(callback, True)
+    # a running radvd only needs a SIGHUP when its config changed
+    radvd.enable(callback, reload_cfg)
     LOG.debug("radvd enabled for router %s", router_id)
 
 
@@ -107,8 +119,10 @@ def enable_ipv6_ra(router_id, router_ns, router_ports,
         return
 
     LOG.debug("Enable IPv6 RA for router %s", router_id)
-    radvd_conf = _generate_radvd_conf(router_id, router_ports, dev_name_helper)
-    _spawn_radvd(router_id, radvd_conf, router_ns, root_helper)
+    radvd_conf, changed = _generate_radvd_conf(router_id, router_ports,
+                                               dev_name_helper)
+    _spawn_radvd(router_id, radvd_conf, router_ns, root_helper,
+                 reload_cfg=changed)
 
 
 def disable_ipv6_ra(router_id, router_ns, root_helper):
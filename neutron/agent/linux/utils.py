@@ -34,6 +34,9 @@ from neutron.openstack.common import log as logging
 
 LOG = logging.getLogger(__name__)
 
+# Number of processes spawned through create_process, for loop statistics
+_process_count = 0
+
 
 def create_process(cmd, root_helper=None, addl_env=None):
     """Create a process object for the given command.
@@ -41,11 +44,13 @@ def create_process(cmd, root_helper=None, addl_env=None):
     The return value will be a tuple of the process object and the
     list of command arguments used to create it.
     """
+    global _process_count
     if root_helper:
         cmd = shlex.split(root_helper) + cmd
     cmd = map(str, cmd)
 
     LOG.debug(_("Running command: %s"), cmd)
+    _process_count += 1
     env = os.environ.copy()
     if addl_env:
         env.update(addl_env)
@@ -59,6 +64,11 @@ def create_process(cmd, root_helper=None, addl_env=None):
     return obj, cmd
 
 
+def get_process_count():
+    """Return the number of processes spawned by create_process."""
+    return _process_count
+
+
 def execute(cmd, root_helper=None, process_input=None, addl_env=None,
             check_exit_code=True, return_stderr=False, log_fail_as_error=True):
     try:
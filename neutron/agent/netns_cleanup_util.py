@@ -14,6 +14,7 @@
 #    under the License.
 
 import re
+import sys
 
 import eventlet
 eventlet.monkey_patch()
@@ -30,6 +31,7 @@ from neutron.agent.linux import ovs_lib
 from neutron.api.v2 import attributes
 from neutron.common import config
 from neutron.openstack.common import importutils
+from neutron.openstack.common import jsonutils
 from neutron.openstack.common import log as logging
 
 
@@ -57,6 +59,15 @@ def setup_conf():
         cfg.BoolOpt('force',
                     default=False,
                     help=_('Delete the namespace by removing all devices.')),
+        cfg.IntOpt('workers',
+                   default=1,
+                   help=_('Number of namespaces which are checked and '
+                          'destroyed concurrently.')),
+        cfg.BoolOpt('dry-run',
+                    default=False,
+                    help=_('Print a JSON report of the namespaces and '
+                           'devices which would be removed, without '
+                           'removing anything.')),
     ]
 
     conf = cfg.CONF
@@ -116,6 +127,26 @@ def unplug_device(conf, device):
             LOG.debug(_('Unable to find bridge for device: %s'), device.name)
 
 
+def unplug_devices(conf, ip):
+    """Remove all the devices of a namespace.
+
+    The devices are first deleted with a single 'ip -batch' call, the ones
+    which could not be deleted that way (e.g. OVS ports) are then removed
+    one by one.
+    """
+    devices = ip.get_devices(exclude_loopback=True)
+    if not devices:
+        return
+    try:
+        ip.batch([('link', 'delete', device.name) for device in devices])
+        return
+    except RuntimeError:
+        LOG.debug(_('Unable to delete all devices of namespace %s at once'),
+                  ip.namespace)
+    for device in ip.get_devices(exclude_loopback=True):
+        unplug_device(conf, device)
+
+
 def destroy_namespace(conf, namespace, force=False):
     """Destroy a given namespace.
 
@@ -132,14 +163,27 @@ def destroy_namespace(conf, namespace, force=False):
             # NOTE: The dhcp driver will remove the namespace if is it empty,
             # so a second check is required here.
             if ip.netns.exists(namespace):
-                for device in ip.get_devices(exclude_loopback=True):
-                    unplug_device(conf, device)
+                unplug_devices(conf, ip)
 
         ip.garbage_collect_namespace()
     except Exception:
         LOG.exception(_('Error unable to destroy namespace: %s'), namespace)
 
 
+def describe_namespace(conf, namespace):
+    """Return what destroying a namespace would remove."""
+    root_helper = agent_config.get_root_helper(conf)
+    ip = ip_lib.IPWrapper(root_helper, namespace)
+    try:
+        devices = [device.name
+                   for device in ip.get_devices(exclude_loopback=True)]
+    except RuntimeError:
+        LOG.exception(_('Unable to list devices of namespace: %s'),
+                      namespace)
+        devices = None
+    return {'namespace': namespace, 'devices': devices}
+
+
 def main():
     """Main method for cleaning up network namespaces.
 
@@ -156,19 +200,35 @@ def main():
     The --force flag should only be used as part of the cleanup of a devstack
     installation as it will blindly purge namespaces and their devices. This
     option also kills any lingering DHCP instances.
+
+    Namespaces are checked and destroyed by up to --workers green threads.
+    With --dry-run nothing is removed, a JSON report of the namespaces and
+    devices which would be removed is printed instead.
     """
     conf = setup_conf()
     conf()
     config.setup_logging(conf)
 
     root_helper = agent_config.get_root_helper(conf)
+    pool = eventlet.GreenPool(conf.workers)
     # Identify namespaces that are candidates for deletion.
-    candidates = [ns for ns in
-                  ip_lib.IPWrapper.get_namespaces(root_helper)
-                  if eligible_for_deletion(conf, ns, conf.force)]
+    namespaces = ip_lib.IPWrapper.get_namespaces(root_helper)
+    eligible = pool.imap(lambda ns: eligible_for_deletion(conf, ns,
+                                                          conf.force),
+                         namespaces)
+    candidates = [ns for ns, is_eligible in zip(namespaces, eligible)
+                  if is_eligible]
+
+    if conf.dry_run:
+        report = {'force': conf.force,
+                  'namespaces': list(pool.imap(
+                      lambda ns: describe_namespace(conf, ns), candidates))}
+        sys.stdout.write(jsonutils.dumps(report) + '\n')
+        return
 
     if candidates:
         eventlet.sleep(2)
 
         for namespace in candidates:
-            destroy_namespace(conf, namespace, conf.force)
+            pool.spawn_n(destroy_namespace, conf, namespace, conf.force)
+        pool.waitall()
@@ -14,6 +14,7 @@
 #    under the License.
 
 import itertools
+from oslo.config import cfg
 from oslo import messaging
 
 from neutron.common import rpc as n_rpc
@@ -58,9 +59,20 @@ class PluginReportStateAPI(n_rpc.RpcProxy):
     BASE_RPC_API_VERSION = '1.0'
 
     def __init__(self, topic):
+        if topic == topics.PLUGIN and self._use_reports_topic():
+            topic = topics.REPORTS
         super(PluginReportStateAPI, self).__init__(
             topic=topic, default_version=self.BASE_RPC_API_VERSION)
 
+    @staticmethod
+    def _use_reports_topic():
+        # Agents which do not register the agent state options keep
+        # reporting on the plugin topic
+        try:
+            return cfg.CONF.AGENT.use_reports_topic
+        except (cfg.NoSuchOptError, cfg.NoSuchGroupError):
+            return False
+
     def report_state(self, context, agent_state, use_call=False):
         msg = self.make_msg('report_state',
                             agent_state={'agent_state':
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
 import urllib
 
 from oslo.config import cfg
@@ -20,6 +21,7 @@ from webob import exc
 
 from neutron.common import constants
 from neutron.common import exceptions
+from neutron.openstack.common import jsonutils
 from neutron.openstack.common import log as logging
 
 
@@ -50,21 +52,66 @@ def get_filters(request, attr_info, skips=[]):
     return res
 
 
-def get_previous_link(request, items, id_key):
+class KeysetMarker(object):
+    """Pagination marker decoded from a keyset continuation token.
+
+    The token carries the sort key values of the item the previous page
+    ended with, which are exposed as attributes so that the marker can be
+    used in place of the marker object otherwise loaded from the database.
+    """
+
+    def __init__(self, values):
+        self._values = values
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def keys(self):
+        return self._values.keys()
+
+
+def encode_keyset_marker(item, sorts):
+    """Return an opaque token holding the sort key values of item."""
+    values = dict((key, item[key]) for key, direction in sorts)
+    return base64.urlsafe_b64encode(jsonutils.dumps(values))
+
+
+def decode_keyset_marker(marker):
+    """Return a KeysetMarker for a keyset token, None for a plain marker."""
+    try:
+        values = jsonutils.loads(base64.urlsafe_b64decode(str(marker)))
+    except (TypeError, ValueError):
+        return
+    if isinstance(values, dict):
+        return KeysetMarker(values)
+
+
+def get_previous_link(request, items, id_key, marker_func=None):
     params = request.GET.copy()
     params.pop('marker', None)
     if items:
-        marker = items[0][id_key]
+        if marker_func:
+            marker = marker_func(items[0])
+        else:
+            marker = items[0][id_key]
         params['marker'] = marker
     params['page_reverse'] = True
     return "%s?%s" % (request.path_url, urllib.urlencode(params))
 
 
-def get_next_link(request, items, id_key):
+def get_next_link(request, items, id_key, marker_func=None):
     params = request.GET.copy()
     params.pop('marker', None)
     if items:
-        marker = items[-1][id_key]
+        if marker_func:
+            marker = marker_func(items[-1])
+        else:
+            marker = items[-1][id_key]
         params['marker'] = marker
     params.pop('page_reverse', None)
     return "%s?%s" % (request.path_url, urllib.urlencode(params))
@@ -154,7 +201,7 @@ def get_page_reverse(request):
 
 
 def get_pagination_links(request, items, limit,
-                         marker, page_reverse, key="id"):
+                         marker, page_reverse, key="id", marker_func=None):
     key = key if key else 'id'
     links = []
     if not limit:
@@ -162,11 +209,11 @@ def get_pagination_links(request, items, limit,
     if not (len(items) < limit and not page_reverse):
         links.append({"rel": "next",
                       "href": get_next_link(request, items,
-                                            key)})
+                                            key, marker_func)})
     if not (len(items) < limit and page_reverse):
         links.append({"rel": "previous",
                       "href": get_previous_link(request, items,
-                                                key)})
+                                                key, marker_func)})
     return links
 
 
@@ -224,15 +271,50 @@ class PaginationEmulatedHelper(PaginationHelper):
 
 class PaginationNativeHelper(PaginationEmulatedHelper):
 
+    def __init__(self, request, primary_key='id'):
+        super(PaginationNativeHelper, self).__init__(request, primary_key)
+        self.sorts = []
+        self.keyset = cfg.CONF.allow_keyset_pagination
+        self.keyset_marker = None
+        if self.keyset and self.marker:
+            self.keyset_marker = decode_keyset_marker(self.marker)
+
     def update_args(self, args):
         if self.primary_key not in dict(args.get('sorts', [])).keys():
             args.setdefault('sorts', []).append((self.primary_key, True))
-        args.update({'limit': self.limit, 'marker': self.marker,
+        self.sorts = args['sorts']
+        marker = self.marker
+        if self.keyset_marker:
+            if set(self.keyset_marker.keys()) != set(dict(self.sorts)):
+                msg = _("The marker does not match the sort keys")
+                raise exceptions.BadRequest(resource='marker', msg=msg)
+            # The token carries the sort key values of the last item seen,
+            # so there is no need to look up the marker object
+            marker = self.keyset_marker
+        args.update({'limit': self.limit, 'marker': marker,
                      'page_reverse': self.page_reverse})
 
+    def update_fields(self, original_fields, fields_to_add):
+        super(PaginationNativeHelper, self).update_fields(original_fields,
+                                                          fields_to_add)
+        if not (self.keyset and original_fields):
+            return
+        for key in dict(self.sorts).keys():
+            if key not in original_fields:
+                original_fields.append(key)
+                fields_to_add.append(key)
+
     def paginate(self, items):
         return items
 
+    def get_links(self, items):
+        marker_func = None
+        if self.keyset:
+            marker_func = lambda item: encode_keyset_marker(item, self.sorts)
+        return get_pagination_links(
+            self.request, items, self.limit, self.marker,
+            self.page_reverse, self.primary_key, marker_func)
+
 
 class NoPaginationHelper(PaginationHelper):
     pass
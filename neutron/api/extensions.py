@@ -27,8 +27,10 @@ import webob.exc
 
 from neutron.api.v2 import attributes
 from neutron.common import exceptions
+from neutron.common import startup_timing
 import neutron.extensions
 from neutron import manager
+from neutron.openstack.common import jsonutils
 from neutron.openstack.common import log as logging
 from neutron import policy
 from neutron import wsgi
@@ -392,6 +394,71 @@ def plugin_aware_extension_middleware_factory(global_config, **local_config):
     return _factory
 
 
+class ExtensionManifest(object):
+    """On-disk cache of the extensions found in the extension files.
+
+    Maps each extension file to the alias and class of the extension it
+    defines, together with the file's modification time and size, so
+    that files defining extensions which are not needed can be skipped
+    without importing them. Entries of files which have changed since
+    they were recorded are ignored.
+    """
+
+    def __init__(self, manifest_file):
+        self.manifest_file = manifest_file
+        self.entries = {}
+        self.dirty = False
+        if os.path.exists(manifest_file):
+            try:
+                with open(manifest_file) as f:
+                    self.entries = jsonutils.loads(f.read())
+            except (IOError, ValueError) as e:
+                LOG.warn(_("Unable to read extension manifest %(file)s: "
+                           "%(error)s"),
+                         {'file': manifest_file, 'error': e})
+
+    @staticmethod
+    def _file_stamp(ext_path):
+        stat = os.stat(ext_path)
+        return stat.st_mtime, stat.st_size
+
+    def get_alias(self, ext_path):
+        """Return the recorded alias for ext_path, or None if stale."""
+        entry = self.entries.get(ext_path)
+        if entry and (entry['mtime'], entry['size']) == self._file_stamp(
+                ext_path):
+            return entry['alias']
+
+    def record(self, ext_path, ext):
+        try:
+            alias = ext.get_alias()
+        except AttributeError:
+            return
+        mtime, size = self._file_stamp(ext_path)
+        entry = {'alias': alias,
+                 'module': os.path.splitext(os.path.basename(ext_path))[0],
+                 'class': ext.__class__.__name__,
+                 'mtime': mtime,
+                 'size': size}
+        if self.entries.get(ext_path) != entry:
+            self.entries[ext_path] = entry
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_file = '%s.tmp' % self.manifest_file
+        try:
+            with open(tmp_file, 'w') as f:
+                f.write(jsonutils.dumps(self.entries))
+            os.rename(tmp_file, self.manifest_file)
+            self.dirty = False
+        except (IOError, OSError) as e:
+            LOG.warn(_("Unable to write extension manifest %(file)s: "
+                       "%(error)s"),
+                     {'file': self.manifest_file, 'error': e})
+
+
 class ExtensionManager(object):
     """Load extensions from the configured extension path.
 
@@ -403,7 +470,13 @@ class ExtensionManager(object):
         LOG.info(_('Initializing extension manager.'))
         self.path = path
         self.extensions = {}
+        self.manifest = None
+        if cfg.CONF.api_extensions_manifest:
+            self.manifest = ExtensionManifest(
+                cfg.CONF.api_extensions_manifest)
         self._load_all_extensions()
+        if self.manifest:
+            self.manifest.save()
         policy.reset()
 
     def get_resources(self):
@@ -536,6 +609,10 @@ class ExtensionManager(object):
             else:
                 LOG.error(_("Extension path '%s' doesn't exist!"), path)
 
+    def _is_alias_needed(self, alias):
+        """Whether an extension has to be imported to be checked."""
+        return True
+
     def _load_all_extensions_from_path(self, path):
         # Sorting the extension list makes the order in which they
         # are loaded predictable across a cluster of load-balanced
@@ -546,6 +623,12 @@ class ExtensionManager(object):
                 mod_name, file_ext = os.path.splitext(os.path.split(f)[-1])
                 ext_path = os.path.join(path, f)
                 if file_ext.lower() == '.py' and not mod_name.startswith('_'):
+                    if self.manifest:
+                        alias = self.manifest.get_alias(ext_path)
+                        if alias and not self._is_alias_needed(alias):
+                            LOG.debug(_('Skipping unneeded extension %s'),
+                                      alias)
+                            continue
                     mod = imp.load_source(mod_name, ext_path)
                     ext_name = mod_name[0].upper() + mod_name[1:]
                     new_ext_class = getattr(mod, ext_name, None)
@@ -556,6 +639,8 @@ class ExtensionManager(object):
                                   'file': ext_path})
                         continue
                     new_ext = new_ext_class()
+                    if self.manifest:
+                        self.manifest.record(ext_path, new_ext)
                     self.add_extension(new_ext)
             except Exception as exception:
                 LOG.warn(_("Extension file %(f)s wasn't loaded due to "
@@ -591,12 +676,14 @@ class PluginAwareExtensionManager(ExtensionManager):
                 self._plugins_support(extension) and
                 self._plugins_implement_interface(extension))
 
+    def _is_alias_needed(self, alias):
+        return any((hasattr(plugin, "supported_extension_aliases") and
+                    alias in plugin.supported_extension_aliases)
+                   for plugin in self.plugins.values())
+
     def _plugins_support(self, extension):
         alias = extension.get_alias()
-        supports_extension = any((hasattr(plugin,
-                                          "supported_extension_aliases") and
-                                  alias in plugin.supported_extension_aliases)
-                                 for plugin in self.plugins.values())
+        supports_extension = self._is_alias_needed(alias)
         if not supports_extension:
             LOG.warn(_("Extension %s not supported by any of loaded plugins"),
                      alias)
@@ -616,8 +703,9 @@ class PluginAwareExtensionManager(ExtensionManager):
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
-            cls._instance = cls(get_extensions_path(),
-                                manager.NeutronManager.get_service_plugins())
+            service_plugins = manager.NeutronManager.get_service_plugins()
+            with startup_timing.timed('extensions'):
+                cls._instance = cls(get_extensions_path(), service_plugins)
         return cls._instance
 
     def check_if_plugin_extensions_loaded(self):
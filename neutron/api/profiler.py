@@ -0,0 +1,146 @@
+# Copyright 2014 OpenStack Foundation.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import cProfile
+import os
+import random
+import time
+
+import sqlalchemy
+import webob.dec
+
+from neutron.common import request_stats
+from neutron.db import api as db_api
+from neutron.openstack.common import jsonutils
+from neutron.openstack.common import log as logging
+from neutron.openstack.common.middleware import request_id
+from neutron.openstack.common import strutils
+from neutron import wsgi
+
+
+LOG = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Neutron-Profile'
+
+
+class RequestProfiler(wsgi.Middleware):
+    """Record per-request phase timings and SQL statistics.
+
+    The following options are read from the paste filter section:
+
+    headers: add the statistics to the response in the X-Neutron-Profile
+             header (default: true)
+    stats_file: append the statistics of each request to this file as a
+                line of JSON
+    profile_dir: directory where cProfile dumps of slow requests are saved
+    profile_sample_rate: fraction of the requests run under cProfile
+                         (default: 0)
+    profile_threshold: minimum duration in seconds of a profiled request
+                       for its dump to be saved (default: 1)
+
+    cProfile follows the OS thread, so the profile of a request may
+    include work done by other green threads in the meantime.
+    """
+
+    def __init__(self, application, headers='true', stats_file=None,
+                 profile_dir=None, profile_sample_rate='0',
+                 profile_threshold='1'):
+        super(RequestProfiler, self).__init__(application)
+        self.headers = strutils.bool_from_string(headers)
+        self.stats_file = stats_file
+        self.profile_dir = profile_dir
+        self.profile_sample_rate = float(profile_sample_rate)
+        self.profile_threshold = float(profile_threshold)
+        self._engine = None
+
+    def _listen_for_sql(self):
+        engine = db_api.get_engine()
+        if engine is self._engine:
+            return
+        sqlalchemy.event.listen(engine, 'before_cursor_execute',
+                                self._before_cursor_execute)
+        sqlalchemy.event.listen(engine, 'after_cursor_execute',
+                                self._after_cursor_execute)
+        self._engine = engine
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters,
+                               context, executemany):
+        conn.info.setdefault('neutron_query_start', []).append(time.time())
+
+    @staticmethod
+    def _after_cursor_execute(conn, cursor, statement, parameters,
+                              context, executemany):
+        starts = conn.info.get('neutron_query_start')
+        if starts:
+            request_stats.record_sql(time.time() - starts.pop())
+
+    def _start_profiler(self):
+        if (self.profile_dir and
+                random.random() < self.profile_sample_rate):
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return profiler
+
+    @webob.dec.wsgify
+    def __call__(self, req):
+        self._listen_for_sql()
+        profiler = self._start_profiler()
+        request_stats.start()
+        try:
+            response = req.get_response(self.application)
+        finally:
+            if profiler:
+                profiler.disable()
+            stats = request_stats.stop()
+        req_id = req.environ.get(request_id.ENV_REQUEST_ID)
+        if self.headers:
+            response.headers[PROFILE_HEADER] = self._format_header(stats)
+        if self.stats_file:
+            self._write_stats(req, response, req_id, stats)
+        if profiler and stats.elapsed >= self.profile_threshold:
+            self._save_profile(profiler, req_id or str(stats.start))
+        return response
+
+    @staticmethod
+    def _format_header(stats):
+        values = ['total=%.4f' % stats.elapsed,
+                  'sql_count=%d' % stats.sql_count,
+                  'sql_time=%.4f' % stats.sql_time]
+        values.extend('%s=%.4f' % item
+                      for item in sorted(stats.phases.items()))
+        return '; '.join(values)
+
+    def _write_stats(self, req, response, req_id, stats):
+        record = stats.to_dict()
+        record.update({'request_id': req_id,
+                       'method': req.method,
+                       'path': req.path,
+                       'status': response.status_int})
+        try:
+            with open(self.stats_file, 'a') as f:
+                f.write(jsonutils.dumps(record) + '\n')
+        except (IOError, OSError) as e:
+            LOG.warning(_("Unable to write request stats to %(file)s: "
+                          "%(error)s"), {'file': self.stats_file, 'error': e})
+
+    def _save_profile(self, profiler, name):
+        path = os.path.join(self.profile_dir, '%s.prof' % name)
+        try:
+            if not os.path.isdir(self.profile_dir):
+                os.makedirs(self.profile_dir, 0o755)
+            profiler.dump_stats(path)
+        except (IOError, OSError) as e:
+            LOG.warning(_("Unable to save request profile %(path)s: "
+                          "%(error)s"), {'path': path, 'error': e})
@@ -13,10 +13,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+
+import eventlet
+
 from neutron.common import constants
 from neutron.common import rpc as n_rpc
 from neutron.common import topics
 from neutron.common import utils
+from neutron import context as n_context
 from neutron import manager
 from neutron.openstack.common import log as logging
 from neutron.plugins.common import constants as service_constants
@@ -32,6 +37,8 @@ class L3AgentNotifyAPI(n_rpc.RpcProxy):
     def __init__(self, topic=topics.L3_AGENT):
         super(L3AgentNotifyAPI, self).__init__(
             topic=topic, default_version=self.BASE_RPC_API_VERSION)
+        self._pending_arp_entries = collections.defaultdict(list)
+        self._waiting_to_send_arp = False
 
     def _notification_host(self, context, method, payload, host):
         """Notify the agent that is hosting the router."""
@@ -69,6 +76,13 @@ class L3AgentNotifyAPI(n_rpc.RpcProxy):
     def _agent_notification_arp(self, context, method, router_id,
                                 operation, data):
         """Notify arp details to l3 agents hosting router."""
+        self._arp_notification(context, method, router_id,
+                               {'router_id': router_id, 'arp_table': data},
+                               '1.2')
+
+    def _arp_notification(self, context, method, router_id, payload,
+                          version):
+        """Cast an arp payload to the l3 agents hosting router."""
         if not router_id:
             return
         adminContext = (context.is_admin and
@@ -86,11 +100,9 @@ class L3AgentNotifyAPI(n_rpc.RpcProxy):
             topic = '%s.%s' % (l3_agent.topic, l3_agent.host)
             LOG.debug('Casting message %(method)s with topic %(topic)s',
                       {'topic': topic, 'method': method})
-            dvr_arptable = {'router_id': router_id,
-                            'arp_table': data}
             self.cast(context,
-                      self.make_msg(method, payload=dvr_arptable),
-                      topic=topic, version='1.2')
+                      self.make_msg(method, payload=payload),
+                      topic=topic, version=version)
 
     def _notification(self, context, method, router_ids, operation, data):
         """Notify all the agents that are hosting the routers."""
@@ -146,6 +158,42 @@ class L3AgentNotifyAPI(n_rpc.RpcProxy):
         self._agent_notification_arp(context, 'del_arp_entry', router_id,
                                      operation, arp_table)
 
+    def queue_arp_entry(self, context, router_id, arp_table, operation,
+                        delay):
+        """Queue an arp entry update for the agents hosting router_id.
+
+        The first entry queued starts a timer of delay seconds; when it
+        fires, all entries queued in the meantime are sent as a single
+        update_arp_entries message per router.
+        """
+        entry = dict(arp_table, operation=operation)
+        self._pending_arp_entries[router_id].append(entry)
+        if self._waiting_to_send_arp:
+            return
+        self._waiting_to_send_arp = True
+
+        def last_out_sends():
+            eventlet.sleep(delay)
+            self._waiting_to_send_arp = False
+            self.send_arp_entries()
+
+        eventlet.spawn_n(last_out_sends)
+
+    def send_arp_entries(self):
+        """Send the queued arp entry updates, one message per router."""
+        pending = self._pending_arp_entries
+        self._pending_arp_entries = collections.defaultdict(list)
+        context = n_context.get_admin_context()
+        for router_id, entries in pending.iteritems():
+            try:
+                self._arp_notification(
+                    context, 'update_arp_entries', router_id,
+                    {'router_id': router_id, 'arp_entries': entries}, '1.3')
+            except Exception:
+                LOG.exception(_('Failed to send %(count)d arp entries for '
+                                'router %(router_id)s'),
+                              {'count': len(entries), 'router_id': router_id})
+
     def router_removed_from_agent(self, context, router_id, host):
         self._notification_host(context, 'router_removed_from_agent',
                                 {'router_id': router_id}, host)
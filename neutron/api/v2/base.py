@@ -14,6 +14,7 @@
 #    under the License.
 
 import copy
+import hashlib
 import netaddr
 import webob.exc
 
@@ -25,6 +26,7 @@ from neutron.api.v2 import attributes
 from neutron.api.v2 import resource as wsgi_resource
 from neutron.common import constants as const
 from neutron.common import exceptions
+from neutron.common import request_stats
 from neutron.common import rpc as n_rpc
 from neutron.openstack.common import excutils
 from neutron.openstack.common import log as logging
@@ -197,7 +199,7 @@ class Controller(object):
                 # It is ok to raise a 403 because accessibility to the
                 # object was checked earlier in this method
                 policy.enforce(request.context, name, resource)
-                return getattr(self._plugin, name)(*arg_list, **kwargs)
+                return self._plugin_handler(name)(*arg_list, **kwargs)
             return _handle_action
         else:
             raise AttributeError
@@ -238,7 +240,7 @@ class Controller(object):
         pagination_helper.update_fields(original_fields, fields_to_add)
         if parent_id:
             kwargs[self._parent_id_name] = parent_id
-        obj_getter = getattr(self._plugin, self._plugin_handlers[self.LIST])
+        obj_getter = self._plugin_handler(self._plugin_handlers[self.LIST])
         obj_list = obj_getter(request.context, **kwargs)
         obj_list = sorting_helper.sort(obj_list)
         obj_list = pagination_helper.paginate(obj_list)
@@ -261,11 +263,12 @@ class Controller(object):
         if obj_list:
             fields_to_strip += self._exclude_attributes_by_policy(
                 request.context, obj_list[0])
-        collection = {self._collection:
-                      [self._filter_attributes(
-                          request.context, obj,
-                          fields_to_strip=fields_to_strip)
-                       for obj in obj_list]}
+        items = (self._filter_attributes(request.context, obj,
+                                         fields_to_strip=fields_to_strip)
+                 for obj in obj_list)
+        if not cfg.CONF.stream_list_responses:
+            items = list(items)
+        collection = {self._collection: items}
         pagination_links = pagination_helper.get_links(obj_list)
         if pagination_links:
             collection[self._collection + "_links"] = pagination_links
@@ -278,7 +281,7 @@ class Controller(object):
         action = self._plugin_handlers[self.SHOW]
         if parent_id:
             kwargs[self._parent_id_name] = parent_id
-        obj_getter = getattr(self._plugin, action)
+        obj_getter = self._plugin_handler(action)
         obj = obj_getter(request.context, id, **kwargs)
         # Check authz
         # FIXME(salvatore-orlando): obj_getter might return references to
@@ -287,6 +290,20 @@ class Controller(object):
             policy.enforce(request.context, action, obj)
         return obj
 
+    def _plugin_handler(self, name):
+        """Return the named plugin method, timed as the plugin phase."""
+        handler = getattr(self._plugin, name)
+
+        def timed_handler(*args, **kwargs):
+            with request_stats.phase('plugin'):
+                return handler(*args, **kwargs)
+        return timed_handler
+
+    @request_stats.timed('notify')
+    def _notify(self, context, event_type, payload):
+        self._notifier.info(context, event_type, payload)
+
+    @request_stats.timed('notify')
     def _send_dhcp_notification(self, context, data, methodname):
         if cfg.CONF.dhcp_agent_notification:
             if self._collection in data:
@@ -296,6 +313,7 @@ class Controller(object):
             else:
                 self._dhcp_agent_notifier.notify(context, data, methodname)
 
+    @request_stats.timed('notify')
     def _send_nova_notification(self, action, orig, returned):
         if hasattr(self, '_nova_notifier'):
             self._nova_notifier.send_network_change(action, orig, returned)
@@ -307,25 +325,60 @@ class Controller(object):
         policy.init()
         return self._items(request, True, parent_id)
 
+    def _get_etag(self, request, id, fields):
+        """Build the entity tag of a resource from its revision number.
+
+        None is returned if the plugin does not keep revision numbers for
+        the resource. The requested fields are part of the tag, as they
+        change the representation of the resource.
+        """
+        revision_getter = getattr(self._plugin,
+                                  'get_%s_revision' % self._resource, None)
+        if not revision_getter:
+            return
+        with request_stats.phase('plugin'):
+            revision = revision_getter(request.context, id)
+        if not isinstance(revision, (int, long)):
+            return
+        etag = str(revision)
+        if fields:
+            etag += '-' + hashlib.sha1(
+                ','.join(sorted(fields))).hexdigest()[:8]
+        return etag
+
     def show(self, request, id, **kwargs):
         """Returns detailed information about the requested entity."""
         try:
             # NOTE(salvatore-orlando): The following ensures that fields
             # which are needed for authZ policy validation are not stripped
             # away by the plugin before returning.
-            field_list, added_fields = self._do_field_list(
-                api_common.list_args(request, "fields"))
+            fields = api_common.list_args(request, "fields")
+            field_list, added_fields = self._do_field_list(fields)
             parent_id = kwargs.get(self._parent_id_name)
+            etag = None
+            if not parent_id:
+                etag = self._get_etag(request, id, fields)
             # Ensure policy engine is initialized
             policy.init()
-            return {self._resource:
-                    self._view(request.context,
-                               self._item(request,
-                                          id,
-                                          do_authz=True,
-                                          field_list=field_list,
-                                          parent_id=parent_id),
-                               fields_to_strip=added_fields)}
+            # NOTE: revision numbers are easy to guess, so the caller must be
+            # allowed to get the resource before it is told that its tag
+            # matches. Only the attributes needed by the policy are fetched.
+            if etag and etag in request.if_none_match:
+                self._item(request, id, do_authz=True,
+                           field_list=['id'] + list(self._policy_attrs))
+                raise webob.exc.HTTPNotModified(
+                    headers={'ETag': '"%s"' % etag})
+            result = {self._resource:
+                      self._view(request.context,
+                                 self._item(request,
+                                            id,
+                                            do_authz=True,
+                                            field_list=field_list,
+                                            parent_id=parent_id),
+                                 fields_to_strip=added_fields)}
+            if etag:
+                request.environ[wsgi_resource.ETAG_ENV] = etag
+            return result
         except exceptions.PolicyNotAuthorized:
             # To avoid giving away information, pretend that it
             # doesn't exist
@@ -350,8 +403,8 @@ class Controller(object):
         # could raise any kind of exception
         except Exception as ex:
             for obj in objs:
-                obj_deleter = getattr(self._plugin,
-                                      self._plugin_handlers[self.DELETE])
+                obj_deleter = self._plugin_handler(
+                    self._plugin_handlers[self.DELETE])
                 try:
                     kwargs = ({self._parent_id_name: parent_id} if parent_id
                               else {})
@@ -371,9 +424,7 @@ class Controller(object):
     def create(self, request, body=None, **kwargs):
         """Creates a new instance of the requested entity."""
         parent_id = kwargs.get(self._parent_id_name)
-        self._notifier.info(request.context,
-                            self._resource + '.create.start',
-                            body)
+        self._notify(request.context, self._resource + '.create.start', body)
         body = Controller.prepare_request_body(request.context, body, True,
                                                self._resource, self._attr_info,
                                                allow_bulk=self._allow_bulk)
@@ -416,9 +467,7 @@ class Controller(object):
 
         def notify(create_result):
             notifier_method = self._resource + '.create.end'
-            self._notifier.info(request.context,
-                                notifier_method,
-                                create_result)
+            self._notify(request.context, notifier_method, create_result)
             self._send_dhcp_notification(request.context,
                                          create_result,
                                          notifier_method)
@@ -427,7 +476,7 @@ class Controller(object):
         kwargs = {self._parent_id_name: parent_id} if parent_id else {}
         if self._collection in body and self._native_bulk:
             # plugin does atomic bulk create operations
-            obj_creator = getattr(self._plugin, "%s_bulk" % action)
+            obj_creator = self._plugin_handler("%s_bulk" % action)
             objs = obj_creator(request.context, body, **kwargs)
             # Use first element of list to discriminate attributes which
             # should be removed because of authZ policies
@@ -437,7 +486,7 @@ class Controller(object):
                 request.context, obj, fields_to_strip=fields_to_strip)
                 for obj in objs]})
         else:
-            obj_creator = getattr(self._plugin, action)
+            obj_creator = self._plugin_handler(action)
             if self._collection in body:
                 # Emulate atomic bulk behavior
                 objs = self._emulate_bulk_create(obj_creator, request,
@@ -453,9 +502,8 @@ class Controller(object):
 
     def delete(self, request, id, **kwargs):
         """Deletes the specified entity."""
-        self._notifier.info(request.context,
-                            self._resource + '.delete.start',
-                            {self._resource + '_id': id})
+        self._notify(request.context, self._resource + '.delete.start',
+                     {self._resource + '_id': id})
         action = self._plugin_handlers[self.DELETE]
 
         # Check authz
@@ -472,12 +520,11 @@ class Controller(object):
             msg = _('The resource could not be found.')
             raise webob.exc.HTTPNotFound(msg)
 
-        obj_deleter = getattr(self._plugin, action)
+        obj_deleter = self._plugin_handler(action)
         obj_deleter(request.context, id, **kwargs)
         notifier_method = self._resource + '.delete.end'
-        self._notifier.info(request.context,
-                            notifier_method,
-                            {self._resource + '_id': id})
+        self._notify(request.context, notifier_method,
+                     {self._resource + '_id': id})
         result = {self._resource: self._view(request.context, obj)}
         self._send_nova_notification(action, {}, result)
         self._send_dhcp_notification(request.context,
@@ -493,9 +540,8 @@ class Controller(object):
             msg = _("Invalid format: %s") % request.body
             raise exceptions.BadRequest(resource='body', msg=msg)
         payload['id'] = id
-        self._notifier.info(request.context,
-                            self._resource + '.update.start',
-                            payload)
+        self._notify(request.context, self._resource + '.update.start',
+                     payload)
         body = Controller.prepare_request_body(request.context, body, False,
                                                self._resource, self._attr_info,
                                                allow_bulk=self._allow_bulk)
@@ -527,14 +573,14 @@ class Controller(object):
             msg = _('The resource could not be found.')
             raise webob.exc.HTTPNotFound(msg)
 
-        obj_updater = getattr(self._plugin, action)
+        obj_updater = self._plugin_handler(action)
         kwargs = {self._resource: body}
         if parent_id:
             kwargs[self._parent_id_name] = parent_id
         obj = obj_updater(request.context, id, **kwargs)
         result = {self._resource: self._view(request.context, obj)}
         notifier_method = self._resource + '.update.end'
-        self._notifier.info(request.context, notifier_method, result)
+        self._notify(request.context, notifier_method, result)
         self._send_dhcp_notification(request.context,
                                      result,
                                      notifier_method)
@@ -18,6 +18,7 @@ Utility methods for working with WSGI servers redux
 """
 
 import sys
+import types
 
 import netaddr
 import six
@@ -26,6 +27,7 @@ import webob.exc
 
 from neutron.api.v2 import attributes
 from neutron.common import exceptions
+from neutron.common import request_stats
 from neutron.openstack.common import gettextutils
 from neutron.openstack.common import log as logging
 from neutron import wsgi
@@ -33,6 +35,10 @@ from neutron import wsgi
 
 LOG = logging.getLogger(__name__)
 
+# Request environment key under which controllers store the entity tag
+# of the returned resource
+ETAG_ENV = 'neutron.etag'
+
 
 class Request(wsgi.Request):
     pass
@@ -80,7 +86,9 @@ def Resource(controller, faults=None, deserializers=None, serializers=None):
 
         try:
             if request.body:
-                args['body'] = deserializer.deserialize(request.body)['body']
+                with request_stats.phase('deserialize'):
+                    args['body'] = deserializer.deserialize(
+                        request.body)['body']
 
             method = getattr(controller, action)
 
@@ -103,6 +111,8 @@ def Resource(controller, faults=None, deserializers=None, serializers=None):
                 {'NeutronError': get_exception_data(e)})
             kwargs = {'body': body, 'content_type': content_type}
             raise mapped_exc(**kwargs)
+        except webob.exc.HTTPNotModified:
+            raise
         except webob.exc.HTTPException as e:
             type_, value, tb = sys.exc_info()
             LOG.exception(_('%s failed'), action)
@@ -137,18 +147,39 @@ def Resource(controller, faults=None, deserializers=None, serializers=None):
             raise webob.exc.HTTPInternalServerError(**kwargs)
 
         status = action_status.get(action, 200)
-        body = serializer.serialize(result)
+        collection = _get_streamed_collection(result)
+        if collection:
+            if hasattr(serializer, 'serialize_stream'):
+                return webob.Response(
+                    request=request, status=status,
+                    content_type=content_type,
+                    app_iter=serializer.serialize_stream(result, collection))
+            result[collection] = list(result[collection])
+        with request_stats.phase('serialize'):
+            body = serializer.serialize(result)
         # NOTE(jkoelker) Comply with RFC2616 section 9.7
         if status == 204:
             content_type = ''
             body = None
 
-        return webob.Response(request=request, status=status,
-                              content_type=content_type,
-                              body=body)
+        response = webob.Response(request=request, status=status,
+                                  content_type=content_type,
+                                  body=body)
+        etag = request.environ.get(ETAG_ENV)
+        if etag:
+            response.etag = etag
+        return response
     return resource
 
 
+def _get_streamed_collection(result):
+    """Return the key of a lazily built collection in result, if any."""
+    if isinstance(result, dict):
+        for key, value in result.iteritems():
+            if isinstance(value, types.GeneratorType):
+                return key
+
+
 def get_exception_data(e):
     """Extract the information about an exception.
 
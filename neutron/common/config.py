@@ -41,6 +41,10 @@ core_opts = [
                help=_("The API paste config file to use")),
     cfg.StrOpt('api_extensions_path', default="",
                help=_("The path for API extensions")),
+    cfg.StrOpt('api_extensions_manifest', default="",
+               help=_("File caching the alias of the extension defined in "
+                      "each extension file, so that extensions not "
+                      "supported by the loaded plugins are not imported")),
     cfg.StrOpt('policy_file', default="policy.json",
                help=_("The policy file to use")),
     cfg.StrOpt('auth_strategy', default='keystone',
@@ -53,12 +57,40 @@ core_opts = [
                help=_("The base MAC address Neutron will use for VIFs")),
     cfg.IntOpt('mac_generation_retries', default=16,
                help=_("How many times Neutron will retry MAC generation")),
+    cfg.FloatOpt('mac_pool_usage_warning', default=0.8,
+                 help=_("Log a warning when a MAC address generation on a "
+                        "network collides and this ratio of the base_mac "
+                        "pool is in use on the network")),
     cfg.BoolOpt('allow_bulk', default=True,
                 help=_("Allow the usage of the bulk API")),
     cfg.BoolOpt('allow_pagination', default=False,
                 help=_("Allow the usage of the pagination")),
     cfg.BoolOpt('allow_sorting', default=False,
                 help=_("Allow the usage of the sorting")),
+    cfg.BoolOpt('allow_keyset_pagination', default=False,
+                help=_("Use opaque tokens holding the sort key values of "
+                       "the boundary item as markers in pagination links, "
+                       "so that pages are fetched without looking up the "
+                       "marker item. Requires native pagination support "
+                       "in the plugin.")),
+    cfg.BoolOpt('stream_list_responses', default=False,
+                help=_("Send JSON list responses as a chunked stream, "
+                       "serializing the items one at a time instead of "
+                       "building the whole response body in memory")),
+    cfg.ListOpt('rpc_heavy_methods',
+                default=['get_devices_details_list',
+                         'security_group_info_for_devices',
+                         'security_group_rules_for_devices',
+                         'sync_routers'],
+                help=_("RPC methods whose concurrent calls are bounded by "
+                       "rpc_heavy_method_concurrency in each RPC worker")),
+    cfg.IntOpt('rpc_heavy_method_concurrency', default=0,
+               help=_("Maximum number of concurrent calls of the "
+                      "rpc_heavy_methods running in each process; further "
+                      "calls wait for a slot. This bounds the database load "
+                      "of these calls only: a waiting call still holds one "
+                      "of the rpc_thread_pool_size greenthreads. 0 means no "
+                      "limit.")),
     cfg.StrOpt('pagination_max_limit', default="-1",
                help=_("The maximum number of items returned in a single "
                       "response, value was 'infinite' or negative integer "
@@ -0,0 +1,102 @@
+# Copyright 2014 OpenStack Foundation.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Timings of the phases of the API request being processed.
+
+Statistics are only collected while a request is being profiled, see
+neutron.api.profiler. The phase helpers are no-ops otherwise, so they
+can be left in place on hot code paths.
+"""
+
+import collections
+import contextlib
+import functools
+import threading
+import time
+
+
+_local = threading.local()
+
+
+class RequestStats(object):
+    """Phase timings and SQL statistics of one API request.
+
+    Phases may nest (plugin calls issue SQL statements and may check
+    policies), so their times are not meant to add up to the total.
+    """
+
+    def __init__(self):
+        self.start = time.time()
+        self.elapsed = None
+        self.phases = collections.defaultdict(float)
+        self.sql_count = 0
+        self.sql_time = 0.0
+
+    def finish(self):
+        self.elapsed = time.time() - self.start
+
+    def to_dict(self):
+        return {'start': self.start,
+                'elapsed': self.elapsed,
+                'phases': dict(self.phases),
+                'sql_count': self.sql_count,
+                'sql_time': self.sql_time}
+
+
+def start():
+    _local.stats = RequestStats()
+    return _local.stats
+
+
+def stop():
+    stats = current()
+    _local.stats = None
+    if stats:
+        stats.finish()
+    return stats
+
+
+def current():
+    return getattr(_local, 'stats', None)
+
+
+@contextlib.contextmanager
+def phase(name):
+    stats = current()
+    if stats is None:
+        yield
+        return
+    start_time = time.time()
+    try:
+        yield
+    finally:
+        stats.phases[name] += time.time() - start_time
+
+
+def timed(name):
+    """Decorator recording the time spent in a function as a phase."""
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return f(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_sql(elapsed):
+    stats = current()
+    if stats:
+        stats.sql_count += 1
+        stats.sql_time += elapsed
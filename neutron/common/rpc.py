@@ -14,6 +14,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
+
+import eventlet.semaphore
 from oslo.config import cfg
 from oslo import messaging
 from oslo.messaging.rpc import dispatcher as rpc_dispatcher
@@ -104,6 +107,78 @@ def get_notifier(service=None, host=None, publisher_id=None):
     return NOTIFIER.prepare(publisher_id=publisher_id)
 
 
+class MethodPool(object):
+    """Bounds the number of concurrent calls of a class of RPC methods.
+
+    Calls beyond the limit wait for a slot. Queue statistics are kept so
+    that the pool can be sized. The calls are dispatched once the RPC
+    executor has given them a greenthread, so a waiting call keeps its
+    greenthread: the pool bounds the database load of the calls, not their
+    share of the executor.
+    """
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self._semaphore = eventlet.semaphore.Semaphore(size)
+        self.active = 0
+        self.waiting = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def run(self, f, *args, **kwargs):
+        start = time.time()
+        self.waiting += 1
+        try:
+            self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        waited = time.time() - start
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.active += 1
+        try:
+            return f(*args, **kwargs)
+        finally:
+            self.active -= 1
+            self.completed += 1
+            self._semaphore.release()
+            if waited > 0.1:
+                LOG.debug('RPC method pool %(name)s: call queued for '
+                          '%(waited).3f seconds, %(stats)s',
+                          {'name': self.name, 'waited': waited,
+                           'stats': self.get_stats()})
+
+    def get_stats(self):
+        return {'size': self.size,
+                'active': self.active,
+                'waiting': self.waiting,
+                'completed': self.completed,
+                'total_wait': self.total_wait,
+                'max_wait': self.max_wait}
+
+
+_METHOD_POOLS = {}
+
+
+def get_method_pool(method):
+    """Return the pool bounding the concurrency of an RPC method, if any."""
+    if (cfg.CONF.rpc_heavy_method_concurrency < 1 or
+            method not in cfg.CONF.rpc_heavy_methods):
+        return
+    pool = _METHOD_POOLS.get('heavy')
+    if pool is None:
+        pool = _METHOD_POOLS['heavy'] = MethodPool(
+            'heavy', cfg.CONF.rpc_heavy_method_concurrency)
+    return pool
+
+
+def get_method_pool_stats():
+    return dict((name, pool.get_stats())
+                for name, pool in _METHOD_POOLS.items())
+
+
 class RPCDispatcher(rpc_dispatcher.RPCDispatcher):
     def __call__(self, incoming):
         # NOTE(yamahata): '***' is chosen for consistency with
@@ -115,6 +190,14 @@ class RPCDispatcher(rpc_dispatcher.RPCDispatcher):
                   incoming.message)
         return super(RPCDispatcher, self).__call__(incoming)
 
+    def _do_dispatch(self, endpoint, method, ctxt, args):
+        pool = get_method_pool(method)
+        if pool:
+            return pool.run(super(RPCDispatcher, self)._do_dispatch,
+                            endpoint, method, ctxt, args)
+        return super(RPCDispatcher, self)._do_dispatch(endpoint, method,
+                                                       ctxt, args)
+
 
 class RequestContextSerializer(om_serializer.Serializer):
     """This serializer is used to convert RPC common context into
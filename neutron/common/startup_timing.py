@@ -0,0 +1,55 @@
+# Copyright 2014 OpenStack Foundation.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Record how long the phases of server startup take.
+
+Phases may nest (plugins usually create the DB facade while they are
+loaded), so the reported times are not meant to add up.
+"""
+
+import collections
+import contextlib
+import time
+
+from neutron.openstack.common import log as logging
+
+
+LOG = logging.getLogger(__name__)
+
+_phases = collections.OrderedDict()
+
+
+@contextlib.contextmanager
+def timed(phase):
+    start = time.time()
+    try:
+        yield
+    finally:
+        _phases[phase] = _phases.get(phase, 0.0) + time.time() - start
+
+
+def get_report():
+    """Return a copy of the recorded phase durations, in seconds."""
+    return collections.OrderedDict(_phases)
+
+
+def log_report():
+    if _phases:
+        LOG.info(_("Startup timing: %s"),
+                 ', '.join('%s %.3fs' % (phase, elapsed)
+                           for phase, elapsed in _phases.items()))
+
+
+def reset():
+    _phases.clear()
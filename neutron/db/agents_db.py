@@ -22,6 +22,7 @@ from sqlalchemy.orm import exc
 from sqlalchemy import sql
 
 from neutron.common import rpc as n_rpc
+from neutron import context as n_context
 from neutron.db import model_base
 from neutron.db import models_v2
 from neutron.extensions import agent as ext_agent
@@ -29,14 +30,23 @@ from neutron import manager
 from neutron.openstack.common import excutils
 from neutron.openstack.common import jsonutils
 from neutron.openstack.common import log as logging
+from neutron.openstack.common import loopingcall
 from neutron.openstack.common import timeutils
 
 LOG = logging.getLogger(__name__)
-cfg.CONF.register_opt(
+AGENT_OPTS = [
     cfg.IntOpt('agent_down_time', default=75,
                help=_("Seconds to regard the agent is down; should be at "
                       "least twice report_interval, to be sure the "
-                      "agent is down for good.")))
+                      "agent is down for good.")),
+    cfg.IntOpt('agent_heartbeat_flush_interval', default=0,
+               help=_("Seconds between bulk writes of the heartbeats of "
+                      "agents whose reported state did not change. 0 "
+                      "writes every report immediately. Should be well "
+                      "below agent_down_time minus report_interval, since "
+                      "heartbeats may reach the database that much later.")),
+]
+cfg.CONF.register_opts(AGENT_OPTS)
 
 
 class Agent(model_base.BASEV2, models_v2.HasId):
@@ -177,6 +187,9 @@ class AgentDbMixin(ext_agent.AgentPluginBase):
                 res['heartbeat_timestamp'] = current_time
                 if agent.get('start_flag'):
                     res['started_at'] = current_time
+                if agent_db.configurations == res['configurations']:
+                    # Avoid rewriting an unchanged configuration
+                    del res['configurations']
                 greenthread.sleep(0)
                 agent_db.update(res)
             except ext_agent.AgentNotFoundByTypeHost:
@@ -213,6 +226,26 @@ class AgentDbMixin(ext_agent.AgentPluginBase):
                     ctxt.reraise = False
                     return self._create_or_update_agent(context, agent)
 
+    def update_agents_heartbeat(self, context, heartbeats):
+        """Bulk update the heartbeat timestamp of registered agents.
+
+        :param heartbeats: a dict mapping (agent_type, host) tuples to
+                           heartbeat timestamps.
+        """
+        if not heartbeats:
+            return
+        table = Agent.__table__
+        statement = table.update().where(
+            sa.and_(table.c.agent_type == sa.bindparam('b_agent_type'),
+                    table.c.host == sa.bindparam('b_host'))).values(
+                        heartbeat_timestamp=sa.bindparam('b_timestamp'))
+        params = [{'b_agent_type': agent_type,
+                   'b_host': host,
+                   'b_timestamp': timestamp}
+                  for (agent_type, host), timestamp in heartbeats.iteritems()]
+        with context.session.begin(subtransactions=True):
+            context.session.execute(statement, params)
+
 
 class AgentExtRpcCallback(n_rpc.RpcCallback):
     """Processes the rpc report in plugin implementations."""
@@ -223,6 +256,15 @@ class AgentExtRpcCallback(n_rpc.RpcCallback):
     def __init__(self, plugin=None):
         super(AgentExtRpcCallback, self).__init__()
         self.plugin = plugin
+        # (agent_type, host) -> (configurations, time of the last write)
+        self._reported_agents = {}
+        # (agent_type, host) -> heartbeat timestamp not yet written
+        self._pending_heartbeats = {}
+        self._flush_interval = cfg.CONF.agent_heartbeat_flush_interval
+        if self._flush_interval:
+            self._heartbeat_flusher = loopingcall.FixedIntervalLoopingCall(
+                self._flush_heartbeats)
+            self._heartbeat_flusher.start(interval=self._flush_interval)
 
     def report_state(self, context, **kwargs):
         """Report state from agent to server."""
@@ -234,4 +276,49 @@ class AgentExtRpcCallback(n_rpc.RpcCallback):
         agent_state = kwargs['agent_state']['agent_state']
         if not self.plugin:
             self.plugin = manager.NeutronManager.get_plugin()
+        if self._defer_heartbeat(agent_state):
+            return
         self.plugin.create_or_update_agent(context, agent_state)
+        if self._flush_interval:
+            key = (agent_state['agent_type'], agent_state['host'])
+            # The heartbeat was just written, a deferred one would be older
+            self._pending_heartbeats.pop(key, None)
+            self._reported_agents[key] = (
+                agent_state.get('configurations', {}), timeutils.utcnow())
+
+    def _defer_heartbeat(self, agent_state):
+        """Queue the heartbeat of an agent whose state did not change.
+
+        Returns True if the heartbeat will be written by the next bulk
+        flush instead of immediately.
+        """
+        if not self._flush_interval or agent_state.get('start_flag'):
+            return False
+        key = (agent_state['agent_type'], agent_state['host'])
+        reported = self._reported_agents.get(key)
+        if not reported:
+            return False
+        configurations, written_at = reported
+        # Agents may report to other workers too, so the whole state is
+        # still periodically rewritten to catch up with their changes.
+        if (configurations != agent_state.get('configurations', {}) or
+                timeutils.is_older_than(written_at,
+                                        cfg.CONF.agent_down_time)):
+            return False
+        self._pending_heartbeats[key] = timeutils.utcnow()
+        return True
+
+    def _flush_heartbeats(self):
+        heartbeats = self._pending_heartbeats
+        if not heartbeats:
+            return
+        self._pending_heartbeats = {}
+        try:
+            self.plugin.update_agents_heartbeat(
+                n_context.get_admin_context(), heartbeats)
+        except Exception:
+            LOG.exception(_("Failed to write %d agent heartbeats"),
+                          len(heartbeats))
+            # Retry on the next flush unless a newer heartbeat was queued
+            for key, timestamp in heartbeats.iteritems():
+                self._pending_heartbeats.setdefault(key, timestamp)
@@ -16,6 +16,8 @@
 from oslo.config import cfg
 from oslo.db.sqlalchemy import session
 
+from neutron.common import startup_timing
+
 _FACADE = None
 
 
@@ -23,7 +25,9 @@ def _create_facade_lazily():
     global _FACADE
 
     if _FACADE is None:
-        _FACADE = session.EngineFacade.from_config(cfg.CONF, sqlite_fk=True)
+        with startup_timing.timed('db_facade'):
+            _FACADE = session.EngineFacade.from_config(cfg.CONF,
+                                                       sqlite_fk=True)
 
     return _FACADE
 
@@ -15,8 +15,10 @@
 
 import weakref
 
+import sqlalchemy
 from sqlalchemy import sql
 
+from neutron.api import api_common
 from neutron.common import exceptions as n_exc
 from neutron.db import sqlalchemyutils
 
@@ -124,6 +126,17 @@ class CommonDbMixin(object):
         query = self._model_query(context, model)
         return query.filter(model.id == id).one()
 
+    def _get_revision_number(self, context, model, id):
+        """Return the revision number of a resource without loading it.
+
+        None is returned if the resource does not exist or is not visible
+        in the given context.
+        """
+        query = self._model_query(context, model).filter(model.id == id)
+        row = query.with_entities(model.revision_number).first()
+        if row:
+            return row.revision_number
+
     def _apply_filters_to_query(self, query, model, filters):
         if filters:
             for key, value in filters.iteritems():
@@ -165,15 +178,48 @@ class CommonDbMixin(object):
                                                     marker_obj=marker_obj)
         return collection
 
+    def _get_projection_columns(self, model, fields):
+        """Return the model attributes to select for the requested fields.
+
+        None is returned unless every requested field is a column of the
+        model. Other fields are built from relationships or by the dict
+        extend functions and need the whole object to be loaded.
+        """
+        if not fields:
+            return
+        column_names = sqlalchemy.inspect(model).column_attrs.keys()
+        if not all(field in column_names for field in fields):
+            return
+        return [getattr(model, field) for field in set(fields)]
+
+    def _get_projected_items(self, query, model, fields):
+        """Run query selecting only the columns needed for fields.
+
+        Returns a list of dicts holding just the requested fields, or None
+        when the fields cannot be served from the columns alone. Dict
+        extend functions are not called for projected items, as they only
+        contribute attributes which are not columns of the model.
+        """
+        columns = self._get_projection_columns(model, fields)
+        if not columns:
+            return
+        names = [column.key for column in columns]
+        return [dict(zip(names, row))
+                for row in query.with_entities(*columns)]
+
     def _get_collection(self, context, model, dict_func, filters=None,
                         fields=None, sorts=None, limit=None, marker_obj=None,
-                        page_reverse=False):
+                        page_reverse=False, project_fields=False):
         query = self._get_collection_query(context, model, filters=filters,
                                            sorts=sorts,
                                            limit=limit,
                                            marker_obj=marker_obj,
                                            page_reverse=page_reverse)
-        items = [dict_func(c, fields) for c in query]
+        items = None
+        if project_fields:
+            items = self._get_projected_items(query, model, fields)
+        if items is None:
+            items = [dict_func(c, fields) for c in query]
         if limit and page_reverse:
             items.reverse()
         return items
@@ -183,6 +229,10 @@ class CommonDbMixin(object):
 
     def _get_marker_obj(self, context, resource, limit, marker):
         if limit and marker:
+            if isinstance(marker, api_common.KeysetMarker):
+                # The sort key values are known already, there is no need
+                # to load the marker object
+                return marker
             return getattr(self, '_get_%s' % resource)(context, marker)
         return None
 
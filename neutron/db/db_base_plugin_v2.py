@@ -13,7 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import random
+import collections
+import math
 
 import netaddr
 from oslo.config import cfg
@@ -26,6 +27,7 @@ from neutron.api.v2 import attributes
 from neutron.common import constants
 from neutron.common import exceptions as n_exc
 from neutron.common import ipv6_utils
+from neutron.common import utils
 from neutron import context as ctx
 from neutron.db import common_db_mixin
 from neutron.db import models_v2
@@ -50,6 +52,9 @@ LOG = logging.getLogger(__name__)
 # IP allocations being cleaned up by cascade.
 AUTO_DELETE_PORT_OWNERS = [constants.DEVICE_OWNER_DHCP]
 
+# Maximum number of MAC address candidates checked per address needed
+MAX_MAC_OVERSAMPLE = 16
+
 
 class NeutronDbPluginV2(neutron_plugin_base_v2.NeutronPluginBaseV2,
                         common_db_mixin.CommonDbMixin):
@@ -127,31 +132,101 @@ class NeutronDbPluginV2(neutron_plugin_base_v2.NeutronPluginBaseV2,
 
     @staticmethod
     def _generate_mac(context, network_id):
+        mac_address = NeutronDbPluginV2._generate_macs(context, network_id,
+                                                       1)[0]
+        LOG.debug(_("Generated mac for network %(network_id)s "
+                    "is %(mac_address)s"),
+                  {'network_id': network_id,
+                   'mac_address': mac_address})
+        return mac_address
+
+    @staticmethod
+    def _generate_macs(context, network_id, count, exclude=()):
+        """Generate count MAC addresses unique on the network.
+
+        Each attempt checks a batch of random candidates with a single
+        query. On the first collision the usage of the MAC pool of the
+        network is checked: generation fails right away if the pool is
+        too full for the new addresses, and later batches hold more
+        candidates the fuller the pool is.
+        """
         base_mac = cfg.CONF.base_mac.split(':')
         max_retries = cfg.CONF.mac_generation_retries
+        exclude = set(exclude)
+        macs = set()
+        oversample = 1
         for i in range(max_retries):
-            mac = [int(base_mac[0], 16), int(base_mac[1], 16),
-                   int(base_mac[2], 16), random.randint(0x00, 0xff),
-                   random.randint(0x00, 0xff), random.randint(0x00, 0xff)]
-            if base_mac[3] != '00':
-                mac[3] = int(base_mac[3], 16)
-            mac_address = ':'.join(map(lambda x: "%02x" % x, mac))
-            if NeutronDbPluginV2._check_unique_mac(context, network_id,
-                                                   mac_address):
-                LOG.debug(_("Generated mac for network %(network_id)s "
-                            "is %(mac_address)s"),
-                          {'network_id': network_id,
-                           'mac_address': mac_address})
-                return mac_address
-            else:
-                LOG.debug(_("Generated mac %(mac_address)s exists. Remaining "
-                            "attempts %(max_retries)s."),
-                          {'mac_address': mac_address,
-                           'max_retries': max_retries - (i + 1)})
+            missing = count - len(macs)
+            candidates = set(utils.get_random_mac(base_mac)
+                             for j in range(missing * oversample))
+            candidates -= macs | exclude
+            candidates -= NeutronDbPluginV2._get_macs_in_use(
+                context, network_id, candidates)
+            macs.update(sorted(candidates)[:missing])
+            if len(macs) == count:
+                return list(macs)
+            LOG.debug(_("Generated %(count)d mac addresses already in use "
+                        "on network %(network_id)s. Remaining attempts "
+                        "%(max_retries)s."),
+                      {'count': count - len(macs),
+                       'network_id': network_id,
+                       'max_retries': max_retries - (i + 1)})
+            if i == 0:
+                usage = NeutronDbPluginV2._check_mac_pool_usage(
+                    context, network_id, count - len(macs))
+                oversample = min(
+                    MAX_MAC_OVERSAMPLE,
+                    int(math.ceil(2 / max(1 - usage['ratio'], 0.01))))
         LOG.error(_("Unable to generate mac address after %s attempts"),
                   max_retries)
         raise n_exc.MacAddressGenerationFailure(net_id=network_id)
 
+    @staticmethod
+    def _get_mac_pool_prefix():
+        base_mac = cfg.CONF.base_mac.split(':')
+        octets = 4 if base_mac[3] != '00' else 3
+        return ''.join('%02x:' % int(x, 16) for x in base_mac[:octets])
+
+    @staticmethod
+    def get_mac_pool_usage(context, network_id):
+        """Return the usage of the base_mac pool on a network.
+
+        The returned dict holds the number of addresses of the pool in
+        use on the network, the size of the pool and their ratio.
+        """
+        prefix = NeutronDbPluginV2._get_mac_pool_prefix()
+        size = 2 ** (8 * (6 - len(prefix) // 3))
+        query = context.session.query(models_v2.Port.id)
+        used = query.filter(models_v2.Port.network_id == network_id,
+                            models_v2.Port.mac_address.startswith(
+                                prefix)).count()
+        return {'network_id': network_id,
+                'used': used,
+                'size': size,
+                'ratio': float(used) / size}
+
+    @staticmethod
+    def _check_mac_pool_usage(context, network_id, needed):
+        usage = NeutronDbPluginV2.get_mac_pool_usage(context, network_id)
+        if usage['used'] + needed > usage['size']:
+            LOG.error(_("The mac address pool of network %(network_id)s is "
+                        "exhausted: %(used)d of %(size)d addresses in use"),
+                      usage)
+            raise n_exc.MacAddressGenerationFailure(net_id=network_id)
+        if usage['ratio'] >= cfg.CONF.mac_pool_usage_warning:
+            LOG.warning(_("%(used)d of %(size)d mac addresses of the pool "
+                          "are in use on network %(network_id)s"), usage)
+        return usage
+
+    @staticmethod
+    def _get_macs_in_use(context, network_id, mac_addresses):
+        if not mac_addresses:
+            return set()
+        query = context.session.query(models_v2.Port.mac_address)
+        query = query.filter(models_v2.Port.network_id == network_id,
+                             models_v2.Port.mac_address.in_(mac_addresses))
+        return set(mac for (mac,) in query)
+
     @staticmethod
     def _check_unique_mac(context, network_id, mac_address):
         mac_qry = context.session.query(models_v2.Port)
@@ -878,6 +953,7 @@ class NeutronDbPluginV2(neutron_plugin_base_v2.NeutronPluginBaseV2,
             if 'shared' in n:
                 self._validate_shared_update(context, id, network, n)
             network.update(n)
+            network.bump_revision()
             # also update shared in all the subnets for this network
             subnets = self._get_subnets_by_network(context, id)
             for subnet in subnets:
@@ -915,6 +991,9 @@ class NeutronDbPluginV2(neutron_plugin_base_v2.NeutronPluginBaseV2,
         network = self._get_network(context, id)
         return self._make_network_dict(network, fields)
 
+    def get_network_revision(self, context, id):
+        return self._get_revision_number(context, models_v2.Network, id)
+
     def get_networks(self, context, filters=None, fields=None,
                      sorts=None, limit=None, marker=None,
                      page_reverse=False):
@@ -925,7 +1004,8 @@ class NeutronDbPluginV2(neutron_plugin_base_v2.NeutronPluginBaseV2,
                                     sorts=sorts,
                                     limit=limit,
                                     marker_obj=marker_obj,
-                                    page_reverse=page_reverse)
+                                    page_reverse=page_reverse,
+                                    project_fields=True)
 
     def get_networks_count(self, context, filters=None):
         return self._get_collection_count(context, models_v2.Network,
@@ -1206,6 +1286,7 @@ class NeutronDbPluginV2(neutron_plugin_base_v2.NeutronPluginBaseV2,
                                                                  id, s)
             subnet = self._get_subnet(context, id)
             subnet.update(s)
+            subnet.bump_revision()
         result = self._make_subnet_dict(subnet)
         # Keep up with fields that changed
         if changed_dns:
@@ -1240,6 +1321,9 @@ class NeutronDbPluginV2(neutron_plugin_base_v2.NeutronPluginBaseV2,
         subnet = self._get_subnet(context, id)
         return self._make_subnet_dict(subnet, fields)
 
+    def get_subnet_revision(self, context, id):
+        return self._get_revision_number(context, models_v2.Subnet, id)
+
     def get_subnets(self, context, filters=None, fields=None,
                     sorts=None, limit=None, marker=None,
                     page_reverse=False):
@@ -1250,7 +1334,8 @@ class NeutronDbPluginV2(neutron_plugin_base_v2.NeutronPluginBaseV2,
                                     sorts=sorts,
                                     limit=limit,
                                     marker_obj=marker_obj,
-                                    page_reverse=page_reverse)
+                                    page_reverse=page_reverse,
+                                    project_fields=True)
 
     def get_subnets_count(self, context, filters=None):
         return self._get_collection_count(context, models_v2.Subnet,
@@ -1259,7 +1344,72 @@ class NeutronDbPluginV2(neutron_plugin_base_v2.NeutronPluginBaseV2,
     def create_port_bulk(self, context, ports):
         return self._create_bulk('port', context, ports)
 
+    def _check_ports_for_create(self, context, ports):
+        """Check the networks and MAC addresses of a batch of new ports.
+
+        This does for the whole batch what create_port does for each
+        port: the networks must exist, missing MAC addresses are generated
+        and given ones must be unique on their network. It takes a query
+        per network instead of several per port. The ports are then
+        created with create_port_db(..., checked=True).
+        """
+        by_network = collections.defaultdict(list)
+        for item in ports:
+            by_network[item['port']['network_id']].append(item['port'])
+        query = self._model_query(context, models_v2.Network)
+        query = query.with_entities(models_v2.Network.id).filter(
+            models_v2.Network.id.in_(by_network.keys()))
+        found = set(network_id for (network_id,) in query)
+        for network_id, items in by_network.iteritems():
+            if network_id not in found:
+                raise n_exc.NetworkNotFound(net_id=network_id)
+            given = [p['mac_address'] for p in items
+                     if p['mac_address'] is not attributes.ATTR_NOT_SPECIFIED]
+            in_use = self._get_macs_in_use(context, network_id, given)
+            seen = set()
+            for mac_address in given:
+                if mac_address in in_use or mac_address in seen:
+                    raise n_exc.MacAddressInUse(net_id=network_id,
+                                                mac=mac_address)
+                seen.add(mac_address)
+            missing = [p for p in items
+                       if p['mac_address'] is attributes.ATTR_NOT_SPECIFIED]
+            if missing:
+                macs = self._generate_macs(context, network_id, len(missing),
+                                           exclude=seen)
+                for p, mac_address in zip(missing, macs):
+                    p['mac_address'] = mac_address
+
     def create_port(self, context, port):
+        return self.create_port_db(context, port)
+
+    def _check_port_for_create(self, context, p):
+        network_id = p['network_id']
+        # Ensure that the network exists.
+        self._get_network(context, network_id)
+
+        # Ensure that a MAC address is defined and it is unique on the
+        # network
+        if p['mac_address'] is attributes.ATTR_NOT_SPECIFIED:
+            #Note(scollins) Add the generated mac_address to the port,
+            #since _allocate_ips_for_port will need the mac when
+            #calculating an EUI-64 address for a v6 subnet
+            p['mac_address'] = NeutronDbPluginV2._generate_mac(context,
+                                                               network_id)
+        else:
+            # Ensure that the mac on the network is unique
+            if not NeutronDbPluginV2._check_unique_mac(context,
+                                                       network_id,
+                                                       p['mac_address']):
+                raise n_exc.MacAddressInUse(net_id=network_id,
+                                            mac=p['mac_address'])
+
+    def create_port_db(self, context, port, checked=False):
+        """Create a port in the database and return its dict.
+
+        When checked is True the network and the MAC address of the port
+        have already been checked by _check_ports_for_create.
+        """
         p = port['port']
         port_id = p.get('id') or uuidutils.generate_uuid()
         network_id = p['network_id']
@@ -1271,24 +1421,8 @@ class NeutronDbPluginV2(neutron_plugin_base_v2.NeutronPluginBaseV2,
                                                                     tenant_id)
 
         with context.session.begin(subtransactions=True):
-            # Ensure that the network exists.
-            self._get_network(context, network_id)
-
-            # Ensure that a MAC address is defined and it is unique on the
-            # network
-            if p['mac_address'] is attributes.ATTR_NOT_SPECIFIED:
-                #Note(scollins) Add the generated mac_address to the port,
-                #since _allocate_ips_for_port will need the mac when
-                #calculating an EUI-64 address for a v6 subnet
-                p['mac_address'] = NeutronDbPluginV2._generate_mac(context,
-                                                                   network_id)
-            else:
-                # Ensure that the mac on the network is unique
-                if not NeutronDbPluginV2._check_unique_mac(context,
-                                                           network_id,
-                                                           p['mac_address']):
-                    raise n_exc.MacAddressInUse(net_id=network_id,
-                                                mac=p['mac_address'])
+            if not checked:
+                self._check_port_for_create(context, p)
 
             # Returns the IP's for the port
             ips = self._allocate_ips_for_port(context, port)
@@ -1359,6 +1493,7 @@ class NeutronDbPluginV2(neutron_plugin_base_v2.NeutronPluginBaseV2,
             # Remove all attributes in p which are not in the port DB model
             # and then update the port
             port.update(self._filter_non_model_columns(p, models_v2.Port))
+            port.bump_revision()
 
         result = self._make_port_dict(port)
         # Keep up with fields that changed
@@ -1397,6 +1532,9 @@ class NeutronDbPluginV2(neutron_plugin_base_v2.NeutronPluginBaseV2,
         port = self._get_port(context, id)
         return self._make_port_dict(port, fields)
 
+    def get_port_revision(self, context, id):
+        return self._get_revision_number(context, models_v2.Port, id)
+
     def _get_ports_query(self, context, filters=None, sorts=None, limit=None,
                          marker_obj=None, page_reverse=False):
         Port = models_v2.Port
@@ -1432,7 +1570,9 @@ class NeutronDbPluginV2(neutron_plugin_base_v2.NeutronPluginBaseV2,
                                       sorts=sorts, limit=limit,
                                       marker_obj=marker_obj,
                                       page_reverse=page_reverse)
-        items = [self._make_port_dict(c, fields) for c in query]
+        items = self._get_projected_items(query, models_v2.Port, fields)
+        if items is None:
+            items = [self._make_port_dict(c, fields) for c in query]
         if limit and page_reverse:
             items.reverse()
         return items
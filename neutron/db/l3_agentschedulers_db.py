@@ -115,6 +115,7 @@ class L3AgentSchedulerDbMixin(l3agentscheduler.L3AgentSchedulerPluginBase,
             join(agents_db.Agent).
             filter(agents_db.Agent.heartbeat_timestamp < cutoff,
                    agents_db.Agent.admin_state_up))
+        router_ids = []
         for binding in down_bindings:
             LOG.warn(_LW("Rescheduling router %(router)s from agent %(agent)s "
                          "because the agent did not report to the server in "
@@ -122,7 +123,9 @@ class L3AgentSchedulerDbMixin(l3agentscheduler.L3AgentSchedulerPluginBase,
                      {'router': binding.router_id,
                       'agent': binding.l3_agent_id,
                       'dead_time': agent_dead_limit})
-            self.reschedule_router(context, binding.router_id)
+            router_ids.append(binding.router_id)
+        if router_ids:
+            self.reschedule_routers(context, router_ids)
 
     def validate_agent_router_combination(self, context, agent, router):
         """Validate if the router can be correctly assigned to the agent.
@@ -258,6 +261,80 @@ class L3AgentSchedulerDbMixin(l3agentscheduler.L3AgentSchedulerPluginBase,
             l3_notifier.router_added_to_agent(
                 context, [router_id], new_agent.host)
 
+    def reschedule_routers(self, context, router_ids):
+        """Reschedule a set of routers to new l3 agents in a single pass.
+
+        The load of every active l3 agent is computed once and the router
+        scheduler chooses the agents of all the centralized routers from
+        it. Old bindings are removed and new ones created in one
+        transaction, and each target agent receives a single
+        router_added_to_agent notification listing all the routers it has
+        been given. Distributed routers, which may be bound to several
+        agents, and routers whose scheduler cannot choose agents in bulk
+        are rescheduled one at a time.
+        """
+        routers = self.get_routers(context, filters={'id': router_ids})
+        bulk = hasattr(self.router_scheduler, 'choose_router_agents')
+        centralized = []
+        for router in routers:
+            if router.get('distributed') or not bulk:
+                try:
+                    self.reschedule_router(context, router['id'])
+                except l3agentscheduler.RouterReschedulingFailed:
+                    LOG.warn(_LW("Failed to reschedule the router %s"),
+                             router['id'])
+            else:
+                centralized.append(router)
+        if not centralized:
+            return
+
+        cur_bindings = self._get_l3_bindings_hosting_routers(
+            context, [router['id'] for router in centralized])
+        cur_agents = dict((binding.router_id, binding.l3_agent)
+                          for binding in cur_bindings)
+        active_agents = self.get_l3_agents(context, active=True)
+        load = self.get_l3_agents_load(
+            context, [agent.id for agent in active_agents])
+
+        router_candidates = []
+        for router in centralized:
+            old_agent = cur_agents.get(router['id'])
+            candidates = [
+                agent for agent in self.get_l3_agent_candidates(
+                    context, router, active_agents)
+                if not old_agent or agent.id != old_agent.id]
+            if not candidates:
+                LOG.warn(_LW("No L3 agents can host the router %s, "
+                             "keeping its current binding"), router['id'])
+                continue
+            router_candidates.append((router['id'], candidates))
+        if not router_candidates:
+            return
+        new_agents = self.router_scheduler.choose_router_agents(
+            self, context, router_candidates, load)
+
+        with context.session.begin(subtransactions=True):
+            query = context.session.query(RouterL3AgentBinding)
+            query.filter(
+                RouterL3AgentBinding.router_id.in_(new_agents.keys())).delete(
+                    synchronize_session=False)
+            for router_id, agent in new_agents.iteritems():
+                context.session.add(RouterL3AgentBinding(
+                    router_id=router_id, l3_agent_id=agent.id))
+
+        l3_notifier = self.agent_notifiers.get(constants.AGENT_TYPE_L3)
+        if l3_notifier:
+            routers_by_host = {}
+            for router_id, agent in new_agents.iteritems():
+                old_agent = cur_agents.get(router_id)
+                if old_agent:
+                    l3_notifier.router_removed_from_agent(
+                        context, router_id, old_agent.host)
+                routers_by_host.setdefault(agent.host, []).append(router_id)
+            for host, host_router_ids in routers_by_host.iteritems():
+                l3_notifier.router_added_to_agent(
+                    context, host_router_ids, host)
+
     def list_routers_on_l3_agent(self, context, agent_id):
         query = context.session.query(RouterL3AgentBinding.router_id)
         query = query.filter(RouterL3AgentBinding.l3_agent_id == agent_id)
@@ -455,6 +532,20 @@ class L3AgentSchedulerDbMixin(l3agentscheduler.L3AgentSchedulerPluginBase,
         for router in routers:
             self.schedule_router(context, router, candidates=None, hints=hints)
 
+    def get_l3_agents_load(self, context, agent_ids):
+        """Return a dict mapping each l3 agent id to its router count."""
+        load = dict((agent_id, 0) for agent_id in agent_ids)
+        if not agent_ids:
+            return load
+        query = context.session.query(
+            RouterL3AgentBinding.l3_agent_id,
+            func.count(RouterL3AgentBinding.router_id)).filter(
+                RouterL3AgentBinding.l3_agent_id.in_(agent_ids)).group_by(
+                    RouterL3AgentBinding.l3_agent_id)
+        for agent_id, count in query:
+            load[agent_id] = count
+        return load
+
     def get_l3_agent_with_min_routers(self, context, agent_ids):
         """Return l3 agent with the least number of routers."""
         query = context.session.query(
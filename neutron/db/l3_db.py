@@ -47,7 +47,8 @@ API_TO_DB_COLUMN_MAP = {'port_id': 'fixed_port_id'}
 CORE_ROUTER_ATTRS = ('id', 'name', 'tenant_id', 'admin_state_up', 'status')
 
 
-class Router(model_base.BASEV2, models_v2.HasId, models_v2.HasTenant):
+class Router(model_base.BASEV2, models_v2.HasId, models_v2.HasTenant,
+             models_v2.HasRevision):
     """Represents a v2 neutron router."""
 
     name = sa.Column(sa.String(255))
@@ -147,6 +148,7 @@ class L3_NAT_dbonly_mixin(l3.RouterPluginBase):
             router_db = self._get_router(context, router_id)
             if data:
                 router_db.update(data)
+            router_db.bump_revision()
             return router_db
 
     def update_router(self, context, id, router):
@@ -347,6 +349,9 @@ class L3_NAT_dbonly_mixin(l3.RouterPluginBase):
         router = self._get_router(context, id)
         return self._make_router_dict(router, fields)
 
+    def get_router_revision(self, context, id):
+        return self._get_revision_number(context, Router, id)
+
     def get_routers(self, context, filters=None, fields=None,
                     sorts=None, limit=None, marker=None,
                     page_reverse=False):
@@ -13,11 +13,13 @@
 #    under the License.
 
 from oslo.config import cfg
+from sqlalchemy import sql
 
 from neutron.api.v2 import attributes
 from neutron.common import constants as l3_const
 from neutron.common import exceptions as n_exc
 from neutron.common import utils as n_utils
+from neutron.db import agents_db
 from neutron.db import l3_attrs_db
 from neutron.db import l3_db
 from neutron.db import l3_dvrscheduler_db as l3_dvrsched_db
@@ -41,6 +43,12 @@ router_distributed_opts = [
                 default=False,
                 help=_("System-wide flag to determine the type of router "
                        "that tenants can create. Only admin can override.")),
+    cfg.FloatOpt('dvr_arp_update_interval',
+                 default=0,
+                 help=_("Number of seconds to collect VM ARP entry updates "
+                        "for distributed routers before sending them to the "
+                        "L3 agents as one batch per router. 0 sends each "
+                        "update as soon as it happens.")),
 ]
 cfg.CONF.register_opts(router_distributed_opts)
 
@@ -274,32 +282,65 @@ class L3_NAT_with_dvr_db_mixin(l3_db.L3_NAT_db_mixin,
 
     def _process_routers(self, context, routers):
         routers_dict = {}
+        # fetch the SNAT ports of all the routers at once
+        snat_router_ids = [router['id'] for router in routers
+                           if router['gw_port_id']]
+        snat_router_intfs = dict((router_id, [])
+                                 for router_id in snat_router_ids)
+        for intf in self.get_snat_sync_interfaces(context, snat_router_ids):
+            snat_router_intfs[intf['device_id']].append(intf)
         for router in routers:
             routers_dict[router['id']] = router
-            router_ids = [router['id']]
             if router['gw_port_id']:
-                snat_router_intfs = self.get_snat_sync_interfaces(context,
-                                                                  router_ids)
-                LOG.debug("SNAT ports returned: %s ", snat_router_intfs)
-                router[SNAT_ROUTER_INTF_KEY] = snat_router_intfs
+                LOG.debug("SNAT ports returned: %s ",
+                          snat_router_intfs[router['id']])
+                router[SNAT_ROUTER_INTF_KEY] = snat_router_intfs[router['id']]
         return routers_dict
 
+    def _get_l3_agents_by_host(self, context, hosts):
+        """Return a host->L3 agent mapping of the given hosts."""
+        if not hosts:
+            return {}
+        query = context.session.query(agents_db.Agent)
+        query = query.filter(
+            agents_db.Agent.agent_type == l3_const.AGENT_TYPE_L3,
+            agents_db.Agent.host.in_(hosts))
+        agents = {}
+        for agent in query:
+            agents.setdefault(agent.host, []).append(agent)
+        agents_by_host = {}
+        for host in hosts:
+            if len(agents.get(host, [])) == 1:
+                agents_by_host[host] = agents[host][0]
+            else:
+                # raises the usual not found or multiple agents error
+                agents_by_host[host] = self._get_agent_by_type_and_host(
+                    context, l3_const.AGENT_TYPE_L3, host)
+        return agents_by_host
+
     def _process_floating_ips(self, context, routers_dict, floating_ips):
+        # floating_ips have their 'host' set by get_sync_data
+        dvr_hosts = set(
+            floating_ip['host'] for floating_ip in floating_ips
+            if routers_dict.get(floating_ip['router_id'], {}).get(
+                'distributed'))
+        fip_agents = self._get_l3_agents_by_host(context, dvr_hosts)
+        fip_agent_intfs = dict((agent['id'], [])
+                               for agent in fip_agents.values())
+        for intf in self._get_fip_sync_interfaces(context,
+                                                  list(fip_agent_intfs)):
+            fip_agent_intfs[intf['device_id']].append(intf)
+
         for floating_ip in floating_ips:
             router = routers_dict.get(floating_ip['router_id'])
             if router:
                 router_floatingips = router.get(l3_const.FLOATINGIP_KEY, [])
                 floatingip_agent_intfs = []
                 if router['distributed']:
-                    floating_ip['host'] = self.get_vm_port_hostid(
-                        context, floating_ip['port_id'])
                     LOG.debug("Floating IP host: %s", floating_ip['host'])
-                    fip_agent = self._get_agent_by_type_and_host(
-                        context, l3_const.AGENT_TYPE_L3,
-                        floating_ip['host'])
+                    fip_agent = fip_agents[floating_ip['host']]
                     LOG.debug("FIP Agent : %s ", fip_agent['id'])
-                    floatingip_agent_intfs = self.get_fip_sync_interfaces(
-                        context, fip_agent['id'])
+                    floatingip_agent_intfs = fip_agent_intfs[fip_agent['id']]
                     LOG.debug("FIP Agent ports: %s", floatingip_agent_intfs)
                 router_floatingips.append(floating_ip)
                 router[l3_const.FLOATINGIP_KEY] = router_floatingips
@@ -310,7 +351,13 @@ class L3_NAT_with_dvr_db_mixin(l3_db.L3_NAT_db_mixin,
         """Query router interfaces that relate to list of router_ids."""
         if not fip_agent_id:
             return []
-        filters = {'device_id': [fip_agent_id],
+        return self._get_fip_sync_interfaces(context, [fip_agent_id])
+
+    def _get_fip_sync_interfaces(self, context, fip_agent_ids):
+        """Query the FIP agent gateway ports of a list of agents."""
+        if not fip_agent_ids:
+            return []
+        filters = {'device_id': fip_agent_ids,
                    'device_owner': [DEVICE_OWNER_AGENT_GW]}
         interfaces = self._core_plugin.get_ports(context.elevated(), filters)
         LOG.debug("Return the FIP ports: %s ", interfaces)
@@ -319,17 +366,25 @@ class L3_NAT_with_dvr_db_mixin(l3_db.L3_NAT_db_mixin,
         return interfaces
 
     def get_sync_data(self, context, router_ids=None, active=None):
-        routers, interfaces, floating_ips = self._get_router_info_list(
-            context, router_ids=router_ids, active=active,
-            device_owners=[l3_const.DEVICE_OWNER_ROUTER_INTF,
-                           DEVICE_OWNER_DVR_INTERFACE])
-        # Add the port binding host to the floatingip dictionary
-        for fip in floating_ips:
-            fip['host'] = self.get_vm_port_hostid(context, fip['port_id'])
-        routers_dict = self._process_routers(context, routers)
-        self._process_floating_ips(context, routers_dict, floating_ips)
-        self._process_interfaces(routers_dict, interfaces)
-        return routers_dict.values()
+        with context.session.begin(subtransactions=True):
+            routers, interfaces, floating_ips = self._get_router_info_list(
+                context, router_ids=router_ids, active=active,
+                device_owners=[l3_const.DEVICE_OWNER_ROUTER_INTF,
+                               DEVICE_OWNER_DVR_INTERFACE])
+            # Add the port binding host to the floatingip dictionary
+            fip_port_ids = [fip['port_id'] for fip in floating_ips]
+            fip_ports = {}
+            if fip_port_ids:
+                fip_ports = dict(
+                    (port['id'], port) for port in self._core_plugin.get_ports(
+                        context, filters={'id': fip_port_ids}))
+            for fip in floating_ips:
+                fip['host'] = self.get_vm_port_hostid(
+                    context, fip['port_id'], fip_ports.get(fip['port_id']))
+            routers_dict = self._process_routers(context, routers)
+            self._process_floating_ips(context, routers_dict, floating_ips)
+            self._process_interfaces(routers_dict, interfaces)
+            return routers_dict.values()
 
     def get_vm_port_hostid(self, context, port_id, port=None):
         """Return the portbinding host_id."""
@@ -494,22 +549,40 @@ class L3_NAT_with_dvr_db_mixin(l3_db.L3_NAT_db_mixin,
             return
         ip_address = port_dict['fixed_ips'][0]['ip_address']
         subnet = port_dict['fixed_ips'][0]['subnet_id']
-        filters = {'fixed_ips': {'subnet_id': [subnet]}}
-        ports = self._core_plugin.get_ports(context, filters=filters)
-        for port in ports:
-            if port['device_owner'] == DEVICE_OWNER_DVR_INTERFACE:
-                router_id = port['device_id']
-                router_dict = self._get_router(context, router_id)
-                if router_dict.extra_attributes.distributed:
-                    arp_table = {'ip_address': ip_address,
-                                 'mac_address': port_dict['mac_address'],
-                                 'subnet_id': subnet}
-                    if action == "add":
-                        notify_action = self.l3_rpc_notifier.add_arp_entry
-                    elif action == "del":
-                        notify_action = self.l3_rpc_notifier.del_arp_entry
-                    notify_action(context, router_id, arp_table)
-                    return
+        router_id = self._get_dvr_router_id_for_subnet(context, subnet)
+        if not router_id:
+            return
+        arp_table = {'ip_address': ip_address,
+                     'mac_address': port_dict['mac_address'],
+                     'subnet_id': subnet}
+        interval = cfg.CONF.dvr_arp_update_interval
+        if interval > 0:
+            operation = 'add' if action == "add" else 'delete'
+            self.l3_rpc_notifier.queue_arp_entry(
+                context, router_id, arp_table, operation, interval)
+            return
+        if action == "add":
+            notify_action = self.l3_rpc_notifier.add_arp_entry
+        elif action == "del":
+            notify_action = self.l3_rpc_notifier.del_arp_entry
+        notify_action(context, router_id, arp_table)
+
+    def _get_dvr_router_id_for_subnet(self, context, subnet_id):
+        """Return the distributed router with an interface on subnet_id.
+
+        A single query through the subnet's IP allocations, instead of
+        listing every port on the subnet and loading each router.
+        """
+        extra_attrs = l3_attrs_db.RouterExtraAttributes
+        query = context.session.query(models_v2.Port.device_id).join(
+            models_v2.Port.fixed_ips).join(
+                extra_attrs,
+                extra_attrs.router_id == models_v2.Port.device_id).filter(
+                    models_v2.IPAllocation.subnet_id == subnet_id,
+                    models_v2.Port.device_owner == DEVICE_OWNER_DVR_INTERFACE,
+                    extra_attrs.distributed == sql.true())
+        router = query.first()
+        return router and router.device_id
 
     def delete_csnat_router_interface_ports(self, context,
                                             router, subnet_id=None):
@@ -530,6 +530,42 @@ class LoadBalancerPluginDb(loadbalancer.LoadBalancerPluginBase,
                 if stats_status:
                     self.update_status(context, Member, member, stats_status)
 
+    def update_pools_stats(self, context, pools_stats):
+        """Update the stats of several pools in a single transaction.
+
+        pools_stats maps pool ids to the stats structures accepted by
+        update_pool_stats.  Pools which are gone or pending deletion are
+        skipped rather than failing the whole update.
+        """
+        if not pools_stats:
+            return
+        with context.session.begin(subtransactions=True):
+            pools = self._model_query(context, Pool).filter(
+                Pool.id.in_(pools_stats.keys())).options(
+                    orm.joinedload('stats'))
+            members_status = {}
+            for pool_db in pools:
+                if pool_db.status == constants.PENDING_DELETE:
+                    continue
+                data = pools_stats[pool_db.id] or {}
+                pool_db.stats = self._create_pool_stats(context, pool_db.id,
+                                                        data)
+                for member, stats in data.get('members', {}).items():
+                    stats_status = stats.get(lb_const.STATS_STATUS)
+                    if stats_status:
+                        members_status[member] = stats_status
+
+            if not members_status:
+                return
+            members = self._model_query(context, Member).filter(
+                Member.id.in_(members_status.keys()))
+            for member_db in members:
+                status = members_status[member_db.id]
+                if member_db.status != status:
+                    member_db.status = status
+                if member_db.status_description:
+                    member_db.status_description = None
+
     def _create_pool_stats(self, context, pool_id, data=None):
         # This is internal method to add pool statistics. It won't
         # be exposed to API
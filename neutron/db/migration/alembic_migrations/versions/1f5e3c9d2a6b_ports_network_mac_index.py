@@ -0,0 +1,38 @@
+# Copyright 2014 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""Index ports by network and MAC address
+
+Revision ID: 1f5e3c9d2a6b
+Revises: 3d8e1a2b7c4f
+Create Date: 2014-10-06 14:27:09.318842
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '1f5e3c9d2a6b'
+down_revision = '3d8e1a2b7c4f'
+
+
+from alembic import op
+
+
+def upgrade(active_plugins=None, options=None):
+    op.create_index('ix_ports_network_id_mac_address', 'ports',
+                    ['network_id', 'mac_address'])
+
+
+def downgrade(active_plugins=None, options=None):
+    op.drop_index('ix_ports_network_id_mac_address', 'ports')
@@ -0,0 +1,44 @@
+# Copyright 2014 OpenStack Foundation
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""Add revision numbers to core resources
+
+Revision ID: 3d8e1a2b7c4f
+Revises: 86d6d9776e2b
+Create Date: 2014-10-02 10:12:41.523106
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '3d8e1a2b7c4f'
+down_revision = '86d6d9776e2b'
+
+
+from alembic import op
+import sqlalchemy as sa
+
+
+TABLES = ['networks', 'subnets', 'ports', 'routers']
+
+
+def upgrade(active_plugins=None, options=None):
+    for table in TABLES:
+        op.add_column(table, sa.Column('revision_number', sa.BigInteger(),
+                                       nullable=False, server_default='0'))
+
+
+def downgrade(active_plugins=None, options=None):
+    for table in TABLES:
+        op.drop_column(table, 'revision_number')
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import itertools
+
 import sqlalchemy as sa
 from sqlalchemy import orm
 
@@ -43,6 +45,111 @@ class HasStatusDescription(object):
     status_description = sa.Column(sa.String(255))
 
 
+class HasRevision(object):
+    """Revision number mixin, bumped whenever the resource changes."""
+
+    revision_number = sa.Column(sa.BigInteger, nullable=False, default=0,
+                                server_default='0')
+
+    def bump_revision(self):
+        # The increment is done by the database, so that concurrent updates
+        # of the resource cannot end up with the same revision number.
+        self.revision_number = type(self).revision_number + 1
+
+
+# Foreign keys to revisioned resources from rows that are not part of the
+# API representation of the referenced resource.  Following them would
+# only serialize writes on busy resources, e.g. every IP allocation on its
+# network and subnet.
+_NON_REVISING_FOREIGN_KEYS = frozenset([
+    ('ports', 'network_id'),
+    ('ipallocations', 'network_id'),
+    ('ipallocations', 'subnet_id'),
+    ('routers', 'gw_port_id'),
+    ('floatingips', 'floating_port_id'),
+    ('floatingips', 'fixed_port_id'),
+    ('floatingips', 'router_id'),
+])
+
+_revision_parents = {}
+
+
+def _get_revision_parents(model):
+    """Return the (attribute, model) pairs of the parents of a model.
+
+    A parent is a revisioned resource referenced by a foreign key of the
+    model, whose rows are part of the representation of the parent, like
+    the subnets of a network or the bindings of a port.
+    """
+    if model not in _revision_parents:
+        revisioned = dict((cls.__table__.name, cls)
+                          for cls in HasRevision.__subclasses__()
+                          if hasattr(cls, '__table__'))
+        parents = []
+        if hasattr(model, '__table__'):
+            for prop in orm.class_mapper(model).column_attrs:
+                column = prop.columns[0]
+                if ((column.table.name, column.name) in
+                        _NON_REVISING_FOREIGN_KEYS):
+                    continue
+                for fk in column.foreign_keys:
+                    parent = revisioned.get(fk.column.table.name)
+                    if parent is not None and fk.column.name == 'id':
+                        parents.append((prop.key, parent))
+        _revision_parents[model] = parents
+    return _revision_parents[model]
+
+
+@sa.event.listens_for(orm.Session, 'before_flush')
+def _bump_revisions(session, flush_context, instances):
+    """Bump the revision of resources which are about to change.
+
+    This covers resources whose row is updated and resources whose child
+    rows are created, updated or deleted.  Resources whose revision was
+    already bumped explicitly in this flush are left alone.
+    """
+    for obj in session.dirty:
+        if (isinstance(obj, HasRevision) and session.is_modified(obj) and
+                not orm.attributes.get_history(
+                    obj, 'revision_number').has_changes()):
+            obj.bump_revision()
+
+    parents = {}
+    changed = itertools.chain(
+        session.new, session.deleted,
+        (obj for obj in session.dirty
+         if _get_revision_parents(type(obj)) and session.is_modified(obj)))
+    for obj in changed:
+        for attr, parent_model in _get_revision_parents(type(obj)):
+            parent_id = getattr(obj, attr)
+            if parent_id:
+                parents.setdefault(parent_model, set()).add(parent_id)
+    for parent_model, parent_ids in parents.items():
+        mapper = orm.class_mapper(parent_model)
+        loaded_parents = []
+        for parent_id in list(parent_ids):
+            parent = session.identity_map.get(
+                mapper.identity_key_from_primary_key([parent_id]))
+            if parent is None:
+                continue
+            if (parent in session.new or parent in session.deleted or
+                    sa.inspect(parent).attrs.revision_number.history.
+                    has_changes()):
+                parent_ids.discard(parent_id)
+            else:
+                loaded_parents.append(parent)
+        if parent_ids:
+            # NOTE: the parents are not loaded here, as their relationships
+            # would be loaded before the changes of their children are
+            # flushed and would then be stale for the rest of the session.
+            session.execute(
+                parent_model.__table__.update().
+                where(parent_model.id.in_(parent_ids)).
+                values(revision_number=parent_model.revision_number + 1))
+            for parent in loaded_parents:
+                session.expire(parent, ['revision_number'])
+
+
 class IPAvailabilityRange(model_base.BASEV2):
     """Internal representation of available IPs for Neutron subnets.
 
@@ -116,7 +223,7 @@ class SubnetRoute(model_base.BASEV2, Route):
                           primary_key=True)
 
 
-class Port(model_base.BASEV2, HasId, HasTenant):
+class Port(model_base.BASEV2, HasId, HasTenant, HasRevision):
     """Represents a port on a Neutron v2 network."""
 
     name = sa.Column(sa.String(255))
@@ -128,6 +235,11 @@ class Port(model_base.BASEV2, HasId, HasTenant):
     status = sa.Column(sa.String(16), nullable=False)
     device_id = sa.Column(sa.String(255), nullable=False)
     device_owner = sa.Column(sa.String(255), nullable=False)
+    __table_args__ = (
+        sa.Index('ix_ports_network_id_mac_address',
+                 'network_id', 'mac_address'),
+        model_base.BASEV2.__table_args__
+    )
 
     def __init__(self, id=None, tenant_id=None, name=None, network_id=None,
                  mac_address=None, admin_state_up=None, status=None,
@@ -158,7 +270,7 @@ class DNSNameServer(model_base.BASEV2):
                           primary_key=True)
 
 
-class Subnet(model_base.BASEV2, HasId, HasTenant):
+class Subnet(model_base.BASEV2, HasId, HasTenant, HasRevision):
     """Represents a neutron subnet.
 
     When a subnet is created the first and last entries will be created. These
@@ -192,7 +304,7 @@ class Subnet(model_base.BASEV2, HasId, HasTenant):
                                   name='ipv6_address_modes'), nullable=True)
 
 
-class Network(model_base.BASEV2, HasId, HasTenant):
+class Network(model_base.BASEV2, HasId, HasTenant, HasRevision):
     """Represents a v2 neutron network."""
 
     name = sa.Column(sa.String(255))
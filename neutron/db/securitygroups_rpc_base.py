@@ -149,6 +149,30 @@ class SecurityGroupServerRpcMixin(sg_db.SecurityGroupDbMixin):
             self.notifier.security_groups_member_updated(
                 context, port.get(ext_sg.SECURITYGROUPS))
 
+    def notify_security_groups_member_updated_bulk(self, context, ports):
+        """Notify update event of security group members for many ports.
+
+        Sends at most one provider update and one member update for the
+        union of the security groups of the ports, rather than a
+        notification per port.
+        """
+        provider_updated = False
+        security_groups = set()
+        for port in ports:
+            if port['device_owner'] == q_const.DEVICE_OWNER_DHCP:
+                provider_updated = True
+            elif port['device_owner'] == q_const.DEVICE_OWNER_ROUTER_INTF:
+                if any(netaddr.IPAddress(fixed_ip['ip_address']).version == 6
+                       for fixed_ip in port['fixed_ips']):
+                    provider_updated = True
+            else:
+                security_groups.update(port.get(ext_sg.SECURITYGROUPS) or [])
+        if provider_updated:
+            self.notifier.security_groups_provider_updated(context)
+        if security_groups:
+            self.notifier.security_groups_member_updated(
+                context, sorted(security_groups))
+
     def security_group_info_for_ports(self, context, ports):
         sg_info = {'devices': ports,
                    'security_groups': {},
@@ -24,6 +24,25 @@ from neutron.openstack.common import log as logging
 LOG = logging.getLogger(__name__)
 
 
+def _sorted_after(model_attr, value, ascending, nulls_first):
+    """Return the criterion for the values sorted after value.
+
+    NULL values cannot be compared, they sort before all other values when
+    nulls_first is set and after them otherwise.
+    """
+    if value is None:
+        if ascending == nulls_first:
+            return model_attr.isnot(None)
+        return sqlalchemy.sql.false()
+    if ascending:
+        criterion = model_attr > value
+    else:
+        criterion = model_attr < value
+    if ascending != nulls_first:
+        criterion = sqlalchemy.sql.or_(criterion, model_attr.is_(None))
+    return criterion
+
+
 def paginate_query(query, model, limit, sorts, marker_obj=None):
     """Returns a query with sorting / pagination criteria added.
 
@@ -84,21 +103,34 @@ def paginate_query(query, model, limit, sorts, marker_obj=None):
     if marker_obj:
         marker_values = [getattr(marker_obj, sort[0]) for sort in sorts]
 
+        # NULL values sort first in ascending order in MySQL and SQLite,
+        # and last in PostgreSQL
+        nulls_first = query.session.bind.dialect.name != 'postgresql'
+
         # Build up an array of sort criteria as in the docstring
         criteria_list = []
         for i, sort in enumerate(sorts):
             crit_attrs = [(getattr(model, sorts[j][0]) == marker_values[j])
                           for j in moves.xrange(i)]
             model_attr = getattr(model, sort[0])
-            if sort[1]:
-                crit_attrs.append((model_attr > marker_values[i]))
-            else:
-                crit_attrs.append((model_attr < marker_values[i]))
+            crit_attrs.append(_sorted_after(model_attr, marker_values[i],
+                                            sort[1], nulls_first))
 
             criteria = sqlalchemy.sql.and_(*crit_attrs)
             criteria_list.append(criteria)
 
         f = sqlalchemy.sql.or_(*criteria_list)
+        # The range condition on the first sort key is implied by the
+        # criteria above, but unlike the disjunction it lets the database
+        # use an index on that key to seek to the marker position.  It is
+        # left out when the rows following the marker may have no value for
+        # that key, as comparisons with NULL never hold.
+        first_attr = getattr(model, sorts[0][0])
+        if marker_values[0] is not None and sorts[0][1] == nulls_first:
+            if sorts[0][1]:
+                f = sqlalchemy.sql.and_(first_attr >= marker_values[0], f)
+            else:
+                f = sqlalchemy.sql.and_(first_attr <= marker_values[0], f)
         query = query.filter(f)
 
     if limit:
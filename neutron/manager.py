@@ -18,6 +18,7 @@ import weakref
 from oslo.config import cfg
 
 from neutron.common import rpc as n_rpc
+from neutron.common import startup_timing
 from neutron.common import utils
 from neutron.openstack.common import importutils
 from neutron.openstack.common import log as logging
@@ -196,7 +197,8 @@ class NeutronManager(object):
     @utils.synchronized("manager")
     def _create_instance(cls):
         if not cls.has_instance():
-            cls._instance = cls()
+            with startup_timing.timed('plugins'):
+                cls._instance = cls()
 
     @classmethod
     def has_instance(cls):
@@ -31,6 +31,7 @@ from oslo.config import cfg
 
 from neutron.agent import l2population_rpc as l2pop_rpc
 from neutron.agent.linux import ip_lib
+from neutron.agent.linux import polling
 from neutron.agent.linux import utils
 from neutron.agent import rpc as agent_rpc
 from neutron.agent import securitygroups_rpc as sg_rpc
@@ -762,9 +763,16 @@ class LinuxBridgePluginApi(agent_rpc.PluginApi,
 class LinuxBridgeNeutronAgentRPC(sg_rpc.SecurityGroupAgentRpcMixin):
 
     def __init__(self, interface_mappings, polling_interval,
-                 root_helper):
+                 root_helper, use_device_monitor=False,
+                 device_monitor_respawn_interval=(
+                     lconst.DEFAULT_DEVICE_MONITOR_RESPAWN),
+                 device_resync_interval=(
+                     lconst.DEFAULT_DEVICE_RESYNC_INTERVAL)):
         self.polling_interval = polling_interval
         self.root_helper = root_helper
+        self.use_device_monitor = use_device_monitor
+        self.device_monitor_respawn_interval = device_monitor_respawn_interval
+        self.device_resync_interval = device_resync_interval
         self.setup_linux_bridge(interface_mappings)
         configurations = {'interface_mappings': interface_mappings}
         if self.br_mgr.vxlan_mode != lconst.VXLAN_NONE:
@@ -981,39 +989,61 @@ class LinuxBridgeNeutronAgentRPC(sg_rpc.SecurityGroupAgentRpcMixin):
                 or device_info.get('updated')
                 or device_info.get('removed'))
 
-    def daemon_loop(self):
-        LOG.info(_("LinuxBridge Agent RPC Daemon Started!"))
+    def _agent_has_updates(self, polling_manager):
+        return (polling_manager.is_polling_required or
+                self.updated_devices)
+
+    def device_loop(self, polling_manager=None):
+        if not polling_manager:
+            polling_manager = polling.AlwaysPoll()
+
         device_info = None
         sync = True
 
         while True:
             start = time.time()
 
-            device_info = self.scan_devices(previous=device_info, sync=sync)
+            if sync or self._agent_has_updates(polling_manager):
+                device_info = self.scan_devices(previous=device_info,
+                                                sync=sync)
 
-            if sync:
-                LOG.info(_("Agent out of sync with plugin!"))
-                sync = False
+                if sync:
+                    LOG.info(_("Agent out of sync with plugin!"))
+                    sync = False
 
-            if self._device_info_has_changes(device_info):
-                LOG.debug(_("Agent loop found changes! %s"), device_info)
-                try:
-                    sync = self.process_network_devices(device_info)
-                except Exception:
-                    LOG.exception(_("Error in agent loop. Devices info: %s"),
-                                  device_info)
-                    sync = True
+                if self._device_info_has_changes(device_info):
+                    LOG.debug(_("Agent loop found changes! %s"), device_info)
+                    try:
+                        sync = self.process_network_devices(device_info)
+                    except Exception:
+                        LOG.exception(_("Error in agent loop. Devices info: "
+                                        "%s"), device_info)
+                        sync = True
 
-            # sleep till end of polling interval
+                if not sync:
+                    polling_manager.polling_completed()
+
+            # wait till end of polling interval, or until the polling
+            # manager detects device changes
             elapsed = (time.time() - start)
             if (elapsed < self.polling_interval):
-                time.sleep(self.polling_interval - elapsed)
+                polling_manager.wait_for_updates(
+                    self.polling_interval - elapsed)
             else:
                 LOG.debug(_("Loop iteration exceeded interval "
                             "(%(polling_interval)s vs. %(elapsed)s)!"),
                           {'polling_interval': self.polling_interval,
                            'elapsed': elapsed})
 
+    def daemon_loop(self):
+        LOG.info(_("LinuxBridge Agent RPC Daemon Started!"))
+        with polling.get_device_polling_manager(
+                TAP_INTERFACE_PREFIX,
+                minimize_polling=self.use_device_monitor,
+                respawn_interval=self.device_monitor_respawn_interval,
+                resync_interval=self.device_resync_interval) as pm:
+            self.device_loop(polling_manager=pm)
+
 
 def main():
     common_config.init(sys.argv[1:])
@@ -1030,9 +1060,14 @@ def main():
 
     polling_interval = cfg.CONF.AGENT.polling_interval
     root_helper = cfg.CONF.AGENT.root_helper
-    agent = LinuxBridgeNeutronAgentRPC(interface_mappings,
-                                       polling_interval,
-                                       root_helper)
+    agent = LinuxBridgeNeutronAgentRPC(
+        interface_mappings,
+        polling_interval,
+        root_helper,
+        use_device_monitor=cfg.CONF.AGENT.use_device_monitor,
+        device_monitor_respawn_interval=(
+            cfg.CONF.AGENT.device_monitor_respawn_interval),
+        device_resync_interval=cfg.CONF.AGENT.device_resync_interval)
     LOG.info(_("Agent initialized successfully, now running... "))
     agent.daemon_loop()
     sys.exit(0)
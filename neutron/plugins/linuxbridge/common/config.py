@@ -18,6 +18,7 @@
 from oslo.config import cfg
 
 from neutron.agent.common import config
+from neutron.plugins.linuxbridge.common import constants
 
 DEFAULT_VLAN_RANGES = []
 DEFAULT_INTERFACE_MAPPINGS = []
@@ -63,6 +64,19 @@ agent_opts = [
     cfg.IntOpt('polling_interval', default=2,
                help=_("The number of seconds the agent will wait between "
                       "polling for local device changes.")),
+    cfg.BoolOpt('use_device_monitor', default=False,
+                help=_("Minimize polling by monitoring rtnetlink link events "
+                       "for tap device changes.")),
+    cfg.IntOpt('device_monitor_respawn_interval',
+               default=constants.DEFAULT_DEVICE_MONITOR_RESPAWN,
+               help=_("The number of seconds to wait before respawning the "
+                      "tap device monitor after losing communication with "
+                      "it.")),
+    cfg.IntOpt('device_resync_interval',
+               default=constants.DEFAULT_DEVICE_RESYNC_INTERVAL,
+               help=_("When the tap device monitor is used, the maximum "
+                      "number of seconds between full scans of local "
+                      "devices. 0 disables periodic scans.")),
     cfg.BoolOpt('rpc_support_old_agents', default=False,
                 help=_("Enable server RPC compatibility with old agents")),
 ]
@@ -26,6 +26,11 @@ VXLAN_NONE = 'not_supported'
 VXLAN_MCAST = 'multicast_flooding'
 VXLAN_UCAST = 'unicast_flooding'
 
+# Seconds to wait before respawning the tap device monitor
+DEFAULT_DEVICE_MONITOR_RESPAWN = 30
+# Seconds between full tap device rescans when polling is minimized
+DEFAULT_DEVICE_RESYNC_INTERVAL = 60
+
 
 # TODO(rkukura): Eventually remove this function, which provides
 # temporary backward compatibility with pre-Havana RPC and DB vlan_id
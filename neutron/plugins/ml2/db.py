@@ -30,6 +30,10 @@ from neutron.plugins.ml2 import models
 
 LOG = log.getLogger(__name__)
 
+# Maximum number of network ids passed in a single IN clause, which keeps
+# bulk segment lookups within the bound parameter limits of the backends.
+MAX_NETWORK_IDS_PER_QUERY = 500
+
 
 def _make_segment_dict(record):
     """Make a segment dictionary out of a DB record."""
@@ -69,6 +73,23 @@ def get_network_segments(session, network_id, filter_dynamic=False):
         return [_make_segment_dict(record) for record in records]
 
 
+def get_networks_segments(session, network_ids, filter_dynamic=False):
+    """Return a dict mapping each of network_ids to its segment list."""
+    result = dict((network_id, []) for network_id in network_ids)
+    network_ids = list(result)
+    with session.begin(subtransactions=True):
+        for i in range(0, len(network_ids), MAX_NETWORK_IDS_PER_QUERY):
+            chunk = network_ids[i:i + MAX_NETWORK_IDS_PER_QUERY]
+            query = (session.query(models.NetworkSegment).
+                     filter(models.NetworkSegment.network_id.in_(chunk)))
+            if filter_dynamic is not None:
+                query = query.filter_by(is_dynamic=filter_dynamic)
+            for record in query:
+                result[record.network_id].append(_make_segment_dict(record))
+
+    return result
+
+
 def get_segment_by_id(session, segment_id):
     with session.begin(subtransactions=True):
         try:
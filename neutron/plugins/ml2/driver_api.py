@@ -590,6 +590,34 @@ class MechanismDriver(object):
         """
         pass
 
+    def create_port_bulk_precommit(self, contexts):
+        """Allocate resources for a batch of new ports.
+
+        :param contexts: list of PortContext instances, one per port.
+
+        Called inside the transaction context of the whole batch
+        instead of create_port_precommit. The default implementation
+        calls create_port_precommit for each port; drivers that can
+        process the batch at once override it. Raising an exception
+        will result in a rollback of the whole batch.
+        """
+        for context in contexts:
+            self.create_port_precommit(context)
+
+    def create_port_bulk_postcommit(self, contexts):
+        """Create a batch of ports.
+
+        :param contexts: list of PortContext instances, one per port.
+
+        Called after the transaction of the whole batch completes,
+        instead of create_port_postcommit. The default implementation
+        calls create_port_postcommit for each port; drivers that can
+        send the batch to their backend at once override it. Raising an
+        exception will result in the deletion of the ports of the batch.
+        """
+        for context in contexts:
+            self.create_port_postcommit(context)
+
     def update_port_precommit(self, context):
         """Update resources of a port.
 
@@ -804,6 +832,21 @@ class ExtensionDriver(object):
         """
         pass
 
+    def extend_network_dicts(self, session, results):
+        """Add extended attributes to a list of network dictionaries.
+
+        :param session: database session
+        :param results: list of network dictionaries to extend
+
+        Called inside transaction context on session when listing
+        networks. The default implementation calls extend_network_dict
+        for each network; drivers storing their attributes in the
+        database should override it to fetch them for all networks
+        at once.
+        """
+        for result in results:
+            self.extend_network_dict(session, result)
+
     def extend_subnet_dict(self, session, result):
         """Add extended attributes to subnet dictionary.
 
@@ -114,6 +114,15 @@ class GreTypeDriver(type_tunnel.TunnelTypeDriver):
             return [{'ip_address': gre_endpoint.ip_address}
                     for gre_endpoint in gre_endpoints]
 
+    def get_endpoints_version(self):
+        """Return the number of gre endpoints.
+
+        Endpoints are only ever added, so the count identifies the
+        current endpoint list.
+        """
+        session = db_api.get_session()
+        return session.query(GreEndpoints).count()
+
     def add_endpoint(self, ip):
         LOG.debug("add_gre_endpoint() called for ip %s", ip)
         session = db_api.get_session()
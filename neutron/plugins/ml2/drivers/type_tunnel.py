@@ -36,6 +36,8 @@ class TunnelTypeDriver(helpers.TypeDriverHelper):
     def __init__(self, model):
         super(TunnelTypeDriver, self).__init__(model)
         self.segmentation_key = iter(self.primary_keys).next()
+        self._endpoints_version = None
+        self._endpoints = None
 
     @abc.abstractmethod
     def sync_allocations(self):
@@ -57,6 +59,25 @@ class TunnelTypeDriver(helpers.TypeDriverHelper):
         """
         pass
 
+    def get_endpoints_version(self):
+        """Return a value which changes whenever the endpoint list changes.
+
+        Drivers unable to compute such a value cheaply return None, which
+        disables endpoint caching.
+        """
+        return None
+
+    def get_cached_endpoints(self):
+        """Get every endpoint, re-reading them only when they changed.
+
+        :returns endpoints formatted as in get_endpoints
+        """
+        version = self.get_endpoints_version()
+        if version is None or version != self._endpoints_version:
+            self._endpoints = self.get_endpoints()
+            self._endpoints_version = version
+        return self._endpoints
+
     def _initialize(self, raw_tunnel_ranges):
         self.tunnel_ranges = []
         self._parse_tunnel_ranges(raw_tunnel_ranges,
@@ -158,7 +179,7 @@ class TunnelRpcCallbackMixin(object):
         """Update new tunnel.
 
         Updates the database with the tunnel IP. All listening agents will also
-        be notified about the new tunnel IP.
+        be notified about the new tunnel IP, unless it was already known.
         """
         tunnel_ip = kwargs.get('tunnel_ip')
         tunnel_type = kwargs.get('tunnel_type')
@@ -167,8 +188,14 @@ class TunnelRpcCallbackMixin(object):
             raise exc.InvalidInput(error_message=msg)
         driver = self._type_manager.drivers.get(tunnel_type)
         if driver:
+            tunnels = driver.obj.get_cached_endpoints()
+            if any(tunnel['ip_address'] == tunnel_ip for tunnel in tunnels):
+                # The endpoint is already known, so other agents were
+                # notified when it was added and only this one needs
+                # the list of tunnels.
+                return {'tunnels': tunnels}
             tunnel = driver.obj.add_endpoint(tunnel_ip)
-            tunnels = driver.obj.get_endpoints()
+            tunnels = driver.obj.get_cached_endpoints()
             entry = {'tunnels': tunnels}
             # Notify all other listening agents
             self._notifier.tunnel_update(rpc_context, tunnel.ip_address,
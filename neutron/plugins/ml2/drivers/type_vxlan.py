@@ -133,6 +133,15 @@ class VxlanTypeDriver(type_tunnel.TunnelTypeDriver):
                      'udp_port': vxlan_endpoint.udp_port}
                     for vxlan_endpoint in vxlan_endpoints]
 
+    def get_endpoints_version(self):
+        """Return the number of vxlan endpoints.
+
+        Endpoints are only ever added, so the count identifies the
+        current endpoint list.
+        """
+        session = db_api.get_session()
+        return session.query(VxlanEndpoints).count()
+
     def add_endpoint(self, ip, udp_port=VXLAN_UDP_PORT):
         LOG.debug(_("add_vxlan_endpoint() called for ip %s"), ip)
         session = db_api.get_session()
@@ -120,9 +120,11 @@ class TypeManager(stevedore.named.NamedExtensionManager):
             value = None
         return value
 
-    def _extend_network_dict_provider(self, context, network):
+    def _extend_network_dict_provider(self, context, network,
+                                      segments=None):
         id = network['id']
-        segments = db.get_network_segments(context.session, id)
+        if segments is None:
+            segments = db.get_network_segments(context.session, id)
         if not segments:
             LOG.error(_("Network %s has no segments"), id)
             network[provider.NETWORK_TYPE] = None
@@ -140,6 +142,20 @@ class TypeManager(stevedore.named.NamedExtensionManager):
             network[provider.PHYSICAL_NETWORK] = segment[api.PHYSICAL_NETWORK]
             network[provider.SEGMENTATION_ID] = segment[api.SEGMENTATION_ID]
 
+    def _extend_networks_dict_provider(self, context, networks):
+        """Add provider attributes to a list of networks.
+
+        The segments of all the networks are fetched with bulk queries
+        rather than one query per network.
+        """
+        if not networks:
+            return
+        segments = db.get_networks_segments(
+            context.session, [network['id'] for network in networks])
+        for network in networks:
+            self._extend_network_dict_provider(context, network,
+                                               segments[network['id']])
+
     def initialize(self):
         for network_type, driver in self.drivers.iteritems():
             LOG.info(_("Initializing driver for type '%s'"), network_type)
@@ -499,6 +515,32 @@ class MechanismManager(stevedore.named.NamedExtensionManager):
         """
         self._call_on_drivers("create_port_postcommit", context)
 
+    def create_port_bulk_precommit(self, contexts):
+        """Notify all mechanism drivers during bulk port creation.
+
+        :param contexts: list of PortContext instances, one per port
+        :raises: neutron.plugins.ml2.common.MechanismDriverError
+        if any mechanism driver create_port_bulk_precommit call fails.
+
+        Called within the database transaction of the whole batch. If a
+        mechanism driver raises an exception, then a MechanismDriverError
+        is propogated to the caller, triggering a rollback of the batch.
+        """
+        self._call_on_drivers("create_port_bulk_precommit", contexts)
+
+    def create_port_bulk_postcommit(self, contexts):
+        """Notify all mechanism drivers of bulk port creation.
+
+        :param contexts: list of PortContext instances, one per port
+        :raises: neutron.plugins.ml2.common.MechanismDriverError
+        if any mechanism driver create_port_bulk_postcommit call fails.
+
+        Called after the database transaction. Errors raised by
+        mechanism drivers are left to propagate to the caller, where
+        the ports of the batch will be deleted.
+        """
+        self._call_on_drivers("create_port_bulk_postcommit", contexts)
+
     def update_port_precommit(self, context):
         """Notify all mechanism drivers during port update.
 
@@ -691,6 +733,15 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
             LOG.info(_("Extended network dict for driver '%(drv)s'"),
                      {'drv': driver.name})
 
+    def extend_network_dicts(self, session, results):
+        """Notify all extension drivers to extend network dictionaries."""
+        if not results:
+            return
+        for driver in self.ordered_ext_drivers:
+            driver.obj.extend_network_dicts(session, results)
+            LOG.debug("Extended %(count)d network dicts for driver "
+                      "'%(drv)s'", {'count': len(results), 'drv': driver.name})
+
     def extend_subnet_dict(self, session, result):
         """Notify all extension drivers to extend subnet dictionary."""
         for driver in self.ordered_ext_drivers:
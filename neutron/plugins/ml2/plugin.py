@@ -155,6 +155,13 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
                                   fanout=False)
         return self.conn.consume_in_threads()
 
+    def start_rpc_state_reports_listener(self):
+        self.conn_reports = n_rpc.create_connection(new=True)
+        self.conn_reports.create_consumer(topics.REPORTS,
+                                          [agents_db.AgentExtRpcCallback()],
+                                          fanout=False)
+        return self.conn_reports.consume_in_threads()
+
     def _filter_nets_provider(self, context, nets, filters):
         # TODO(rkukura): Implement filtering.
         return nets
@@ -415,21 +422,15 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
     db_base_plugin_v2.NeutronDbPluginV2.register_dict_extend_funcs(
         attributes.PORTS, ['_ml2_extend_port_dict_binding'])
 
-    # Register extend dict methods for network and port resources.
+    # Register extend dict methods for port and subnet resources.
     # Each mechanism driver that supports extend attribute for the resources
-    # can add those attribute to the result.
-    db_base_plugin_v2.NeutronDbPluginV2.register_dict_extend_funcs(
-               attributes.NETWORKS, ['_ml2_md_extend_network_dict'])
+    # can add those attribute to the result. Networks are extended by
+    # get_network and get_networks so that a listing is extended in bulk.
     db_base_plugin_v2.NeutronDbPluginV2.register_dict_extend_funcs(
                attributes.PORTS, ['_ml2_md_extend_port_dict'])
     db_base_plugin_v2.NeutronDbPluginV2.register_dict_extend_funcs(
                attributes.SUBNETS, ['_ml2_md_extend_subnet_dict'])
 
-    def _ml2_md_extend_network_dict(self, result, netdb):
-        session = db_api.get_session()
-        with session.begin(subtransactions=True):
-            self.extension_manager.extend_network_dict(session, result)
-
     def _ml2_md_extend_port_dict(self, result, portdb):
         session = db_api.get_session()
         with session.begin(subtransactions=True):
@@ -515,11 +516,15 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
         session = context.session
         with session.begin(subtransactions=True):
             original_network = super(Ml2Plugin, self).get_network(context, id)
+            self.extension_manager.extend_network_dict(session,
+                                                       original_network)
             updated_network = super(Ml2Plugin, self).update_network(context,
                                                                     id,
                                                                     network)
             self.extension_manager.process_update_network(session, network,
                                                           original_network)
+            self.extension_manager.extend_network_dict(session,
+                                                       updated_network)
             self._process_l3_update(context, updated_network,
                                     network['network'])
             self.type_manager._extend_network_dict_provider(context,
@@ -541,6 +546,7 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
         with session.begin(subtransactions=True):
             result = super(Ml2Plugin, self).get_network(context, id, None)
             self.type_manager._extend_network_dict_provider(context, result)
+            self.extension_manager.extend_network_dict(session, result)
 
         return self._fields(result, fields)
 
@@ -551,8 +557,8 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
             nets = super(Ml2Plugin,
                          self).get_networks(context, filters, None, sorts,
                                             limit, marker, page_reverse)
-            for net in nets:
-                self.type_manager._extend_network_dict_provider(context, net)
+            self.type_manager._extend_networks_dict_provider(context, nets)
+            self.extension_manager.extend_network_dicts(session, nets)
 
             nets = self._filter_nets_provider(context, nets, filters)
             nets = self._filter_nets_l3(context, nets, filters)
@@ -762,7 +768,12 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
             # the fact that an error occurred.
             LOG.error(_("mechanism_manager.delete_subnet_postcommit failed"))
 
-    def create_port(self, context, port):
+    def _create_port_db(self, context, port, networks=None, checked=False):
+        """Create the port and its ML2 state, returning its PortContext.
+
+        networks caches the network dicts by network ID across the ports
+        of a bulk request.
+        """
         attrs = port['port']
         attrs['status'] = const.PORT_STATUS_DOWN
 
@@ -771,10 +782,15 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
             self._ensure_default_security_group_on_port(context, port)
             sgids = self._get_security_groups_on_port(context, port)
             dhcp_opts = port['port'].get(edo_ext.EXTRADHCPOPTS, [])
-            result = super(Ml2Plugin, self).create_port(context, port)
+            result = self.create_port_db(context, port, checked=checked)
             self.extension_manager.process_create_port(session, attrs, result)
             self._process_port_create_security_group(context, result, sgids)
-            network = self.get_network(context, result['network_id'])
+            if networks is None:
+                networks = {}
+            network = networks.get(result['network_id'])
+            if network is None:
+                network = self.get_network(context, result['network_id'])
+                networks[result['network_id']] = network
             binding = db.add_port_binding(session, result['id'])
             mech_context = driver_context.PortContext(self, context, result,
                                                       network, binding)
@@ -786,6 +802,60 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
                     attrs.get(addr_pair.ADDRESS_PAIRS)))
             self._process_port_create_extra_dhcp_opts(context, result,
                                                       dhcp_opts)
+        return mech_context
+
+    def create_port_bulk(self, context, ports):
+        """Create a batch of ports in a single transaction.
+
+        Networks and MAC addresses are checked for the whole batch at
+        once, and mechanism drivers get the batch in one call each of
+        create_port_bulk_precommit and create_port_bulk_postcommit.
+        """
+        items = ports['ports']
+        session = context.session
+        networks = {}
+        with session.begin(subtransactions=True):
+            self._check_ports_for_create(context, items)
+            mech_contexts = [self._create_port_db(context, item, networks,
+                                                  checked=True)
+                             for item in items]
+            self.mechanism_manager.create_port_bulk_precommit(mech_contexts)
+
+        try:
+            self.mechanism_manager.create_port_bulk_postcommit(mech_contexts)
+        except ml2_exc.MechanismDriverError:
+            with excutils.save_and_reraise_exception():
+                LOG.error(_("mechanism_manager.create_port_bulk_postcommit "
+                            "failed, deleting ports"))
+                self._delete_ports_quietly(context, mech_contexts)
+
+        results = [mech_context.current for mech_context in mech_contexts]
+        self.notify_security_groups_member_updated_bulk(context, results)
+
+        bound_ports = []
+        try:
+            for mech_context in mech_contexts:
+                bound_context = self._bind_port_if_needed(mech_context)
+                bound_ports.append(bound_context._port)
+        except ml2_exc.MechanismDriverError:
+            with excutils.save_and_reraise_exception():
+                LOG.error(_("_bind_port_if_needed failed, deleting ports"))
+                self._delete_ports_quietly(context, mech_contexts)
+        return bound_ports
+
+    def _delete_ports_quietly(self, context, mech_contexts):
+        for mech_context in mech_contexts:
+            port_id = mech_context.current['id']
+            try:
+                self.delete_port(context, port_id)
+            except Exception:
+                LOG.exception(_("Failed to delete port %s"), port_id)
+
+    def create_port(self, context, port):
+        session = context.session
+        with session.begin(subtransactions=True):
+            mech_context = self._create_port_db(context, port)
+            result = mech_context.current
             self.mechanism_manager.create_port_precommit(mech_context)
 
         try:
@@ -27,6 +27,7 @@ from neutron.plugins.openvswitch.agent import ovs_dvr_neutron_agent
 from oslo.config import cfg
 from six import moves
 
+from neutron.agent.common import loop_stats
 from neutron.agent import l2population_rpc
 from neutron.agent.linux import ip_lib
 from neutron.agent.linux import ovs_lib
@@ -247,6 +248,11 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
                                               root_helper)
         # Initialize iteration counter
         self.iter_num = 0
+        self.loop_stats = loop_stats.LoopStatsCollector(
+            'ovs-agent-rpc-loop',
+            stats_file=cfg.CONF.AGENT.loop_stats_file,
+            profile_slowest=cfg.CONF.AGENT.loop_profile_slowest,
+            profile_dir=cfg.CONF.AGENT.loop_profile_dir)
         self.run_daemon_loop = True
 
     def _report_state(self):
@@ -1019,6 +1025,33 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
                                     tunnel_type,
                                     self.vxlan_udp_port,
                                     self.dont_fragment)
+        if not self._register_tunnel_port(br, remote_ip, tunnel_type, ofport):
+            return 0
+        self._update_tunnel_flooding(br, tunnel_type)
+        return ofport
+
+    def _setup_tunnel_ports(self, br, tunnels, tunnel_type):
+        """Set up several tunnel ports at once.
+
+        The ports are created in a single ovsdb transaction and flooding
+        flows are only rewritten once for all of them.
+
+        :param tunnels: a list of (port_name, remote_ip) tuples.
+        """
+        if not tunnels:
+            return
+        ofports = br.add_tunnel_ports(tunnels,
+                                      self.local_ip,
+                                      tunnel_type,
+                                      self.vxlan_udp_port,
+                                      self.dont_fragment)
+        with br.deferred() as deferred_br:
+            for port_name, remote_ip in tunnels:
+                self._register_tunnel_port(deferred_br, remote_ip,
+                                           tunnel_type, ofports.get(port_name))
+            self._update_tunnel_flooding(deferred_br, tunnel_type)
+
+    def _register_tunnel_port(self, br, remote_ip, tunnel_type, ofport):
         ofport_int = -1
         try:
             ofport_int = int(ofport)
@@ -1028,7 +1061,7 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
         if ofport_int < 0:
             LOG.error(_("Failed to set-up %(type)s tunnel port to %(ip)s"),
                       {'type': tunnel_type, 'ip': remote_ip})
-            return 0
+            return False
 
         self.tun_br_ofports[tunnel_type][remote_ip] = ofport
         # Add flow in default table to resubmit to the right
@@ -1037,7 +1070,9 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
                     in_port=ofport,
                     actions="resubmit(,%s)" %
                     constants.TUN_TABLE[tunnel_type])
+        return True
 
+    def _update_tunnel_flooding(self, br, tunnel_type):
         ofports = ','.join(self.tun_br_ofports[tunnel_type].values())
         if ofports and not self.l2_pop:
             # Update flooding flows to include the new tunnel
@@ -1047,7 +1082,6 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
                                 dl_vlan=vlan_mapping.vlan,
                                 actions="strip_vlan,set_tunnel:%s,output:%s" %
                                 (vlan_mapping.segmentation_id, ofports))
-        return ofport
 
     def setup_tunnel_port(self, br, remote_ip, network_type):
         remote_ip_hex = self.get_ip_in_hex(remote_ip)
@@ -1077,12 +1111,15 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
 
     def treat_devices_added_or_updated(self, devices, ovs_restarted):
         skipped_devices = []
+        stats = self.loop_stats.current
         try:
-            devices_details_list = self.plugin_rpc.get_devices_details_list(
-                self.context,
-                devices,
-                self.agent_id,
-                cfg.CONF.host)
+            with stats.phase('rpc_get_devices_details_list'):
+                devices_details_list = (
+                    self.plugin_rpc.get_devices_details_list(
+                        self.context,
+                        devices,
+                        self.agent_id,
+                        cfg.CONF.host))
         except Exception as e:
             raise DeviceListRetrievalError(devices=devices, error=e)
         for details in devices_details_list:
@@ -1099,15 +1136,16 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
             if 'port_id' in details:
                 LOG.info(_("Port %(device)s updated. Details: %(details)s"),
                          {'device': device, 'details': details})
-                self.treat_vif_port(port, details['port_id'],
-                                    details['network_id'],
-                                    details['network_type'],
-                                    details['physical_network'],
-                                    details['segmentation_id'],
-                                    details['admin_state_up'],
-                                    details['fixed_ips'],
-                                    details['device_owner'],
-                                    ovs_restarted)
+                with stats.phase('treat_vif_port'):
+                    self.treat_vif_port(port, details['port_id'],
+                                        details['network_id'],
+                                        details['network_type'],
+                                        details['physical_network'],
+                                        details['segmentation_id'],
+                                        details['admin_state_up'],
+                                        details['fixed_ips'],
+                                        details['device_owner'],
+                                        ovs_restarted)
                 # update plugin about port status
                 # FIXME(salv-orlando): Failures while updating device status
                 # must be handled appropriately. Otherwise this might prevent
@@ -1115,12 +1153,16 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
                 # API server, thus possibly preventing instance spawn.
                 if details.get('admin_state_up'):
                     LOG.debug(_("Setting status for %s to UP"), device)
-                    self.plugin_rpc.update_device_up(
-                        self.context, device, self.agent_id, cfg.CONF.host)
+                    with stats.phase('rpc_update_device_up'):
+                        self.plugin_rpc.update_device_up(
+                            self.context, device, self.agent_id,
+                            cfg.CONF.host)
                 else:
                     LOG.debug(_("Setting status for %s to DOWN"), device)
-                    self.plugin_rpc.update_device_down(
-                        self.context, device, self.agent_id, cfg.CONF.host)
+                    with stats.phase('rpc_update_device_down'):
+                        self.plugin_rpc.update_device_down(
+                            self.context, device, self.agent_id,
+                            cfg.CONF.host)
                 LOG.info(_("Configuration for device %s completed."), device)
             else:
                 LOG.warn(_("Device %s not defined on plugin"), device)
@@ -1150,20 +1192,24 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
 
     def treat_devices_removed(self, devices):
         resync = False
-        self.sg_agent.remove_devices_filter(devices)
+        stats = self.loop_stats.current
+        with stats.phase('firewall_refresh'):
+            self.sg_agent.remove_devices_filter(devices)
         for device in devices:
             LOG.info(_("Attachment %s removed"), device)
             try:
-                self.plugin_rpc.update_device_down(self.context,
-                                                   device,
-                                                   self.agent_id,
-                                                   cfg.CONF.host)
+                with stats.phase('rpc_update_device_down'):
+                    self.plugin_rpc.update_device_down(self.context,
+                                                       device,
+                                                       self.agent_id,
+                                                       cfg.CONF.host)
             except Exception as e:
                 LOG.debug(_("port_removed failed for %(device)s: %(e)s"),
                           {'device': device, 'e': e})
                 resync = True
                 continue
-            self.port_unbound(device)
+            with stats.phase('port_unbound'):
+                self.port_unbound(device)
         return resync
 
     def treat_ancillary_devices_removed(self, devices):
@@ -1198,8 +1244,9 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
         # will not be wired anyway, and a resync will be triggered
         # TODO(salv-orlando): Optimize avoiding applying filters unnecessarily
         # (eg: when there are no IP address changes)
-        self.sg_agent.setup_port_filters(port_info.get('added', set()),
-                                         port_info.get('updated', set()))
+        with self.loop_stats.current.phase('firewall_refresh'):
+            self.sg_agent.setup_port_filters(port_info.get('added', set()),
+                                             port_info.get('updated', set()))
         # VIF wiring needs to be performed always for 'new' devices.
         # For updated ports, re-wiring is not needed in most cases, but needs
         # to be performed anyway when the admin state of a device is changed.
@@ -1289,8 +1336,8 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
                                                       self.local_ip,
                                                       tunnel_type)
                 if not self.l2_pop:
-                    tunnels = details['tunnels']
-                    for tunnel in tunnels:
+                    tunnels = []
+                    for tunnel in details['tunnels']:
                         if self.local_ip != tunnel['ip_address']:
                             tunnel_id = tunnel.get('id')
                             # Unlike the OVS plugin, ML2 doesn't return an id
@@ -1302,10 +1349,9 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
                                 continue
                             tun_name = '%s-%s' % (tunnel_type,
                                                   tunnel_id or remote_ip_hex)
-                            self._setup_tunnel_port(self.tun_br,
-                                                    tun_name,
-                                                    tunnel['ip_address'],
-                                                    tunnel_type)
+                            tunnels.append((tun_name, remote_ip))
+                    self._setup_tunnel_ports(self.tun_br, tunnels,
+                                             tunnel_type)
         except Exception as e:
             LOG.debug(_("Unable to sync tunnel IP %(local_ip)s: %(e)s"),
                       {'local_ip': self.local_ip, 'e': e})
@@ -1339,6 +1385,7 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
         ovs_restarted = False
         while self.run_daemon_loop:
             start = time.time()
+            stats = self.loop_stats.start_iteration(self.iter_num)
             port_stats = {'regular': {'added': 0,
                                       'updated': 0,
                                       'removed': 0},
@@ -1354,6 +1401,7 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
                 polling_manager.force_polling()
             ovs_restarted = self.check_ovs_restart()
             if ovs_restarted:
+                stats.incr('ovs_restarts')
                 self.setup_integration_br()
                 self.setup_physical_bridges(self.bridge_mappings)
                 if self.enable_tunneling:
@@ -1368,7 +1416,8 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
             if self.enable_tunneling and tunnel_sync:
                 LOG.info(_("Agent tunnel out of sync with plugin!"))
                 try:
-                    tunnel_sync = self.tunnel_sync()
+                    with stats.phase('tunnel_sync'):
+                        tunnel_sync = self.tunnel_sync()
                 except Exception:
                     LOG.exception(_("Error while synchronizing tunnels"))
                     tunnel_sync = True
@@ -1385,7 +1434,9 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
                     updated_ports_copy = self.updated_ports
                     self.updated_ports = set()
                     reg_ports = (set() if ovs_restarted else ports)
-                    port_info = self.scan_ports(reg_ports, updated_ports_copy)
+                    with stats.phase('scan_ports'):
+                        port_info = self.scan_ports(reg_ports,
+                                                    updated_ports_copy)
                     LOG.debug(_("Agent rpc_loop - iteration:%(iter_num)d - "
                                 "port information retrieved. "
                                 "Elapsed:%(elapsed).3f"),
@@ -1399,8 +1450,9 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
                         LOG.debug(_("Starting to process devices in:%s"),
                                   port_info)
                         # If treat devices fails - must resync with plugin
-                        sync = self.process_network_ports(port_info,
-                                                          ovs_restarted)
+                        with stats.phase('process_network_ports'):
+                            sync = self.process_network_ports(port_info,
+                                                              ovs_restarted)
                         LOG.debug(_("Agent rpc_loop - iteration:%(iter_num)d -"
                                     "ports processed. Elapsed:%(elapsed).3f"),
                                   {'iter_num': self.iter_num,
@@ -1423,8 +1475,9 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
                                    'elapsed': time.time() - start})
 
                         if port_info:
-                            rc = self.process_ancillary_network_ports(
-                                port_info)
+                            with stats.phase('process_ancillary_ports'):
+                                rc = self.process_ancillary_network_ports(
+                                    port_info)
                             LOG.debug(_("Agent rpc_loop - iteration:"
                                         "%(iter_num)d - ancillary ports "
                                         "processed. Elapsed:%(elapsed).3f"),
@@ -1444,6 +1497,12 @@ class OVSNeutronAgent(n_rpc.RpcCallback,
                     self.updated_ports |= updated_ports_copy
                     sync = True
 
+            for kind, counts in port_stats.items():
+                for event, count in counts.items():
+                    stats.incr('%s_ports_%s' % (kind, event), count)
+            if sync:
+                stats.incr('resyncs')
+            self.loop_stats.finish_iteration()
             # sleep till end of polling interval
             elapsed = (time.time() - start)
             LOG.debug(_("Agent rpc_loop - iteration:%(iter_num)d "
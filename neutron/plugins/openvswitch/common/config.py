@@ -94,6 +94,17 @@ agent_opts = [
                        "outgoing IP packet carrying GRE/VXLAN tunnel.")),
     cfg.BoolOpt('enable_distributed_routing', default=False,
                 help=_("Make the l2 agent run in DVR mode.")),
+    cfg.StrOpt('loop_stats_file',
+               help=_("File to which per-iteration rpc_loop statistics "
+                      "(phase timings, RPC latencies and subprocess "
+                      "counts) are appended as JSON lines.")),
+    cfg.IntOpt('loop_profile_slowest', default=0,
+               help=_("Profile rpc_loop iterations with cProfile and keep "
+                      "the profiles of this many slowest iterations in "
+                      "loop_profile_dir. 0 disables profiling.")),
+    cfg.StrOpt('loop_profile_dir',
+               help=_("Directory in which rpc_loop iteration profiles are "
+                      "stored.")),
 ]
 
 
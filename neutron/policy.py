@@ -23,6 +23,7 @@ from oslo.config import cfg
 
 from neutron.api.v2 import attributes
 from neutron.common import exceptions
+from neutron.common import request_stats
 import neutron.common.utils as utils
 from neutron.openstack.common import excutils
 from neutron.openstack.common.gettextutils import _LE, _LI, _LW
@@ -327,6 +328,7 @@ def _prepare_check(context, action, target):
     return match_rule, target, credentials
 
 
+@request_stats.timed('policy')
 def check(context, action, target, plugin=None, might_not_exist=False):
     """Verifies that the action is valid on the target in this context.
 
@@ -349,6 +351,7 @@ def check(context, action, target, plugin=None, might_not_exist=False):
     return policy.check(*(_prepare_check(context, action, target)))
 
 
+@request_stats.timed('policy')
 def enforce(context, action, target, plugin=None):
     """Verifies that the action is valid on the target in this context.
 
@@ -20,6 +20,7 @@ from oslo.config import cfg
 import webob
 
 from neutron.common import exceptions
+from neutron.common import request_stats
 from neutron.openstack.common import importutils
 from neutron.openstack.common import log as logging
 
@@ -253,6 +254,7 @@ class QuotaEngine(object):
         for resource in resources:
             self.register_resource(resource)
 
+    @request_stats.timed('quota')
     def count(self, context, resource, *args, **kwargs):
         """Count a resource.
 
@@ -272,6 +274,7 @@ class QuotaEngine(object):
 
         return res.count(context, *args, **kwargs)
 
+    @request_stats.timed('quota')
     def limit_check(self, context, tenant_id, **values):
         """Check simple quota limits.
 
@@ -224,6 +224,22 @@ class L3Scheduler(object):
         """Choose an agent from candidates based on a specific policy."""
         pass
 
+    def choose_router_agents(self, plugin, context, router_candidates, load):
+        """Choose an agent for each of a set of routers being rescheduled.
+
+        :param router_candidates: list of (router id, candidate agents)
+        :param load: dict mapping the ids of the active agents to their
+                     router count, updated with the routers chosen for them
+        :returns: dict mapping router ids to the chosen agents
+        """
+        chosen_agents = {}
+        for router_id, candidates in router_candidates:
+            chosen_agent = self._choose_router_agent(
+                plugin, context, candidates)
+            load[chosen_agent.id] = load.get(chosen_agent.id, 0) + 1
+            chosen_agents[router_id] = chosen_agent
+        return chosen_agents
+
 
 class ChanceScheduler(L3Scheduler):
     """Randomly allocate an L3 agent for a router."""
@@ -250,3 +266,14 @@ class LeastRoutersScheduler(L3Scheduler):
         chosen_agent = plugin.get_l3_agent_with_min_routers(
             context, candidate_ids)
         return chosen_agent
+
+    def choose_router_agents(self, plugin, context, router_candidates, load):
+        # The bindings are only written once all the routers have an
+        # agent, so the load is counted here rather than in the database.
+        chosen_agents = {}
+        for router_id, candidates in router_candidates:
+            chosen_agent = min(candidates,
+                               key=lambda agent: load.get(agent.id, 0))
+            load[chosen_agent.id] = load.get(chosen_agent.id, 0) + 1
+            chosen_agents[router_id] = chosen_agent
+        return chosen_agents
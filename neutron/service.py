@@ -23,6 +23,7 @@ from oslo.messaging import server as rpc_server
 
 from neutron.common import config
 from neutron.common import rpc as n_rpc
+from neutron.common import startup_timing
 from neutron import context
 from neutron.db import api as session
 from neutron import manager
@@ -44,6 +45,11 @@ service_opts = [
     cfg.IntOpt('rpc_workers',
                default=0,
                help=_('Number of RPC worker processes for service')),
+    cfg.IntOpt('rpc_state_report_workers',
+               default=0,
+               help=_('Number of RPC worker processes dedicated to the agent '
+                      'state reports topic. If 0, state reports are '
+                      'consumed by the regular RPC workers.')),
     cfg.IntOpt('periodic_fuzzy_delay',
                default=5,
                help=_('Range of seconds to randomly delay when starting the '
@@ -110,16 +116,26 @@ def serve_wsgi(cls):
 
 class RpcWorker(object):
     """Wraps a worker to be handled by ProcessLauncher"""
-    def __init__(self, plugin):
+    def __init__(self, plugin, state_reports=False):
         self._plugin = plugin
+        self._state_reports = state_reports
         self._servers = []
 
+    def _start_listeners(self):
+        servers = self._plugin.start_rpc_listeners()
+        if self._state_reports:
+            # No dedicated state report workers, consume the state
+            # reports topic along with the plugin topic
+            servers = (list(servers) +
+                       list(self._plugin.start_rpc_state_reports_listener()))
+        return servers
+
     def start(self):
         # We may have just forked from parent process.  A quick disposal of the
         # existing sql connections avoids producing errors later when they are
         # discovered to be broken.
         session.get_engine().pool.dispose()
-        self._servers = self._plugin.start_rpc_listeners()
+        self._servers = self._start_listeners()
 
     def wait(self):
         for server in self._servers:
@@ -133,6 +149,13 @@ class RpcWorker(object):
             self._servers = []
 
 
+class RpcReportsWorker(RpcWorker):
+    """Worker consuming only the agent state reports topic."""
+
+    def _start_listeners(self):
+        return self._plugin.start_rpc_state_reports_listener()
+
+
 def serve_rpc():
     plugin = manager.NeutronManager.get_plugin()
 
@@ -148,14 +171,31 @@ def serve_rpc():
             LOG.error(msg, cfg.CONF.rpc_workers)
         raise NotImplementedError
 
+    reports_supported = plugin.rpc_state_report_workers_supported()
+    report_workers = cfg.CONF.rpc_state_report_workers
+    if 0 < report_workers and not reports_supported:
+        LOG.error(_("'rpc_state_report_workers = %d' ignored because "
+                    "start_rpc_state_reports_listener is not implemented."),
+                  report_workers)
+        report_workers = 0
+
     try:
-        rpc = RpcWorker(plugin)
+        rpc = RpcWorker(plugin,
+                        state_reports=reports_supported and report_workers < 1)
 
+        launcher = None
+        if 0 < report_workers:
+            # Fork the state report workers before starting any listener
+            # in this process
+            launcher = common_service.ProcessLauncher(wait_interval=1.0)
+            launcher.launch_service(RpcReportsWorker(plugin),
+                                    workers=report_workers)
         if cfg.CONF.rpc_workers < 1:
             rpc.start()
-            return rpc
+            return launcher or rpc
         else:
-            launcher = common_service.ProcessLauncher(wait_interval=1.0)
+            launcher = (launcher or
+                        common_service.ProcessLauncher(wait_interval=1.0))
             launcher.launch_service(rpc, workers=cfg.CONF.rpc_workers)
             return launcher
     except Exception:
@@ -165,10 +205,12 @@ def serve_rpc():
 
 
 def _run_wsgi(app_name):
-    app = config.load_paste_app(app_name)
+    with startup_timing.timed('api_app'):
+        app = config.load_paste_app(app_name)
     if not app:
         LOG.error(_('No known API applications configured.'))
         return
+    startup_timing.log_report()
     server = wsgi.Server("Neutron")
     server.start(app, cfg.CONF.bind_port, cfg.CONF.bind_host,
                  workers=cfg.CONF.api_workers)
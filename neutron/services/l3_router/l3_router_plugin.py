@@ -49,6 +49,9 @@ class L3RouterPlugin(common_db_mixin.CommonDbMixin,
     supported_extension_aliases = ["dvr", "router", "ext-gw-mode",
                                    "extraroute", "l3_agent_scheduler"]
 
+    __native_pagination_support = True
+    __native_sorting_support = True
+
     def __init__(self):
         self.setup_rpc()
         self.router_scheduler = importutils.import_object(
@@ -26,6 +26,8 @@ class LbaasAgentApi(n_rpc.RpcProxy):
     #   2.0 Generic API for agent based drivers
     #       - get_logical_device() handling changed on plugin side;
     #       - pool_deployed() and update_status() methods added;
+    #   2.1 update_pools_stats() added
+    #   2.2 get_logical_devices() added
 
     def __init__(self, topic, context, host):
         super(LbaasAgentApi, self).__init__(topic, self.API_VERSION)
@@ -59,6 +61,17 @@ class LbaasAgentApi(n_rpc.RpcProxy):
             )
         )
 
+    def get_logical_devices(self, pool_ids):
+        return self.call(
+            self.context,
+            self.make_msg(
+                'get_logical_devices',
+                pool_ids=pool_ids,
+                host=self.host
+            ),
+            version='2.2'
+        )
+
     def update_status(self, obj_type, obj_id, status):
         return self.call(
             self.context,
@@ -88,3 +101,14 @@ class LbaasAgentApi(n_rpc.RpcProxy):
                 host=self.host
             )
         )
+
+    def update_pools_stats(self, stats):
+        return self.call(
+            self.context,
+            self.make_msg(
+                'update_pools_stats',
+                stats=stats,
+                host=self.host
+            ),
+            version='2.1'
+        )
@@ -14,6 +14,7 @@
 #
 # @author: Mark McClain, DreamHost
 
+import eventlet
 from oslo.config import cfg
 
 from neutron.agent import rpc as agent_rpc
@@ -38,6 +39,12 @@ OPTS = [
                  '.haproxy.namespace_driver.HaproxyNSDriver'],
         help=_('Drivers used to manage loadbalancing devices'),
     ),
+    cfg.IntOpt(
+        'stats_collection_concurrency',
+        default=10,
+        help=_('Maximum number of pools whose statistics are read '
+               'concurrently'),
+    ),
 ]
 
 
@@ -80,6 +87,8 @@ class LbaasAgentManager(n_rpc.RpcCallback, periodic_task.PeriodicTasks):
         self.needs_resync = False
         # pool_id->device_driver_name mapping used to store known instances
         self.instance_mapping = {}
+        # pool_id->stats last reported to the plugin
+        self.pool_stats = {}
 
     def _load_drivers(self):
         self.device_drivers = {}
@@ -131,16 +140,35 @@ class LbaasAgentManager(n_rpc.RpcCallback, periodic_task.PeriodicTasks):
 
     @periodic_task.periodic_task(spacing=6)
     def collect_stats(self, context):
-        for pool_id, driver_name in self.instance_mapping.items():
-            driver = self.device_drivers[driver_name]
-            try:
-                stats = driver.get_stats(pool_id)
-                if stats:
-                    self.plugin_rpc.update_pool_stats(pool_id, stats)
-            except Exception:
-                LOG.exception(_('Error updating statistics on pool %s'),
-                              pool_id)
-                self.needs_resync = True
+        for pool_id in set(self.pool_stats) - set(self.instance_mapping):
+            del self.pool_stats[pool_id]
+
+        instances = self.instance_mapping.items()
+        pool = eventlet.GreenPool(self.conf.stats_collection_concurrency)
+        changed_stats = {}
+        for pool_id, stats in pool.imap(self._get_pool_stats,
+                                        [i[0] for i in instances],
+                                        [i[1] for i in instances]):
+            if stats and stats != self.pool_stats.get(pool_id):
+                changed_stats[pool_id] = stats
+        if not changed_stats:
+            return
+
+        try:
+            self.plugin_rpc.update_pools_stats(changed_stats)
+            self.pool_stats.update(changed_stats)
+        except Exception:
+            LOG.exception(_('Error updating statistics on pools %s'),
+                          ', '.join(changed_stats))
+            self.needs_resync = True
+
+    def _get_pool_stats(self, pool_id, driver_name):
+        try:
+            return pool_id, self.device_drivers[driver_name].get_stats(pool_id)
+        except Exception:
+            LOG.exception(_('Error reading statistics of pool %s'), pool_id)
+            self.needs_resync = True
+            return pool_id, None
 
     def sync_state(self):
         known_instances = set(self.instance_mapping.keys())
@@ -150,8 +178,10 @@ class LbaasAgentManager(n_rpc.RpcCallback, periodic_task.PeriodicTasks):
             for deleted_id in known_instances - ready_instances:
                 self._destroy_pool(deleted_id)
 
+            logical_configs = self.plugin_rpc.get_logical_devices(
+                list(ready_instances))
             for pool_id in ready_instances:
-                self._reload_pool(pool_id)
+                self._reload_pool(pool_id, logical_configs.get(pool_id))
 
         except Exception:
             LOG.exception(_('Unable to retrieve ready devices'))
@@ -166,9 +196,10 @@ class LbaasAgentManager(n_rpc.RpcCallback, periodic_task.PeriodicTasks):
         driver_name = self.instance_mapping[pool_id]
         return self.device_drivers[driver_name]
 
-    def _reload_pool(self, pool_id):
+    def _reload_pool(self, pool_id, logical_config=None):
         try:
-            logical_config = self.plugin_rpc.get_logical_device(pool_id)
+            if not logical_config:
+                logical_config = self.plugin_rpc.get_logical_device(pool_id)
             driver_name = logical_config['driver']
             if driver_name not in self.device_drivers:
                 LOG.error(_('No device driver '
@@ -51,12 +51,14 @@ class DriverNotSpecified(n_exc.NeutronException):
 
 class LoadBalancerCallbacks(n_rpc.RpcCallback):
 
-    RPC_API_VERSION = '2.0'
+    RPC_API_VERSION = '2.2'
     # history
     #   1.0 Initial version
     #   2.0 Generic API for agent based drivers
     #       - get_logical_device() handling changed;
     #       - pool_deployed() and update_status() methods added;
+    #   2.1 update_pools_stats() added
+    #   2.2 get_logical_devices() added
 
     def __init__(self, plugin):
         super(LoadBalancerCallbacks, self).__init__()
@@ -88,36 +90,59 @@ class LoadBalancerCallbacks(n_rpc.RpcCallback):
             qry = context.session.query(loadbalancer_db.Pool)
             qry = qry.filter_by(id=pool_id)
             pool = qry.one()
-            retval = {}
-            retval['pool'] = self.plugin._make_pool_dict(pool)
-
-            if pool.vip:
-                retval['vip'] = self.plugin._make_vip_dict(pool.vip)
-                retval['vip']['port'] = (
-                    self.plugin._core_plugin._make_port_dict(pool.vip.port)
-                )
-                for fixed_ip in retval['vip']['port']['fixed_ips']:
-                    fixed_ip['subnet'] = (
-                        self.plugin._core_plugin.get_subnet(
-                            context,
-                            fixed_ip['subnet_id']
-                        )
+            return self._make_logical_device(context, pool)
+
+    def get_logical_devices(self, context, pool_ids=None, host=None):
+        """Return the logical devices of several pools keyed by pool id.
+
+        Pools which no longer exist are left out of the result.
+        """
+        if not pool_ids:
+            return {}
+        with context.session.begin(subtransactions=True):
+            qry = context.session.query(loadbalancer_db.Pool)
+            qry = qry.filter(loadbalancer_db.Pool.id.in_(pool_ids))
+            subnets = {}
+            return dict((pool.id,
+                         self._make_logical_device(context, pool, subnets))
+                        for pool in qry)
+
+    def _make_logical_device(self, context, pool, subnets=None):
+        # subnets is an optional subnet_id->subnet cache shared by the
+        # pools of a single request
+        if subnets is None:
+            subnets = {}
+        retval = {}
+        retval['pool'] = self.plugin._make_pool_dict(pool)
+
+        if pool.vip:
+            retval['vip'] = self.plugin._make_vip_dict(pool.vip)
+            retval['vip']['port'] = (
+                self.plugin._core_plugin._make_port_dict(pool.vip.port)
+            )
+            for fixed_ip in retval['vip']['port']['fixed_ips']:
+                subnet_id = fixed_ip['subnet_id']
+                if subnet_id not in subnets:
+                    subnets[subnet_id] = self.plugin._core_plugin.get_subnet(
+                        context,
+                        subnet_id
                     )
-            retval['members'] = [
-                self.plugin._make_member_dict(m)
-                for m in pool.members if (
-                    m.status in constants.ACTIVE_PENDING_STATUSES or
-                    m.status == constants.INACTIVE)
-            ]
-            retval['healthmonitors'] = [
-                self.plugin._make_health_monitor_dict(hm.healthmonitor)
-                for hm in pool.monitors
-                if hm.status in constants.ACTIVE_PENDING_STATUSES
-            ]
-            retval['driver'] = (
-                self.plugin.drivers[pool.provider.provider_name].device_driver)
-
-            return retval
+                fixed_ip['subnet'] = subnets[subnet_id]
+        retval['members'] = [
+            self.plugin._make_member_dict(m)
+            for m in pool.members if (
+                m.status in constants.ACTIVE_PENDING_STATUSES or
+                m.status == constants.INACTIVE)
+        ]
+        retval['healthmonitors'] = [
+            self.plugin._make_health_monitor_dict(hm.healthmonitor)
+            for hm in pool.monitors
+            if hm.status in constants.ACTIVE_PENDING_STATUSES
+        ]
+        retval['driver'] = (
+            self.plugin.drivers[pool.provider.provider_name].device_driver)
+
+        return retval
 
     def pool_deployed(self, context, pool_id):
         with context.session.begin(subtransactions=True):
@@ -231,6 +256,9 @@ class LoadBalancerCallbacks(n_rpc.RpcCallback):
     def update_pool_stats(self, context, pool_id=None, stats=None, host=None):
         self.plugin.update_pool_stats(context, pool_id, data=stats)
 
+    def update_pools_stats(self, context, stats=None, host=None):
+        self.plugin.update_pools_stats(context, stats or {})
+
 
 class LoadBalancerAgentApi(n_rpc.RpcProxy):
     """Plugin side of plugin to agent RPC API."""
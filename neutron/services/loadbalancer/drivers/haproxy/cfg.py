@@ -53,14 +53,25 @@ INACTIVE = qconstants.INACTIVE
 
 def save_config(conf_path, logical_config, socket_path=None,
                 user_group='nogroup'):
-    """Convert a logical configuration to the HAProxy version."""
+    """Convert a logical configuration to the HAProxy version.
+
+    Returns the configuration which was written.
+    """
+    config = build_config(logical_config, socket_path=socket_path,
+                          user_group=user_group)
+    utils.replace_file(conf_path, config)
+    return config
+
+
+def build_config(logical_config, socket_path=None, user_group='nogroup'):
+    """Return the HAProxy configuration text of a logical configuration."""
     data = []
     data.extend(_build_global(logical_config, socket_path=socket_path,
                               user_group=user_group))
     data.extend(_build_defaults(logical_config))
     data.extend(_build_frontend(logical_config))
     data.extend(_build_backend(logical_config))
-    utils.replace_file(conf_path, '\n'.join(data))
+    return '\n'.join(data)
 
 
 def _build_global(config, socket_path=None, user_group='nogroup'):
@@ -13,12 +13,15 @@
 #    under the License.
 #
 # @author: Mark McClain, DreamHost
+import hashlib
 import os
 import shutil
 import socket
 
+import eventlet
 import netaddr
 from oslo.config import cfg
+import six
 
 from neutron.agent.common import config
 from neutron.agent.linux import ip_lib
@@ -59,6 +62,17 @@ OPTS = [
         help=_('When delete and re-add the same vip, send this many '
                'gratuitous ARPs to flush the ARP cache in the Router. '
                'Set it below or equal to 0 to disable this feature.'),
+    ),
+    cfg.FloatOpt(
+        'reload_delay',
+        default=0,
+        help=_('Seconds to wait after a change of a pool before haproxy '
+               'is reconfigured, so that a burst of changes to the same '
+               'pool results in a single reload. When above 0, changed '
+               'objects are reported ACTIVE before haproxy is '
+               'reconfigured, and a failed reload sets the whole pool in '
+               'ERROR. Set it below or equal to 0 to reload on every '
+               'change.'),
     )
 ]
 cfg.CONF.register_opts(OPTS, 'haproxy')
@@ -80,6 +94,10 @@ class HaproxyNSDriver(agent_device_driver.AgentDeviceDriver):
         self.vif_driver = vif_driver
         self.plugin_rpc = plugin_rpc
         self.pool_to_port_id = {}
+        # pool_id->hash of the haproxy config the running process uses
+        self.pool_config_hash = {}
+        # pools with a pending delayed refresh
+        self.pending_refresh = set()
 
     @classmethod
     def get_name(cls):
@@ -94,6 +112,14 @@ class HaproxyNSDriver(agent_device_driver.AgentDeviceDriver):
 
     def update(self, logical_config):
         pool_id = logical_config['pool']['id']
+        sock_path = self._get_state_file_path(pool_id, 'sock')
+        config = hacfg.build_config(logical_config, sock_path,
+                                    self.conf.haproxy.user_group)
+        if self.pool_config_hash.get(pool_id) == _hash_config(config):
+            LOG.debug(_('Configuration of pool %s is unchanged, skipping '
+                        'haproxy reload'), pool_id)
+            return
+
         pid_path = self._get_state_file_path(pool_id, 'pid')
 
         extra_args = ['-sf']
@@ -108,12 +134,14 @@ class HaproxyNSDriver(agent_device_driver.AgentDeviceDriver):
         sock_path = self._get_state_file_path(pool_id, 'sock')
         user_group = self.conf.haproxy.user_group
 
-        hacfg.save_config(conf_path, logical_config, sock_path, user_group)
+        config = hacfg.save_config(conf_path, logical_config, sock_path,
+                                   user_group)
         cmd = ['haproxy', '-f', conf_path, '-p', pid_path]
         cmd.extend(extra_cmd_args)
 
         ns = ip_lib.IPWrapper(self.root_helper, namespace)
         ns.netns.execute(cmd)
+        self.pool_config_hash[pool_id] = _hash_config(config)
 
         # remember the pool<>port mapping
         self.pool_to_port_id[pool_id] = logical_config['vip']['port']['id']
@@ -126,6 +154,8 @@ class HaproxyNSDriver(agent_device_driver.AgentDeviceDriver):
 
         # kill the process
         kill_pids_in_file(self.root_helper, pid_path)
+        self.pool_config_hash.pop(pool_id, None)
+        self.pending_refresh.discard(pool_id)
 
         # unplug the ports
         if pool_id in self.pool_to_port_id:
@@ -312,8 +342,27 @@ class HaproxyNSDriver(agent_device_driver.AgentDeviceDriver):
             self.create(logical_config)
 
     def _refresh_device(self, pool_id):
-        logical_config = self.plugin_rpc.get_logical_device(pool_id)
-        self.deploy_instance(logical_config)
+        delay = self.conf.haproxy.reload_delay
+        if delay <= 0:
+            logical_config = self.plugin_rpc.get_logical_device(pool_id)
+            self.deploy_instance(logical_config)
+        elif pool_id not in self.pending_refresh:
+            # the logical config is fetched when the delay expires, so the
+            # pending refresh also covers any change made until then
+            self.pending_refresh.add(pool_id)
+            eventlet.spawn_after(delay, self._delayed_refresh_device, pool_id)
+
+    def _delayed_refresh_device(self, pool_id):
+        if pool_id not in self.pending_refresh:
+            # the instance was undeployed in the meantime
+            return
+        self.pending_refresh.discard(pool_id)
+        try:
+            logical_config = self.plugin_rpc.get_logical_device(pool_id)
+            self.deploy_instance(logical_config)
+        except Exception:
+            LOG.exception(_('Unable to refresh device for pool: %s'), pool_id)
+            self.plugin_rpc.update_status('pool', pool_id, constants.ERROR)
 
     def create_vip(self, vip):
         self._refresh_device(vip['pool_id'])
@@ -334,6 +383,7 @@ class HaproxyNSDriver(agent_device_driver.AgentDeviceDriver):
     def delete_pool(self, pool):
         # delete_pool may be called before vip deletion in case
         # pool's admin state set to down
+        self.pending_refresh.discard(pool['id'])
         if self.exists(pool['id']):
             self.undeploy_instance(pool['id'])
 
@@ -381,6 +431,12 @@ def get_ns_name(namespace_id):
     return NS_PREFIX + namespace_id
 
 
+def _hash_config(config):
+    if isinstance(config, six.text_type):
+        config = config.encode('utf-8')
+    return hashlib.sha1(config).hexdigest()
+
+
 def kill_pids_in_file(root_helper, pid_path):
     if os.path.exists(pid_path):
         with open(pid_path, 'r') as pids:
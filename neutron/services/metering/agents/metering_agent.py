@@ -72,6 +72,18 @@ class MeteringAgent(MeteringPluginRpc, manager.Manager):
                    help=_("Interval between two metering measures")),
         cfg.IntOpt('report_interval', default=300,
                    help=_("Interval between two metering reports")),
+        cfg.BoolOpt('batch_notifications', default=False,
+                    help=_("Send the samples of all the metering labels in "
+                           "a single l3.meter.batch notification per report "
+                           "instead of one l3.meter notification per "
+                           "label.")),
+        cfg.IntOpt('report_aggregation_intervals', default=1,
+                   help=_("Number of report intervals over which the "
+                          "counters are aggregated locally before a "
+                          "notification is sent.")),
+        cfg.BoolOpt('skip_zero_samples', default=False,
+                    help=_("Do not notify the samples of labels which saw "
+                           "no traffic since the previous notification.")),
     ]
 
     def __init__(self, host, conf=None):
@@ -85,6 +97,7 @@ class MeteringAgent(MeteringPluginRpc, manager.Manager):
         )
         measure_interval = self.conf.measure_interval
         self.last_report = 0
+        self.pending_reports = 0
         self.metering_loop.start(interval=measure_interval)
         self.host = host
 
@@ -102,23 +115,35 @@ class MeteringAgent(MeteringPluginRpc, manager.Manager):
             self.conf.driver, self, self.conf)
 
     def _metering_notification(self):
+        samples = []
         for label_id, info in self.metering_infos.items():
-            data = {'label_id': label_id,
-                    'tenant_id': self.label_tenant_id.get(label_id),
-                    'pkts': info['pkts'],
-                    'bytes': info['bytes'],
-                    'time': info['time'],
-                    'first_update': info['first_update'],
-                    'last_update': info['last_update'],
-                    'host': self.host}
-
-            LOG.debug(_("Send metering report: %s"), data)
-            notifier = n_rpc.get_notifier('metering')
-            notifier.info(self.context, 'l3.meter', data)
+            if (info['pkts'] or info['bytes'] or
+                    not self.conf.skip_zero_samples):
+                samples.append({'label_id': label_id,
+                                'tenant_id': self.label_tenant_id.get(
+                                    label_id),
+                                'pkts': info['pkts'],
+                                'bytes': info['bytes'],
+                                'time': info['time'],
+                                'first_update': info['first_update'],
+                                'last_update': info['last_update'],
+                                'host': self.host})
             info['pkts'] = 0
             info['bytes'] = 0
             info['time'] = 0
 
+        if not samples:
+            return
+        notifier = n_rpc.get_notifier('metering')
+        if self.conf.batch_notifications:
+            data = {'host': self.host, 'samples': samples}
+            LOG.debug(_("Send metering report of %d labels"), len(samples))
+            notifier.info(self.context, 'l3.meter.batch', data)
+            return
+        for data in samples:
+            LOG.debug(_("Send metering report: %s"), data)
+            notifier.info(self.context, 'l3.meter', data)
+
     def _purge_metering_info(self):
         ts = int(time.time())
         report_interval = self.conf.report_interval
@@ -167,7 +192,10 @@ class MeteringAgent(MeteringPluginRpc, manager.Manager):
 
         report_interval = self.conf.report_interval
         if delta > report_interval:
-            self._metering_notification()
+            self.pending_reports += 1
+            if self.pending_reports >= self.conf.report_aggregation_intervals:
+                self._metering_notification()
+                self.pending_reports = 0
             self._purge_metering_info()
             self.last_report = ts
 
@@ -36,10 +36,20 @@ TOP_CHAIN = WRAP_NAME + "-FORWARD"
 RULE = '-r-'
 LABEL = '-l-'
 
+IPTABLES_DRIVER_OPTS = [
+    cfg.BoolOpt('bulk_traffic_counters', default=True,
+                help=_("Read the traffic counters of all the metering labels "
+                       "of a router with one iptables-save per namespace and "
+                       "compute the deltas in the agent, instead of one "
+                       "zeroing iptables call per label. The first reading "
+                       "of a label is only used as a baseline.")),
+]
+
 config.register_interface_driver_opts_helper(cfg.CONF)
 config.register_use_namespaces_opts_helper(cfg.CONF)
 config.register_root_helper(cfg.CONF)
 cfg.CONF.register_opts(interface.OPTS)
+cfg.CONF.register_opts(IPTABLES_DRIVER_OPTS)
 
 
 class IptablesManagerTransaction(object):
@@ -79,6 +89,8 @@ class RouterWithMetering(object):
             binary_name=WRAP_NAME,
             use_ipv6=ipv6_utils.is_enabled())
         self.metering_labels = {}
+        # last absolute counters read for each label in bulk mode
+        self.label_counters = {}
 
 
 class IptablesMeteringDriver(abstract_driver.MeteringAbstractDriver):
@@ -219,6 +231,7 @@ class IptablesMeteringDriver(abstract_driver.MeteringAbstractDriver):
                                                                 wrap=False)
 
                 del rm.metering_labels[label_id]
+                rm.label_counters.pop(label_id, None)
 
     @log.log
     def add_metering_label(self, context, routers):
@@ -260,6 +273,46 @@ class IptablesMeteringDriver(abstract_driver.MeteringAbstractDriver):
         for router in routers:
             self._process_disassociate_metering_label(router)
 
+    def _get_label_counters(self, rm):
+        counters = {}
+        for label_id in rm.metering_labels:
+            chain = iptables_manager.get_chain_name(WRAP_NAME + LABEL +
+                                                    label_id, wrap=False)
+
+            chain_acc = rm.iptables_manager.get_traffic_counters(
+                chain, wrap=False, zero=True)
+
+            if chain_acc:
+                counters[label_id] = chain_acc
+        return counters
+
+    def _get_label_counters_bulk(self, rm):
+        chains = dict((iptables_manager.get_chain_name(WRAP_NAME + LABEL +
+                                                       label_id, wrap=False),
+                       label_id)
+                      for label_id in rm.metering_labels)
+        totals = rm.iptables_manager.get_traffic_counters_by_chain(
+            chains.keys(), wrap=False)
+
+        counters = {}
+        for chain, total in totals.items():
+            label_id = chains[chain]
+            last = rm.label_counters.get(label_id)
+            rm.label_counters[label_id] = total
+            if last is None:
+                # NOTE: the chains and their counters survive a restart of
+                # the agent, so the first reading may include traffic which
+                # has already been reported.  It is only used as a baseline.
+                counters[label_id] = {'pkts': 0, 'bytes': 0}
+            elif (total['pkts'] >= last['pkts'] and
+                    total['bytes'] >= last['bytes']):
+                counters[label_id] = {'pkts': total['pkts'] - last['pkts'],
+                                      'bytes': total['bytes'] - last['bytes']}
+            else:
+                # The chain has been recreated since the last reading
+                counters[label_id] = total
+        return counters
+
     @log.log
     def get_traffic_counters(self, context, routers):
         accs = {}
@@ -268,16 +321,12 @@ class IptablesMeteringDriver(abstract_driver.MeteringAbstractDriver):
             if not rm:
                 continue
 
-            for label_id, label in rm.metering_labels.items():
-                chain = iptables_manager.get_chain_name(WRAP_NAME + LABEL +
-                                                        label_id, wrap=False)
-
-                chain_acc = rm.iptables_manager.get_traffic_counters(
-                    chain, wrap=False, zero=True)
-
-                if not chain_acc:
-                    continue
+            if self.conf.bulk_traffic_counters:
+                counters = self._get_label_counters_bulk(rm)
+            else:
+                counters = self._get_label_counters(rm)
 
+            for label_id, chain_acc in counters.items():
                 acc = accs.get(label_id, {'pkts': 0, 'bytes': 0})
 
                 acc['pkts'] += chain_acc['pkts']
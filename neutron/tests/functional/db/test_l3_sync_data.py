@@ -0,0 +1,193 @@
+# Copyright (c) 2014 OpenStack Foundation.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+
+import sqlalchemy
+
+from neutron.api.v2 import attributes
+from neutron.common import constants
+from neutron.common import topics
+from neutron import context
+from neutron.db import agents_db
+from neutron.db import api as db_api
+from neutron.extensions import portbindings
+from neutron import manager
+from neutron.openstack.common import log as logging
+from neutron.openstack.common import timeutils
+from neutron.plugins.common import constants as service_constants
+from neutron.plugins.ml2 import config
+from neutron.tests.unit import test_db_plugin
+from neutron.tests.unit import test_l3_plugin
+
+LOG = logging.getLogger(__name__)
+
+HOST = 'compute1'
+
+
+class L3GetSyncDataQueriesMixin(object):
+    """Check the number of queries issued to build the L3 agent sync data.
+
+    Building the routers of an L3 agent must not issue queries per router,
+    interface or floating IP, so the query count for a small and a larger
+    set of routers has to be the same.  The time taken is logged as a
+    benchmark.
+    """
+
+    distributed = False
+
+    def _setup_query_count(self):
+        self.core_plugin = manager.NeutronManager.get_plugin()
+        self.l3_plugin = manager.NeutronManager.get_service_plugins()[
+            service_constants.L3_ROUTER_NAT]
+        self.ctx = context.get_admin_context()
+        self.statements = []
+        engine = db_api.get_engine()
+        sqlalchemy.event.listen(engine, 'before_cursor_execute',
+                                self._count_statement)
+        self.addCleanup(sqlalchemy.event.remove, engine,
+                        'before_cursor_execute', self._count_statement)
+        self.ext_net_id = self._create_network_with_subnet(
+            '172.16.0.0/16', external=True)[0]
+
+    def _count_statement(self, conn, cursor, statement, parameters,
+                         context, executemany):
+        self.statements.append(statement)
+
+    def _create_network_with_subnet(self, cidr, external=False):
+        not_specified = attributes.ATTR_NOT_SPECIFIED
+        net = {'name': 'net', 'tenant_id': 'tenant', 'admin_state_up': True,
+               'shared': False}
+        if external:
+            net['router:external'] = True
+        net_id = self.core_plugin.create_network(
+            self.ctx, {'network': net})['id']
+        subnet = self.core_plugin.create_subnet(
+            self.ctx, {'subnet': {'network_id': net_id,
+                                  'tenant_id': 'tenant',
+                                  'name': 'subnet',
+                                  'cidr': cidr,
+                                  'ip_version': 4,
+                                  'gateway_ip': not_specified,
+                                  'allocation_pools': not_specified,
+                                  'dns_nameservers': not_specified,
+                                  'host_routes': not_specified,
+                                  'enable_dhcp': False}})
+        return net_id, subnet['id']
+
+    def _create_routers(self, start, count):
+        """Create routers with a gateway, 2 interfaces and a floating IP."""
+        router_ids = []
+        for i in range(start, start + count):
+            router = {'name': 'router%d' % i,
+                      'tenant_id': 'tenant',
+                      'admin_state_up': True}
+            if self.distributed:
+                router['distributed'] = True
+            router_id = self.l3_plugin.create_router(
+                self.ctx, {'router': router})['id']
+            self.l3_plugin.update_router(
+                self.ctx, router_id,
+                {'router': {'external_gateway_info': {
+                    'network_id': self.ext_net_id}}})
+            for j in range(2):
+                net_id, subnet_id = self._create_network_with_subnet(
+                    '10.%d.%d.0/24' % (i, j))
+                self.l3_plugin.add_router_interface(
+                    self.ctx, router_id, {'subnet_id': subnet_id})
+            port = {'network_id': net_id,
+                    'tenant_id': 'tenant',
+                    'name': 'vm',
+                    'admin_state_up': True,
+                    'device_id': 'vm%d' % i,
+                    'device_owner': 'compute:nova',
+                    'mac_address': attributes.ATTR_NOT_SPECIFIED,
+                    'fixed_ips': [{'subnet_id': subnet_id}]}
+            if self.distributed:
+                port[portbindings.HOST_ID] = HOST
+            port_id = self.core_plugin.create_port(
+                self.ctx, {'port': port})['id']
+            self.l3_plugin.create_floatingip(
+                self.ctx, {'floatingip': {
+                    'floating_network_id': self.ext_net_id,
+                    'tenant_id': 'tenant',
+                    'port_id': port_id}})
+            router_ids.append(router_id)
+        return router_ids
+
+    def _get_sync_data(self, router_ids):
+        self.statements = []
+        start = time.time()
+        routers = self.l3_plugin.get_sync_data(self.ctx, router_ids)
+        LOG.info(_("Built sync data of %(count)d routers with %(queries)d "
+                   "queries in %(elapsed).3f seconds"),
+                 {'count': len(routers), 'queries': len(self.statements),
+                  'elapsed': time.time() - start})
+        return routers, len(self.statements)
+
+    def test_get_sync_data_query_count_is_constant(self):
+        router_ids = self._create_routers(0, 2)
+        routers, small_count = self._get_sync_data(router_ids)
+        self.assertEqual(2, len(routers))
+
+        router_ids += self._create_routers(2, 8)
+        routers, large_count = self._get_sync_data(router_ids)
+        self.assertEqual(10, len(routers))
+        for router in routers:
+            self.assertEqual(2, len(router[constants.INTERFACE_KEY]))
+            self.assertEqual(1, len(router[constants.FLOATINGIP_KEY]))
+            self.assertIn('subnet', router['gw_port'])
+        self.assertEqual(small_count, large_count)
+
+
+class TestL3GetSyncDataQueries(test_l3_plugin.L3BaseForIntTests,
+                               L3GetSyncDataQueriesMixin):
+
+    def setUp(self):
+        super(TestL3GetSyncDataQueries, self).setUp()
+        self._setup_query_count()
+
+
+class TestL3DvrGetSyncDataQueries(test_db_plugin.NeutronDbPluginV2TestCase,
+                                  L3GetSyncDataQueriesMixin):
+
+    distributed = True
+
+    def setUp(self):
+        config.cfg.CONF.set_override('mechanism_drivers', ['logger'],
+                                     group='ml2')
+        service_plugins = {
+            'l3_plugin_name': 'neutron.services.l3_router.'
+                              'l3_router_plugin.L3RouterPlugin'}
+        super(TestL3DvrGetSyncDataQueries, self).setUp(
+            plugin='neutron.plugins.ml2.plugin.Ml2Plugin',
+            service_plugins=service_plugins)
+        self._setup_query_count()
+        for host, agent_mode in ((HOST, 'dvr'), ('network1', 'dvr_snat')):
+            agents_db.AgentExtRpcCallback().report_state(
+                self.ctx,
+                agent_state={'agent_state': {
+                    'binary': 'neutron-l3-agent',
+                    'host': host,
+                    'topic': topics.L3_AGENT,
+                    'configurations': {'agent_mode': agent_mode},
+                    'agent_type': constants.AGENT_TYPE_L3}},
+                time=timeutils.strtime())
+
+    def test_get_sync_data_floatingip_host(self):
+        self._create_routers(0, 2)
+        for router in self.l3_plugin.get_sync_data(self.ctx):
+            self.assertEqual(HOST, router[constants.FLOATINGIP_KEY][0]['host'])
+            self.assertIn(constants.SNAT_ROUTER_INTF_KEY, router)
@@ -0,0 +1,78 @@
+# Copyright (c) 2014 OpenStack Foundation.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+
+import sqlalchemy
+
+from neutron import context
+from neutron.db import api as db_api
+from neutron import manager
+from neutron.openstack.common import log as logging
+from neutron.tests.unit.ml2 import test_ml2_plugin
+
+LOG = logging.getLogger(__name__)
+
+
+class TestMl2GetNetworksQueries(test_ml2_plugin.Ml2PluginV2TestCase):
+    """Check the number of queries issued when listing ML2 networks.
+
+    Listing networks must not issue queries per network, so the query
+    count for a small and a larger set of networks has to be the same.
+    The time taken to list the networks is logged as a benchmark.
+    """
+
+    def setUp(self):
+        super(TestMl2GetNetworksQueries, self).setUp()
+        self.plugin = manager.NeutronManager.get_plugin()
+        self.ctx = context.get_admin_context()
+        self.statements = []
+        engine = db_api.get_engine()
+        sqlalchemy.event.listen(engine, 'before_cursor_execute',
+                                self._count_statement)
+        self.addCleanup(sqlalchemy.event.remove, engine,
+                        'before_cursor_execute', self._count_statement)
+
+    def _count_statement(self, conn, cursor, statement, parameters,
+                         context, executemany):
+        self.statements.append(statement)
+
+    def _create_networks(self, count):
+        for i in range(count):
+            self.plugin.create_network(
+                self.ctx, {'network': {'name': 'net%d' % i,
+                                       'tenant_id': 'tenant',
+                                       'admin_state_up': True,
+                                       'shared': False}})
+
+    def _list_networks(self):
+        self.statements = []
+        start = time.time()
+        nets = self.plugin.get_networks(self.ctx)
+        LOG.info(_("Listed %(count)d networks with %(queries)d queries "
+                   "in %(elapsed).3f seconds"),
+                 {'count': len(nets), 'queries': len(self.statements),
+                  'elapsed': time.time() - start})
+        return nets, len(self.statements)
+
+    def test_get_networks_query_count_is_constant(self):
+        self._create_networks(2)
+        nets, small_count = self._list_networks()
+        self.assertEqual(2, len(nets))
+
+        self._create_networks(48)
+        nets, large_count = self._list_networks()
+        self.assertEqual(50, len(nets))
+        self.assertEqual(small_count, large_count)
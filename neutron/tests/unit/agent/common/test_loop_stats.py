@@ -0,0 +1,128 @@
+# Copyright 2014 OpenStack Foundation.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+
+import fixtures
+import mock
+
+from neutron.agent.common import loop_stats
+from neutron.agent.linux import utils
+from neutron.openstack.common import jsonutils
+from neutron.tests import base
+
+
+class TestIterationStats(base.BaseTestCase):
+
+    def test_phases_are_summed(self):
+        stats = loop_stats.IterationStats(1)
+        with mock.patch('time.time', side_effect=[10, 11, 20, 22]):
+            with stats.phase('scan_ports'):
+                pass
+            with stats.phase('scan_ports'):
+                pass
+        self.assertEqual(3, stats.phases['scan_ports'])
+
+    def test_phase_recorded_on_exception(self):
+        stats = loop_stats.IterationStats(1)
+        with mock.patch('time.time', side_effect=[10, 11]):
+            try:
+                with stats.phase('scan_ports'):
+                    raise ValueError()
+            except ValueError:
+                pass
+        self.assertEqual(1, stats.phases['scan_ports'])
+
+    def test_to_dict_splits_rpc_latencies(self):
+        stats = loop_stats.IterationStats(3)
+        stats.phases['scan_ports'] = 1.0
+        stats.phases['rpc_get_devices_details_list'] = 2.0
+        stats.incr('resyncs')
+        result = stats.to_dict()
+        self.assertEqual(3, result['iteration'])
+        self.assertEqual({'scan_ports': 1.0}, result['phases'])
+        self.assertEqual({'get_devices_details_list': 2.0}, result['rpc'])
+        self.assertEqual({'resyncs': 1}, result['counters'])
+
+    def test_finish_counts_subprocesses(self):
+        with mock.patch.object(utils, 'get_process_count',
+                               side_effect=[5, 9]):
+            stats = loop_stats.IterationStats(1)
+            stats.finish()
+        self.assertEqual(4, stats.counters['subprocesses'])
+
+
+class TestLoopStatsCollector(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestLoopStatsCollector, self).setUp()
+        self.tempdir = self.useFixture(fixtures.TempDir()).path
+
+    def _run_iteration(self, collector, iter_num, elapsed=None):
+        stats = collector.start_iteration(iter_num)
+        stats.incr('ports', iter_num)
+        if elapsed is None:
+            return collector.finish_iteration()
+        with mock.patch('time.time', return_value=stats.start + elapsed):
+            return collector.finish_iteration()
+
+    def test_outside_iteration_is_noop(self):
+        collector = loop_stats.LoopStatsCollector('test')
+        with collector.current.phase('scan_ports'):
+            pass
+        collector.current.incr('ports')
+        self.assertIsNone(collector.finish_iteration())
+        self.assertEqual(0, len(collector.history))
+
+    def test_history_is_bounded(self):
+        collector = loop_stats.LoopStatsCollector('test', history_size=2)
+        for i in range(3):
+            self._run_iteration(collector, i)
+        self.assertEqual([1, 2], [s.iter_num for s in collector.history])
+
+    def test_stats_file_written(self):
+        stats_file = os.path.join(self.tempdir, 'stats')
+        collector = loop_stats.LoopStatsCollector('test',
+                                                  stats_file=stats_file)
+        self._run_iteration(collector, 1)
+        self._run_iteration(collector, 2)
+        with open(stats_file) as f:
+            lines = [jsonutils.loads(line) for line in f]
+        self.assertEqual([1, 2], [line['iteration'] for line in lines])
+        self.assertEqual(2, lines[1]['counters']['ports'])
+
+    def test_stats_file_error_is_logged(self):
+        stats_file = os.path.join(self.tempdir, 'missing', 'stats')
+        collector = loop_stats.LoopStatsCollector('test',
+                                                  stats_file=stats_file)
+        with mock.patch.object(loop_stats.LOG, 'warning') as warn:
+            self._run_iteration(collector, 1)
+        self.assertTrue(warn.called)
+
+    def test_profiling_requires_directory(self):
+        collector = loop_stats.LoopStatsCollector('test', profile_slowest=2)
+        self.assertEqual(0, collector.profile_slowest)
+        self._run_iteration(collector, 1)
+        self.assertEqual([], collector.slowest_profiles)
+
+    def test_slowest_profiles_kept(self):
+        collector = loop_stats.LoopStatsCollector(
+            'test', profile_slowest=2, profile_dir=self.tempdir)
+        for iter_num, elapsed in [(1, 3), (2, 1), (3, 5), (4, 2)]:
+            self._run_iteration(collector, iter_num, elapsed)
+        expected = [os.path.join(self.tempdir, 'test-%d.prof' % i)
+                    for i in (3, 1)]
+        self.assertEqual(expected, collector.slowest_profiles)
+        self.assertEqual(['test-1.prof', 'test-3.prof'],
+                         sorted(os.listdir(self.tempdir)))
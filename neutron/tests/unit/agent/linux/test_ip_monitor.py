@@ -0,0 +1,91 @@
+# Copyright 2014 OpenStack Foundation.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet.event
+import mock
+
+from neutron.agent.linux import ip_monitor
+from neutron.tests import base
+
+
+class TestParseLinkEvent(base.BaseTestCase):
+
+    def test_parse_new_link(self):
+        line = ('5: tap0a1b2c3d-4e: <BROADCAST,MULTICAST,UP,LOWER_UP> '
+                'mtu 1500 qdisc pfifo_fast state UP')
+        self.assertEqual('tap0a1b2c3d-4e', ip_monitor.parse_link_event(line))
+
+    def test_parse_deleted_link(self):
+        line = 'Deleted 5: tap0a1b2c3d-4e: <BROADCAST,MULTICAST> mtu 1500'
+        self.assertEqual('tap0a1b2c3d-4e', ip_monitor.parse_link_event(line))
+
+    def test_parse_link_with_peer(self):
+        line = '[LINK]7: vxlan-100@NONE: <BROADCAST,MULTICAST> mtu 1450'
+        self.assertEqual('vxlan-100', ip_monitor.parse_link_event(line))
+
+    def test_parse_garbage_returns_none(self):
+        self.assertIsNone(ip_monitor.parse_link_event('link/ether'))
+
+
+class TestSimpleLinkMonitor(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestSimpleLinkMonitor, self).setUp()
+        self.monitor = ip_monitor.SimpleLinkMonitor('tap')
+
+    def _read_stdout(self, output):
+        with mock.patch.object(self.monitor, '_process') as mock_process:
+            mock_process.stdout.readline.return_value = output
+            return self.monitor._read_stdout()
+
+    def test_is_active_is_false_by_default(self):
+        self.assertFalse(self.monitor.is_active)
+
+    def test_is_active_can_be_true(self):
+        self.monitor._kill_event = eventlet.event.Event()
+        self.assertTrue(self.monitor.is_active)
+
+    def test_has_updates_is_true_by_default(self):
+        self.assertTrue(self.monitor.has_updates)
+
+    def test_has_updates_is_false_if_active_with_no_output(self):
+        self.monitor._kill_event = eventlet.event.Event()
+        self.assertFalse(self.monitor.has_updates)
+
+    def test__read_stdout_returns_none_for_empty_read(self):
+        self.assertIsNone(self._read_stdout(''))
+
+    def test__read_stdout_queues_matching_device(self):
+        self._read_stdout('5: tap1: <BROADCAST> mtu 1500\n')
+        self.assertEqual('tap1', self.monitor._stdout_lines.get_nowait())
+
+    def test__read_stdout_ignores_other_devices(self):
+        output = '5: eth1: <BROADCAST> mtu 1500\n'
+        self.assertEqual(output, self._read_stdout(output))
+        self.assertTrue(self.monitor._stdout_lines.empty())
+
+    def test_has_updates_consumes_output(self):
+        self.monitor._kill_event = eventlet.event.Event()
+        self._read_stdout('5: tap1: <BROADCAST> mtu 1500\n')
+        self.assertTrue(self.monitor.has_updates)
+        self.assertFalse(self.monitor.has_updates)
+
+    def test_wait_for_updates_keeps_output_queued(self):
+        self.monitor._kill_event = eventlet.event.Event()
+        self._read_stdout('5: tap1: <BROADCAST> mtu 1500\n')
+        self.assertTrue(self.monitor.wait_for_updates(0.01))
+        self.assertTrue(self.monitor.has_updates)
+
+    def test_wait_for_updates_times_out(self):
+        self.assertFalse(self.monitor.wait_for_updates(0.01))
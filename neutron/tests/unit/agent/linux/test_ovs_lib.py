@@ -512,6 +512,47 @@ class OVS_Lib_Test(base.BaseTestCase):
 
         tools.verify_mock_calls(self.execute, expected_calls_and_values)
 
+    def test_add_tunnel_ports(self):
+        local_ip = "1.1.1.1"
+        tunnels = [("gre-1", "9.9.9.9"), ("gre-2", "9.9.9.10")]
+        command = ["ovs-vsctl", self.TO]
+        for pname, remote_ip in tunnels:
+            command.extend(['--', "--may-exist", "add-port",
+                            self.BR_NAME, pname])
+            command.extend(["--", "set", "Interface", pname])
+            command.extend(["type=gre", "options:df_default=true",
+                            "options:remote_ip=" + remote_ip,
+                            "options:local_ip=" + local_ip,
+                            "options:in_key=flow",
+                            "options:out_key=flow"])
+        # Each element is a tuple of (expected mock call, return_value)
+        expected_calls_and_values = [
+            (mock.call(command, root_helper=self.root_helper), None),
+            (mock.call(["ovs-vsctl", self.TO,
+                        "--", "get", "Interface", "gre-1", "ofport",
+                        "--", "get", "Interface", "gre-2", "ofport"],
+                       root_helper=self.root_helper),
+             "6\n[]\n"),
+        ]
+        tools.setup_mock_calls(self.execute, expected_calls_and_values)
+
+        self.assertEqual(
+            {"gre-1": "6", "gre-2": ovs_lib.INVALID_OFPORT},
+            self.br.add_tunnel_ports(tunnels, local_ip))
+
+        tools.verify_mock_calls(self.execute, expected_calls_and_values)
+
+    def test_add_tunnel_ports_empty(self):
+        self.assertEqual({}, self.br.add_tunnel_ports([], "1.1.1.1"))
+        self.assertFalse(self.execute.called)
+
+    def test_get_ports_ofport_command_failure(self):
+        self.execute.side_effect = RuntimeError()
+        self.assertEqual(
+            {"gre-1": ovs_lib.INVALID_OFPORT,
+             "gre-2": ovs_lib.INVALID_OFPORT},
+            self.br.get_ports_ofport(["gre-1", "gre-2"]))
+
     def test_add_patch_port(self):
         pname = "tap99"
         peer = "bar10"
@@ -115,3 +115,77 @@ class TestInterfacePollingMinimizer(base.BaseTestCase):
     def test__is_polling_required_returns_when_updates_are_present(self):
         with self.mock_has_updates(True):
             self.assertTrue(self.pm._is_polling_required())
+
+
+class TestGetDevicePollingManager(base.BaseTestCase):
+
+    def test_return_always_poll_by_default(self):
+        with polling.get_device_polling_manager('tap') as pm:
+            self.assertEqual(pm.__class__, polling.AlwaysPoll)
+
+    def test_manage_device_polling_minimizer(self):
+        mock_target = 'neutron.agent.linux.polling.DevicePollingMinimizer'
+        with mock.patch('%s.start' % mock_target) as mock_start:
+            with mock.patch('%s.stop' % mock_target) as mock_stop:
+                with polling.get_device_polling_manager(
+                        'tap', minimize_polling=True) as pm:
+                    self.assertEqual(pm._monitor.device_prefix, 'tap')
+                    self.assertEqual(pm.__class__,
+                                     polling.DevicePollingMinimizer)
+                mock_stop.assert_has_calls(mock.call())
+            mock_start.assert_has_calls(mock.call())
+
+
+class TestDevicePollingMinimizer(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestDevicePollingMinimizer, self).setUp()
+        self.pm = polling.DevicePollingMinimizer('tap', resync_interval=60)
+
+    def test_start_calls_monitor_start(self):
+        with mock.patch.object(self.pm._monitor, 'start') as mock_start:
+            self.pm.start()
+        mock_start.assert_called_with()
+
+    def test_stop_calls_monitor_stop(self):
+        with mock.patch.object(self.pm._monitor, 'stop') as mock_stop:
+            self.pm.stop()
+        mock_stop.assert_called_with()
+
+    def test_wait_for_updates_calls_monitor(self):
+        with mock.patch.object(self.pm._monitor,
+                               'wait_for_updates') as mock_wait:
+            self.pm.wait_for_updates(2)
+        mock_wait.assert_called_with(2)
+
+    def mock_has_updates(self, return_value):
+        target = ('neutron.agent.linux.ip_monitor.SimpleLinkMonitor'
+                  '.has_updates')
+        return mock.patch(
+            target,
+            new_callable=mock.PropertyMock(return_value=return_value),
+        )
+
+    def test__is_polling_required_returns_when_updates_are_present(self):
+        with self.mock_has_updates(True):
+            self.assertTrue(self.pm._is_polling_required())
+
+    def test__is_polling_required_false_without_updates(self):
+        with self.mock_has_updates(False):
+            self.assertFalse(self.pm._is_polling_required())
+
+    def test__is_polling_required_true_when_resync_is_due(self):
+        self.pm._last_polling -= 61
+        with self.mock_has_updates(False):
+            self.assertTrue(self.pm._is_polling_required())
+
+    def test_polling_completed_resets_resync_timer(self):
+        self.pm._last_polling -= 61
+        self.pm.polling_completed()
+        with self.mock_has_updates(False):
+            self.assertFalse(self.pm._is_polling_required())
+
+    def test_resync_disabled(self):
+        pm = polling.DevicePollingMinimizer('tap', resync_interval=0)
+        pm._last_polling -= 3600
+        self.assertFalse(pm._resync_required())
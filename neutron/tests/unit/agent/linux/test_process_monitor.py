@@ -97,3 +97,60 @@ class TestProcessMonitor(BaseTestProcessMonitor):
 
     def test_pid_method_unknown_uuid(self):
         self.assertFalse(self.pmonitor.get_pid('bad-uuid'))
+
+    def _set_pid(self, pm, pid, active_pids):
+        pid_property = mock.PropertyMock(return_value=pid)
+        type(pm).pid = pid_property
+        pm.is_active_pid.side_effect = lambda p: p in active_pids
+        pm.active = pid in active_pids
+        return pid_property
+
+    def test_check_uses_last_known_pid(self):
+        pm = self.get_monitored_process_manager(TEST_UUID)
+        pid_property = self._set_pid(pm, TEST_PID, [TEST_PID])
+
+        self.pmonitor._check_child_processes()
+        self.pmonitor._check_child_processes()
+
+        self.assertEqual(1, pid_property.call_count)
+        self.assertFalse(self.error_log.called)
+
+    def test_check_rereads_pid_of_restarted_process(self):
+        pm = self.get_monitored_process_manager(TEST_UUID)
+        self._set_pid(pm, TEST_PID, [TEST_PID])
+        self.pmonitor._check_child_processes()
+
+        self._set_pid(pm, TEST_PID + 1, [TEST_PID + 1])
+        self.pmonitor._check_child_processes()
+
+        self.assertFalse(self.error_log.called)
+        self.assertEqual(
+            TEST_PID + 1,
+            self.pmonitor._pids[external_process.ServiceId(TEST_UUID, None)])
+
+    def test_check_with_manager_disabled_during_check(self):
+        pm1 = self.get_monitored_process_manager(TEST_UUID)
+        pm2 = self.get_monitored_process_manager(TEST_UUID, TEST_SERVICE1)
+        pm1.active = False
+        pm2.active = False
+
+        def disable_others(service_id):
+            for other in list(self.pmonitor._process_managers):
+                if other != service_id:
+                    self.pmonitor.disable(other.uuid, service=other.service)
+
+        with mock.patch.object(self.pmonitor, '_execute_action') as action:
+            action.side_effect = disable_others
+            self.pmonitor._check_child_processes()
+            self.assertEqual(1, action.call_count)
+
+    def test_statistics(self):
+        pm = self.get_monitored_process_manager(TEST_UUID)
+        pm.active = False
+        self.pmonitor._check_child_processes()
+
+        stats = self.pmonitor.get_statistics()
+        self.assertEqual(1, stats['processes'])
+        self.assertEqual(1, stats['respawns'])
+        self.assertEqual(stats['last_check_duration'],
+                         stats['max_check_duration'])
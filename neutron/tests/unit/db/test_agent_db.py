@@ -13,7 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
 import mock
+from oslo.config import cfg
 from oslo.db import exception as exc
 
 from neutron.common import constants
@@ -111,3 +114,119 @@ class TestAgentsDbMixin(testlib_api.SqlTestCase):
 
             self.assertEqual(add_mock.call_count, 2,
                              "Agent entry creation hasn't been retried")
+
+    def test_create_or_update_agent_keeps_unchanged_configurations(self):
+        self.agent_status['configurations'] = {'devices': 1}
+        self.plugin.create_or_update_agent(self.context, self.agent_status)
+        agent_db = self.plugin.get_agents_db(self.context)[0]
+        with mock.patch.object(agent_db, 'update') as update:
+            self.plugin.create_or_update_agent(self.context,
+                                               self.agent_status)
+        self.assertNotIn('configurations', update.call_args[0][0])
+
+    def test_update_agents_heartbeat(self):
+        self._add_agent('id1', constants.AGENT_TYPE_L3, 'host1')
+        self._add_agent('id2', constants.AGENT_TYPE_DHCP, 'host1')
+        self._add_agent('id3', constants.AGENT_TYPE_L3, 'host2')
+        ts = timeutils.utcnow().replace(microsecond=0)
+        heartbeats = {(constants.AGENT_TYPE_L3, 'host1'): ts,
+                      (constants.AGENT_TYPE_DHCP, 'host1'): ts}
+        self.plugin.update_agents_heartbeat(self.context, heartbeats)
+        self.context.session.expire_all()
+        agents = dict((a.id, a) for a in
+                      self.plugin.get_agents_db(self.context))
+        self.assertEqual(ts, agents['id1'].heartbeat_timestamp)
+        self.assertEqual(ts, agents['id2'].heartbeat_timestamp)
+        self.assertNotEqual(ts, agents['id3'].heartbeat_timestamp)
+
+
+class TestAgentExtRpcCallback(testlib_api.SqlTestCase):
+    def setUp(self):
+        super(TestAgentExtRpcCallback, self).setUp()
+        self.plugin = mock.Mock()
+        self.context = context.get_admin_context()
+        self.agent_state = {
+            'agent_type': constants.AGENT_TYPE_L3,
+            'binary': 'neutron-l3-agent',
+            'host': 'host1',
+            'topic': 'N/A',
+            'configurations': {'routers': 1}
+        }
+        self.looping_call = mock.patch(
+            'neutron.openstack.common.loopingcall.'
+            'FixedIntervalLoopingCall').start()
+
+    def _get_callback(self, flush_interval):
+        self.config(agent_heartbeat_flush_interval=flush_interval)
+        return agents_db.AgentExtRpcCallback(self.plugin)
+
+    def _report_state(self, callback, **kwargs):
+        self.agent_state.update(kwargs)
+        callback.report_state(self.context,
+                              agent_state={'agent_state': self.agent_state},
+                              time=timeutils.strtime())
+
+    def test_report_state_writes_through_by_default(self):
+        callback = self._get_callback(0)
+        self._report_state(callback)
+        self._report_state(callback)
+        self.assertEqual(2, self.plugin.create_or_update_agent.call_count)
+        self.assertFalse(self.looping_call.called)
+
+    def test_unchanged_state_is_deferred(self):
+        callback = self._get_callback(10)
+        self.looping_call.return_value.start.assert_called_once_with(
+            interval=10)
+        self._report_state(callback)
+        self._report_state(callback)
+        self._report_state(callback)
+        self.assertEqual(1, self.plugin.create_or_update_agent.call_count)
+        self.assertIn((constants.AGENT_TYPE_L3, 'host1'),
+                      callback._pending_heartbeats)
+
+    def test_changed_configurations_are_written(self):
+        callback = self._get_callback(10)
+        self._report_state(callback)
+        self._report_state(callback)
+        self._report_state(callback, configurations={'routers': 2})
+        self.assertEqual(2, self.plugin.create_or_update_agent.call_count)
+        # The deferred heartbeat is older than the one just written
+        self.assertEqual({}, callback._pending_heartbeats)
+
+    def test_start_flag_is_written(self):
+        callback = self._get_callback(10)
+        self._report_state(callback)
+        self._report_state(callback, start_flag=True)
+        self.assertEqual(2, self.plugin.create_or_update_agent.call_count)
+
+    def test_state_is_rewritten_after_agent_down_time(self):
+        callback = self._get_callback(10)
+        self._report_state(callback)
+        key = (constants.AGENT_TYPE_L3, 'host1')
+        configurations, written_at = callback._reported_agents[key]
+        callback._reported_agents[key] = (
+            configurations,
+            written_at - datetime.timedelta(
+                seconds=cfg.CONF.agent_down_time + 1))
+        self._report_state(callback)
+        self.assertEqual(2, self.plugin.create_or_update_agent.call_count)
+
+    def test_flush_heartbeats(self):
+        callback = self._get_callback(10)
+        self._report_state(callback)
+        self._report_state(callback)
+        pending = callback._pending_heartbeats
+        callback._flush_heartbeats()
+        self.plugin.update_agents_heartbeat.assert_called_once_with(
+            mock.ANY, pending)
+        self.assertEqual({}, callback._pending_heartbeats)
+
+    def test_flush_heartbeats_failure_keeps_heartbeats(self):
+        callback = self._get_callback(10)
+        self._report_state(callback)
+        self._report_state(callback)
+        pending = dict(callback._pending_heartbeats)
+        self.plugin.update_agents_heartbeat.side_effect = RuntimeError()
+        with mock.patch.object(agents_db.LOG, 'exception'):
+            callback._flush_heartbeats()
+        self.assertEqual(pending, callback._pending_heartbeats)
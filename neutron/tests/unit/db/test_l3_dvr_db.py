@@ -15,11 +15,16 @@
 
 import contextlib
 import mock
+from oslo.config import cfg
 
 from neutron.common import constants as l3_const
+from neutron.common import exceptions as n_exc
 from neutron import context
+from neutron.db import agents_db
 from neutron.db import l3_dvr_db
+from neutron.db import models_v2
 from neutron import manager
+from neutron.openstack.common import timeutils
 from neutron.openstack.common import uuidutils
 from neutron.tests.unit import testlib_api
 
@@ -175,6 +180,84 @@ class L3DvrTestCase(testlib_api.SqlTestCase):
         routers = self.mixin._build_routers_list(self.ctx, routers, gw_ports)
         self.assertIsNone(routers[0].get('gw_port'))
 
+    def test__process_routers_fetches_snat_interfaces_once(self):
+        routers = [{'id': 'r1', 'gw_port_id': 'gw1'},
+                   {'id': 'r2', 'gw_port_id': None},
+                   {'id': 'r3', 'gw_port_id': 'gw3'}]
+        snat_intf = {'id': 'p1', 'device_id': 'r1'}
+        with mock.patch.object(self.mixin,
+                               'get_snat_sync_interfaces') as gssi:
+            gssi.return_value = [snat_intf]
+            routers_dict = self.mixin._process_routers(self.ctx, routers)
+            gssi.assert_called_once_with(self.ctx, ['r1', 'r3'])
+            self.assertEqual([snat_intf],
+                             routers_dict['r1'][l3_const.SNAT_ROUTER_INTF_KEY])
+            self.assertEqual([],
+                             routers_dict['r3'][l3_const.SNAT_ROUTER_INTF_KEY])
+            self.assertNotIn(l3_const.SNAT_ROUTER_INTF_KEY,
+                             routers_dict['r2'])
+
+    def _create_l3_agent(self, host):
+        now = timeutils.utcnow()
+        agent = agents_db.Agent(agent_type=l3_const.AGENT_TYPE_L3,
+                                binary='neutron-l3-agent',
+                                topic='l3_agent',
+                                host=host,
+                                admin_state_up=True,
+                                created_at=now,
+                                started_at=now,
+                                heartbeat_timestamp=now,
+                                configurations='{}')
+        with self.ctx.session.begin(subtransactions=True):
+            self.ctx.session.add(agent)
+        return agent
+
+    def test__get_l3_agents_by_host(self):
+        agent1 = self._create_l3_agent('host1')
+        agent2 = self._create_l3_agent('host2')
+        self._create_l3_agent('host3')
+        self.mixin._get_agent_by_type_and_host = mock.Mock()
+        agents = self.mixin._get_l3_agents_by_host(self.ctx,
+                                                   set(['host1', 'host2']))
+        self.assertEqual({'host1': agent1.id, 'host2': agent2.id},
+                         dict((host, agent.id)
+                              for host, agent in agents.items()))
+        self.assertFalse(self.mixin._get_agent_by_type_and_host.called)
+
+    def test__get_l3_agents_by_host_unknown_host(self):
+        self.mixin._get_agent_by_type_and_host = mock.Mock(
+            side_effect=n_exc.NotFound)
+        self.assertRaises(n_exc.NotFound, self.mixin._get_l3_agents_by_host,
+                          self.ctx, set(['host1']))
+        self.mixin._get_agent_by_type_and_host.assert_called_once_with(
+            self.ctx, l3_const.AGENT_TYPE_L3, 'host1')
+
+    def test__process_floating_ips(self):
+        routers_dict = {'r1': {'distributed': True},
+                        'r2': {'distributed': True},
+                        'r3': {'distributed': False}}
+        fips = [{'id': 'f1', 'router_id': 'r1', 'host': 'host1'},
+                {'id': 'f2', 'router_id': 'r2', 'host': 'host1'},
+                {'id': 'f3', 'router_id': 'r3', 'host': 'host2'}]
+        fip_intf = {'id': 'p1', 'device_id': 'agent1'}
+        with contextlib.nested(
+            mock.patch.object(self.mixin, '_get_l3_agents_by_host'),
+            mock.patch.object(self.mixin, '_get_fip_sync_interfaces')
+        ) as (glabh, gfsi):
+            glabh.return_value = {'host1': {'id': 'agent1'}}
+            gfsi.return_value = [fip_intf]
+            self.mixin._process_floating_ips(self.ctx, routers_dict, fips)
+
+            glabh.assert_called_once_with(self.ctx, set(['host1']))
+            gfsi.assert_called_once_with(self.ctx, ['agent1'])
+            for router_id, fip, intfs in (('r1', fips[0], [fip_intf]),
+                                          ('r2', fips[1], [fip_intf]),
+                                          ('r3', fips[2], [])):
+                router = routers_dict[router_id]
+                self.assertEqual([fip], router[l3_const.FLOATINGIP_KEY])
+                self.assertEqual(
+                    intfs, router[l3_const.FLOATINGIP_AGENT_INTF_KEY])
+
     def test_clear_unused_fip_agent_gw_port(self):
         floatingip = {
             'id': _uuid(),
@@ -231,3 +314,66 @@ class L3DvrTestCase(testlib_api.SqlTestCase):
         }
         mock_fip_clear = self._delete_floatingip_test_setup(floatingip)
         self.assertTrue(mock_fip_clear.called)
+
+    def _setup_dvr_subnet(self, distributed=True):
+        router = self._create_router({'name': 'foo_router',
+                                      'admin_state_up': True,
+                                      'distributed': distributed})
+        network_id, subnet_id, port_id = _uuid(), _uuid(), _uuid()
+        with self.ctx.session.begin(subtransactions=True):
+            self.ctx.session.add(models_v2.Network(id=network_id))
+            self.ctx.session.add(models_v2.Subnet(
+                id=subnet_id, network_id=network_id, ip_version=4,
+                cidr='10.0.0.0/24'))
+            self.ctx.session.add(models_v2.Port(
+                id=port_id, network_id=network_id,
+                mac_address='fa:16:3e:00:00:01', admin_state_up=True,
+                status='ACTIVE', device_id=router['id'],
+                device_owner=l3_const.DEVICE_OWNER_DVR_INTERFACE))
+            self.ctx.session.add(models_v2.IPAllocation(
+                port_id=port_id, ip_address='10.0.0.1',
+                subnet_id=subnet_id, network_id=network_id))
+        return router['id'], subnet_id
+
+    def test__get_dvr_router_id_for_subnet(self):
+        router_id, subnet_id = self._setup_dvr_subnet()
+        self.assertEqual(router_id,
+                         self.mixin._get_dvr_router_id_for_subnet(
+                             self.ctx, subnet_id))
+        self.assertIsNone(self.mixin._get_dvr_router_id_for_subnet(
+            self.ctx, _uuid()))
+
+    def test__get_dvr_router_id_for_subnet_centralized(self):
+        router_id, subnet_id = self._setup_dvr_subnet(distributed=False)
+        self.assertIsNone(self.mixin._get_dvr_router_id_for_subnet(
+            self.ctx, subnet_id))
+
+    def _test_dvr_vmarp_table_update(self, action, interval=0):
+        router_id, subnet_id = self._setup_dvr_subnet()
+        cfg.CONF.set_override('dvr_arp_update_interval', interval)
+        vm_port = {'device_owner': 'compute:nova',
+                   'mac_address': 'fa:16:3e:00:00:02',
+                   'fixed_ips': [{'ip_address': '10.0.0.2',
+                                  'subnet_id': subnet_id}]}
+        arp_table = {'ip_address': '10.0.0.2',
+                     'mac_address': 'fa:16:3e:00:00:02',
+                     'subnet_id': subnet_id}
+        self.mixin.l3_rpc_notifier = mock.Mock()
+        with mock.patch.object(manager.NeutronManager, 'get_plugin') as gp:
+            gp.return_value._get_port.return_value = vm_port
+            self.mixin.dvr_vmarp_table_update(self.ctx, 'port_id', action)
+        return self.mixin.l3_rpc_notifier, router_id, arp_table
+
+    def test_dvr_vmarp_table_update_add(self):
+        notifier, router_id, arp_table = self._test_dvr_vmarp_table_update(
+            'add')
+        notifier.add_arp_entry.assert_called_once_with(
+            self.ctx, router_id, arp_table)
+        self.assertFalse(notifier.queue_arp_entry.called)
+
+    def test_dvr_vmarp_table_update_del_batched(self):
+        notifier, router_id, arp_table = self._test_dvr_vmarp_table_update(
+            'del', interval=2)
+        notifier.queue_arp_entry.assert_called_once_with(
+            self.ctx, router_id, arp_table, 'delete', 2)
+        self.assertFalse(notifier.del_arp_entry.called)
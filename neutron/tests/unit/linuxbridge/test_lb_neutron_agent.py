@@ -340,6 +340,58 @@ class TestLinuxBridgeAgent(base.BaseTestCase):
         agent.remove_port_binding.assert_called_with('net123', 'port123')
         self.assertFalse(agent.plugin_rpc.update_device_up.called)
 
+    def _run_device_loop(self, polling_manager, iterations=2):
+        self.agent.polling_interval = 2
+        polling_manager.wait_for_updates.side_effect = (
+            [None] * (iterations - 1) + [RuntimeError()])
+        with contextlib.nested(
+            mock.patch.object(self.agent, 'scan_devices',
+                              return_value={'added': set(),
+                                            'updated': set(),
+                                            'removed': set(),
+                                            'current': set()}),
+            mock.patch.object(self.agent, 'process_network_devices')
+        ) as (scan_devices, process_network_devices):
+            self.assertRaises(RuntimeError, self.agent.device_loop,
+                              polling_manager)
+        return scan_devices
+
+    def test_device_loop_scans_only_when_polling_required(self):
+        pm = mock.Mock()
+        type(pm).is_polling_required = mock.PropertyMock(return_value=False)
+        scan_devices = self._run_device_loop(pm, iterations=3)
+        # Only the initial sync scans devices
+        scan_devices.assert_called_once_with(previous=None, sync=True)
+        self.assertEqual(1, pm.polling_completed.call_count)
+
+    def test_device_loop_scans_for_updated_devices(self):
+        pm = mock.Mock()
+        type(pm).is_polling_required = mock.PropertyMock(return_value=False)
+        self.agent.updated_devices = set(['tap1'])
+        scan_devices = self._run_device_loop(pm)
+        self.assertEqual(2, scan_devices.call_count)
+
+    def test_device_loop_waits_on_polling_manager(self):
+        pm = mock.Mock()
+        self._run_device_loop(pm, iterations=1)
+        self.assertTrue(pm.wait_for_updates.called)
+        self.assertTrue(0 < pm.wait_for_updates.call_args[0][0] <= 2)
+
+    def test_daemon_loop_uses_device_polling_manager(self):
+        self.agent.use_device_monitor = True
+        with contextlib.nested(
+            mock.patch('neutron.agent.linux.polling.'
+                       'get_device_polling_manager'),
+            mock.patch.object(self.agent, 'device_loop')
+        ) as (mock_get_pm, mock_loop):
+            self.agent.daemon_loop()
+        mock_get_pm.assert_called_with(
+            linuxbridge_neutron_agent.TAP_INTERFACE_PREFIX,
+            minimize_polling=True,
+            respawn_interval=lconst.DEFAULT_DEVICE_MONITOR_RESPAWN,
+            resync_interval=lconst.DEFAULT_DEVICE_RESYNC_INTERVAL)
+        mock_loop.assert_called_once_with(polling_manager=mock.ANY)
+
 
 class TestLinuxBridgeManager(base.BaseTestCase):
     def setUp(self):
@@ -19,7 +19,6 @@ import mock
 import webob.exc as wexc
 
 from neutron.api.v2 import base
-from neutron import context
 from neutron.extensions import portbindings
 from neutron import manager
 from neutron.openstack.common import log as logging
@@ -33,6 +32,7 @@ from neutron.plugins.ml2.drivers.cisco.nexus import mech_cisco_nexus
 from neutron.plugins.ml2.drivers.cisco.nexus import nexus_db_v2
 from neutron.plugins.ml2.drivers.cisco.nexus import nexus_network_driver
 from neutron.plugins.ml2.drivers import type_vlan as vlan_config
+from neutron.tests.unit.ml2 import test_ml2_plugin
 from neutron.tests.unit import test_db_plugin
 
 
@@ -235,6 +235,7 @@ class TestCiscoV2HTTPResponse(CiscoML2MechanismTestCase,
 
 
 class TestCiscoPortsV2(CiscoML2MechanismTestCase,
+                       test_ml2_plugin.Ml2BulkPortsTestMixin,
                        test_db_plugin.TestPortsV2):
 
     @contextlib.contextmanager
@@ -286,38 +287,6 @@ class TestCiscoPortsV2(CiscoML2MechanismTestCase,
             expected_http = wexc.HTTPInternalServerError.code
         self.assertEqual(status, expected_http)
 
-    def test_create_ports_bulk_emulated_plugin_failure(self):
-        real_has_attr = hasattr
-
-        #ensures the API chooses the emulation code path
-        def fakehasattr(item, attr):
-            if attr.endswith('__native_bulk_support'):
-                return False
-            return real_has_attr(item, attr)
-
-        with mock.patch('__builtin__.hasattr',
-                        new=fakehasattr):
-            plugin_obj = manager.NeutronManager.get_plugin()
-            orig = plugin_obj.create_port
-            with mock.patch.object(plugin_obj,
-                                   'create_port') as patched_plugin:
-
-                def side_effect(*args, **kwargs):
-                    return self._do_side_effect(patched_plugin, orig,
-                                                *args, **kwargs)
-
-                patched_plugin.side_effect = side_effect
-                with self.network() as net:
-                    res = self._create_port_bulk(self.fmt, 2,
-                                                 net['network']['id'],
-                                                 'test',
-                                                 True)
-                    # Expect an internal server error as we injected a fault
-                    self._validate_behavior_on_bulk_failure(
-                        res,
-                        'ports',
-                        wexc.HTTPInternalServerError.code)
-
     def test_create_ports_bulk_native(self):
         if self._skip_native_bulk:
             self.skipTest("Plugin does not support native bulk port create")
@@ -326,29 +295,6 @@ class TestCiscoPortsV2(CiscoML2MechanismTestCase,
         if self._skip_native_bulk:
             self.skipTest("Plugin does not support native bulk port create")
 
-    def test_create_ports_bulk_native_plugin_failure(self):
-        if self._skip_native_bulk:
-            self.skipTest("Plugin does not support native bulk port create")
-        ctx = context.get_admin_context()
-        with self.network() as net:
-            plugin_obj = manager.NeutronManager.get_plugin()
-            orig = plugin_obj.create_port
-            with mock.patch.object(plugin_obj,
-                                   'create_port') as patched_plugin:
-
-                def side_effect(*args, **kwargs):
-                    return self._do_side_effect(patched_plugin, orig,
-                                                *args, **kwargs)
-
-                patched_plugin.side_effect = side_effect
-                res = self._create_port_bulk(self.fmt, 2, net['network']['id'],
-                                             'test', True, context=ctx)
-                # We expect an internal server error as we injected a fault
-                self._validate_behavior_on_bulk_failure(
-                    res,
-                    'ports',
-                    wexc.HTTPInternalServerError.code)
-
     def test_nexus_enable_vlan_cmd(self):
         """Verify the syntax of the command to enable a vlan on an intf.
 
@@ -41,7 +41,8 @@ class TestNuageMechDriverSubnetsV2(test_db_plugin.TestSubnetsV2,
     pass
 
 
-class TestNuageMechDriverPortsV2(test_db_plugin.TestPortsV2,
+class TestNuageMechDriverPortsV2(test_ml2_plugin.Ml2BulkPortsTestMixin,
+                                test_db_plugin.TestPortsV2,
                                 TestNuageMechDriverBase):
 
     def setUp(self):
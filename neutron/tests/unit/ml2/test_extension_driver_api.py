@@ -10,7 +10,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import contextlib
+
+import mock
+
 from neutron.api import extensions
+from neutron import manager
 from neutron.plugins.ml2 import config
 from neutron.plugins.ml2 import driver_api as api
 from neutron.tests.unit.ml2 import extensions as test_extensions
@@ -32,6 +37,30 @@ class ExtensionDriverTestCase(test_ml2_plugin.Ml2PluginV2TestCase):
             ent = network['network'].get('network_extension')
             self.assertIsNotNone(ent)
 
+    def test_update_network_attr(self):
+        plugin = manager.NeutronManager.get_plugin()
+        with self.network() as network:
+            with mock.patch.object(plugin.mechanism_manager,
+                                   'update_network_precommit') as precommit:
+                res = self._update('networks', network['network']['id'],
+                                   {'network': {'name': 'new_name'}})
+            self.assertEqual('Test_Network_Extension',
+                             res['network'].get('network_extension'))
+            mech_context = precommit.call_args[0][0]
+            self.assertEqual('Test_Network_Extension',
+                             mech_context.original.get('network_extension'))
+
+    def test_list_networks_extended_in_bulk(self):
+        plugin = manager.NeutronManager.get_plugin()
+        ext_driver = plugin.extension_manager.ordered_ext_drivers[0].obj
+        with contextlib.nested(self.network(), self.network()):
+            with mock.patch.object(ext_driver,
+                                   'extend_network_dicts') as extend:
+                res = self._list('networks')
+        self.assertEqual(1, extend.call_count)
+        self.assertEqual(2, len(extend.call_args[0][1]))
+        self.assertEqual(2, len(res['networks']))
+
     def test_subnet_attr(self):
         with self.subnet() as subnet:
             ent = subnet['subnet'].get('subnet_extension')
@@ -64,3 +93,6 @@ class TestExtensionDriver(api.ExtensionDriver):
 
     def process_create_port(self, session, data, result):
         result['port_extension'] = self.port_extension
+
+    def extend_network_dict(self, session, result):
+        result['network_extension'] = self.network_extension
@@ -112,7 +112,20 @@ class TestMl2V2HTTPResponse(test_plugin.TestV2HTTPResponse,
 
 class TestMl2NetworksV2(test_plugin.TestNetworksV2,
                         Ml2PluginV2TestCase):
-    pass
+
+    def test_list_networks_fetches_segments_in_bulk(self):
+        with contextlib.nested(self.network(), self.network()):
+            with contextlib.nested(
+                mock.patch.object(ml2_db, 'get_network_segments'),
+                mock.patch.object(ml2_db, 'get_networks_segments',
+                                  wraps=ml2_db.get_networks_segments)
+            ) as (get_segments, get_networks_segments):
+                res = self._list('networks')
+        self.assertFalse(get_segments.called)
+        self.assertEqual(1, get_networks_segments.call_count)
+        self.assertEqual(2, len(res['networks']))
+        for net in res['networks']:
+            self.assertEqual('local', net[pnet.NETWORK_TYPE])
 
 
 class TestMl2SubnetsV2(test_plugin.TestSubnetsV2,
@@ -120,13 +133,97 @@ class TestMl2SubnetsV2(test_plugin.TestSubnetsV2,
     pass
 
 
-class TestMl2PortsV2(test_plugin.TestPortsV2, Ml2PluginV2TestCase):
+class Ml2BulkPortsTestMixin(object):
+    """Bulk port failure tests for ML2.
+
+    ML2 creates the ports of a native bulk request without going through
+    create_port, where the generic tests inject their failures.
+    """
+
+    def test_create_ports_bulk_emulated_plugin_failure(self):
+        # The native bulk path does not go through create_port, so the
+        # ports are created one by one as the API does in emulation
+        plugin = manager.NeutronManager.get_plugin()
+
+        def create_bulk(context, ports):
+            return plugin._create_bulk('port', context, ports)
+
+        with mock.patch.object(plugin, 'create_port_bulk',
+                               side_effect=create_bulk):
+            super(Ml2BulkPortsTestMixin,
+                  self).test_create_ports_bulk_emulated_plugin_failure()
+
+    def test_create_ports_bulk_native_plugin_failure(self):
+        if self._skip_native_bulk:
+            self.skipTest("Plugin does not support native bulk port create")
+        ctx = context.get_admin_context()
+        with self.network() as net:
+            plugin = manager.NeutronManager.get_plugin()
+            orig = plugin._create_port_db
+            with mock.patch.object(plugin,
+                                   '_create_port_db') as patched_plugin:
+
+                def side_effect(*args, **kwargs):
+                    return self._fail_second_call(patched_plugin, orig,
+                                                  *args, **kwargs)
+
+                patched_plugin.side_effect = side_effect
+                res = self._create_port_bulk(self.fmt, 2, net['network']['id'],
+                                             'test', True, context=ctx)
+                # We expect a 500 as we injected a fault in the plugin
+                self._validate_behavior_on_bulk_failure(
+                    res, 'ports', webob.exc.HTTPServerError.code)
+
+
+class TestMl2PortsV2(Ml2BulkPortsTestMixin, test_plugin.TestPortsV2,
+                     Ml2PluginV2TestCase):
 
     def test_update_port_status_build(self):
         with self.port() as port:
             self.assertEqual('DOWN', port['port']['status'])
             self.assertEqual('DOWN', self.port_create_status)
 
+    def test_create_ports_bulk_calls_drivers_once(self):
+        plugin = manager.NeutronManager.get_plugin()
+        mech_manager = plugin.mechanism_manager
+        with contextlib.nested(
+            self.network(),
+            mock.patch.object(mech_manager, 'create_port_bulk_precommit',
+                              wraps=mech_manager.create_port_bulk_precommit),
+            mock.patch.object(mech_manager, 'create_port_bulk_postcommit'),
+            mock.patch.object(mech_manager, 'create_port_postcommit'),
+            mock.patch.object(plugin.notifier,
+                              'security_groups_member_updated')
+        ) as (net, precommit, postcommit, port_postcommit,
+              sg_member_updated):
+            res = self._create_port_bulk(self.fmt, 3, net['network']['id'],
+                                         'test', True)
+            self.assertEqual(webob.exc.HTTPCreated.code, res.status_int)
+            ports = self.deserialize(self.fmt, res)['ports']
+            self.assertEqual(1, precommit.call_count)
+            self.assertEqual(
+                sorted(p['id'] for p in ports),
+                sorted(c.current['id'] for c in postcommit.call_args[0][0]))
+            self.assertFalse(port_postcommit.called)
+            self.assertEqual(1, sg_member_updated.call_count)
+            self.assertEqual(3, len(set(p['mac_address'] for p in ports)))
+            for p in ports:
+                self._delete('ports', p['id'])
+
+    def test_create_ports_bulk_postcommit_failure_deletes_ports(self):
+        plugin = manager.NeutronManager.get_plugin()
+        with contextlib.nested(
+            self.network(),
+            mock.patch.object(plugin.mechanism_manager,
+                              'create_port_bulk_postcommit',
+                              side_effect=ml2_exc.MechanismDriverError(
+                                  method='create_port_bulk_postcommit'))
+        ) as (net, postcommit):
+            res = self._create_port_bulk(self.fmt, 2, net['network']['id'],
+                                         'test', True)
+            self._validate_behavior_on_bulk_failure(
+                res, 'ports', webob.exc.HTTPServerError.code)
+
     def test_update_non_existent_port(self):
         ctx = context.get_admin_context()
         plugin = manager.NeutronManager.get_plugin()
@@ -337,6 +434,18 @@ class TestMl2PortBinding(Ml2PluginV2TestCase,
             # should have returned before calling _make_port_dict
             self.assertFalse(mpd_mock.mock_calls)
 
+    def test_port_revision_bumped_on_binding_change(self):
+        plugin = manager.NeutronManager.get_plugin()
+        with self.port() as port:
+            port_id = port['port']['id']
+            revision = plugin.get_port_revision(self.context, port_id)
+            with self.context.session.begin(subtransactions=True):
+                binding = ml2_db.get_locked_port_and_binding(
+                    self.context.session, port_id)[1]
+                binding['host'] = 'newhost'
+            self.assertEqual(revision + 1,
+                             plugin.get_port_revision(self.context, port_id))
+
     def test_port_binding_profile_not_changed(self):
         profile = {'e': 5}
         profile_arg = {portbindings.PROFILE: profile}
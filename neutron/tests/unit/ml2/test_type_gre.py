@@ -52,3 +52,9 @@ class GreTypeTest(test_type_vxlan.TunnelTypeTestMixin,
 class GreTypeMultiRangeTest(test_type_vxlan.TunnelTypeMultiRangeTestMixin,
                            testlib_api.SqlTestCase):
     DRIVER_CLASS = type_gre.GreTypeDriver
+
+
+class GreTunnelRpcCallbackTest(test_type_vxlan.TunnelRpcCallbackTestMixin,
+                               testlib_api.SqlTestCase):
+    DRIVER_CLASS = type_gre.GreTypeDriver
+    TYPE = p_const.TYPE_GRE
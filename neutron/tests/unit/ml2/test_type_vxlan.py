@@ -23,6 +23,7 @@ from neutron.common import exceptions as exc
 from neutron.db import api as db
 from neutron.plugins.common import constants as p_const
 from neutron.plugins.ml2 import driver_api as api
+from neutron.plugins.ml2.drivers import type_tunnel
 from neutron.plugins.ml2.drivers import type_vxlan
 from neutron.tests.unit import testlib_api
 
@@ -269,3 +270,66 @@ class TunnelTypeMultiRangeTestMixin(object):
 class VxlanTypeMultiRangeTest(TunnelTypeMultiRangeTestMixin,
                               testlib_api.SqlTestCase):
     DRIVER_CLASS = type_vxlan.VxlanTypeDriver
+
+
+class TunnelRpcCallbackTestMixin(object):
+    DRIVER_CLASS = None
+    TYPE = None
+
+    def setUp(self):
+        super(TunnelRpcCallbackTestMixin, self).setUp()
+        self.driver = self.DRIVER_CLASS()
+        self.notifier = mock.Mock()
+        type_manager = mock.Mock()
+        type_manager.drivers = {self.TYPE: mock.Mock(obj=self.driver)}
+        self.callbacks = type_tunnel.TunnelRpcCallbackMixin()
+        self.callbacks.setup_tunnel_callback_mixin(self.notifier,
+                                                   type_manager)
+
+    def _tunnel_sync(self, tunnel_ip):
+        return self.callbacks.tunnel_sync(mock.sentinel.context,
+                                          tunnel_ip=tunnel_ip,
+                                          tunnel_type=self.TYPE)
+
+    def test_tunnel_sync_new_endpoint_notifies_agents(self):
+        details = self._tunnel_sync(TUNNEL_IP_ONE)
+        self.assertEqual([TUNNEL_IP_ONE],
+                         [t['ip_address'] for t in details['tunnels']])
+        self.notifier.tunnel_update.assert_called_once_with(
+            mock.sentinel.context, TUNNEL_IP_ONE, self.TYPE)
+
+    def test_tunnel_sync_known_endpoint_does_not_notify(self):
+        self._tunnel_sync(TUNNEL_IP_ONE)
+        self.notifier.reset_mock()
+        with mock.patch.object(self.driver, 'add_endpoint') as add_endpoint:
+            details = self._tunnel_sync(TUNNEL_IP_ONE)
+        self.assertEqual([TUNNEL_IP_ONE],
+                         [t['ip_address'] for t in details['tunnels']])
+        self.assertFalse(add_endpoint.called)
+        self.assertFalse(self.notifier.tunnel_update.called)
+
+    def test_tunnel_sync_reads_endpoints_only_when_changed(self):
+        with mock.patch.object(self.driver, 'get_endpoints',
+                               wraps=self.driver.get_endpoints) as get_eps:
+            self._tunnel_sync(TUNNEL_IP_ONE)
+            self.assertEqual(2, get_eps.call_count)
+            self._tunnel_sync(TUNNEL_IP_ONE)
+            self.assertEqual(2, get_eps.call_count)
+            details = self._tunnel_sync(TUNNEL_IP_TWO)
+            self.assertEqual(3, get_eps.call_count)
+        self.assertEqual(set([TUNNEL_IP_ONE, TUNNEL_IP_TWO]),
+                         set(t['ip_address'] for t in details['tunnels']))
+
+    def test_get_cached_endpoints_sees_other_workers_endpoints(self):
+        self.assertEqual([], self.driver.get_cached_endpoints())
+        # Another server process adds an endpoint
+        self.DRIVER_CLASS().add_endpoint(TUNNEL_IP_ONE)
+        endpoints = self.driver.get_cached_endpoints()
+        self.assertEqual([TUNNEL_IP_ONE],
+                         [t['ip_address'] for t in endpoints])
+
+
+class VxlanTunnelRpcCallbackTest(TunnelRpcCallbackTestMixin,
+                                 testlib_api.SqlTestCase):
+    DRIVER_CLASS = type_vxlan.VxlanTypeDriver
+    TYPE = p_const.TYPE_VXLAN
@@ -23,6 +23,7 @@ from webob import exc
 
 from neutron.api import extensions
 from neutron.api.rpc.agentnotifiers import dhcp_rpc_agent_api
+from neutron.api.rpc.agentnotifiers import l3_rpc_agent_api
 from neutron.api.rpc.handlers import dhcp_rpc
 from neutron.api.rpc.handlers import l3_rpc
 from neutron.api.v2 import attributes
@@ -651,7 +652,8 @@ class OvsAgentSchedulerTestCase(OvsAgentSchedulerTestCaseBase):
             # schedule the router to host A
             l3_rpc_cb.sync_routers(self.adminContext, host=L3_HOSTA)
             with mock.patch('neutron.db.l3_agentschedulers_db.'
-                            'L3AgentSchedulerDbMixin.reschedule_router') as rr:
+                            'L3AgentSchedulerDbMixin.'
+                            'reschedule_routers') as rr:
                 # take down some unrelated agent and run reschedule check
                 self._take_down_agent_and_run_reschedule(DHCP_HOSTC)
                 self.assertFalse(rr.called)
@@ -669,6 +671,100 @@ class OvsAgentSchedulerTestCase(OvsAgentSchedulerTestCaseBase):
             ret_b = l3_rpc_cb.sync_routers(self.adminContext, host=L3_HOSTB)
         self.assertEqual(ret_b, ret_a)
 
+    def test_routers_rescheduled_in_bulk_from_dead_agent(self):
+        with contextlib.nested(self.router(name='r1'),
+                               self.router(name='r2')) as (r1, r2):
+            l3_rpc_cb = l3_rpc.L3RpcCallback()
+            self._register_agent_states()
+            router_ids = sorted([r1['router']['id'], r2['router']['id']])
+
+            # schedule both routers to host A
+            l3_rpc_cb.sync_routers(self.adminContext, host=L3_HOSTA)
+            with contextlib.nested(
+                mock.patch.object(l3_rpc_agent_api.L3AgentNotifyAPI,
+                                  'router_added_to_agent'),
+                mock.patch.object(l3_rpc_agent_api.L3AgentNotifyAPI,
+                                  'router_removed_from_agent'),
+                mock.patch('neutron.db.l3_agentschedulers_db.'
+                           'L3AgentSchedulerDbMixin.reschedule_router')
+            ) as (added, removed, rr):
+                self._take_down_agent_and_run_reschedule(L3_HOSTA)
+
+            self.assertFalse(rr.called)
+            self.assertEqual(1, added.call_count)
+            self.assertEqual(router_ids, sorted(added.call_args[0][1]))
+            self.assertEqual(L3_HOSTB, added.call_args[0][2])
+            self.assertEqual(2, removed.call_count)
+            ret_b = l3_rpc_cb.sync_routers(self.adminContext, host=L3_HOSTB)
+            self.assertEqual(router_ids, sorted(r['id'] for r in ret_b))
+
+    def test_routers_rescheduled_with_configured_scheduler(self):
+        with contextlib.nested(self.router(name='r1'),
+                               self.router(name='r2')) as (r1, r2):
+            l3_rpc_cb = l3_rpc.L3RpcCallback()
+            self._register_agent_states()
+            l3_rpc_cb.sync_routers(self.adminContext, host=L3_HOSTA)
+            plugin = manager.NeutronManager.get_service_plugins().get(
+                service_constants.L3_ROUTER_NAT)
+            with mock.patch.object(
+                plugin.router_scheduler, 'choose_router_agents',
+                wraps=plugin.router_scheduler.choose_router_agents
+            ) as choose:
+                self._take_down_agent_and_run_reschedule(L3_HOSTA)
+
+            self.assertEqual(1, choose.call_count)
+            router_candidates = choose.call_args[0][2]
+            self.assertEqual(
+                sorted([r1['router']['id'], r2['router']['id']]),
+                sorted(router_id for router_id, _c in router_candidates))
+
+    def test_router_rescheduled_one_at_a_time_without_bulk_choice(self):
+        with self.router() as r:
+            l3_rpc_cb = l3_rpc.L3RpcCallback()
+            self._register_agent_states()
+            l3_rpc_cb.sync_routers(self.adminContext, host=L3_HOSTA)
+            plugin = manager.NeutronManager.get_service_plugins().get(
+                service_constants.L3_ROUTER_NAT)
+            scheduler = mock.Mock(spec=['schedule'])
+            with contextlib.nested(
+                mock.patch.object(plugin, 'router_scheduler', new=scheduler),
+                mock.patch.object(plugin, 'reschedule_router')
+            ) as (_s, rr):
+                self._take_down_agent_and_run_reschedule(L3_HOSTA)
+            rr.assert_called_once_with(mock.ANY, r['router']['id'])
+
+    def test_routers_rescheduled_after_reschedule_failure(self):
+        with contextlib.nested(self.router(name='r1'),
+                               self.router(name='r2')) as (r1, r2):
+            l3_rpc_cb = l3_rpc.L3RpcCallback()
+            self._register_agent_states()
+            l3_rpc_cb.sync_routers(self.adminContext, host=L3_HOSTA)
+            plugin = manager.NeutronManager.get_service_plugins().get(
+                service_constants.L3_ROUTER_NAT)
+            scheduler = mock.Mock(spec=['schedule'])
+            failure = l3agentscheduler.RouterReschedulingFailed(
+                router_id=r1['router']['id'])
+            with contextlib.nested(
+                mock.patch.object(plugin, 'router_scheduler', new=scheduler),
+                mock.patch.object(plugin, 'reschedule_router',
+                                  side_effect=[failure, None])
+            ) as (_s, rr):
+                self._take_down_agent_and_run_reschedule(L3_HOSTA)
+            self.assertEqual(2, rr.call_count)
+
+    def test_get_l3_agents_load(self):
+        with self.router():
+            l3_rpc_cb = l3_rpc.L3RpcCallback()
+            self._register_agent_states()
+            l3_rpc_cb.sync_routers(self.adminContext, host=L3_HOSTA)
+            hosta_id = self._get_agent_id(constants.AGENT_TYPE_L3, L3_HOSTA)
+            hostb_id = self._get_agent_id(constants.AGENT_TYPE_L3, L3_HOSTB)
+            plugin = manager.NeutronManager.get_service_plugins().get(
+                service_constants.L3_ROUTER_NAT)
+            load = plugin.get_l3_agents_load(self.adminContext,
+                                             [hosta_id, hostb_id])
+        self.assertEqual({hosta_id: 1, hostb_id: 0}, load)
+
     def test_router_no_reschedule_from_dead_admin_down_agent(self):
         with self.router() as r:
             l3_rpc_cb = l3_rpc.L3RpcCallback()
@@ -771,6 +771,30 @@ class TestOvsNeutronAgent(base.BaseTestCase):
              'removed': set(['eth0']),
              'added': set(['eth1'])})
 
+    def test_process_network_ports_records_phases(self):
+        port_info = {'current': set(['tap0']),
+                     'removed': set(['eth0']),
+                     'added': set(['eth1'])}
+        with contextlib.nested(
+            mock.patch.object(self.agent.sg_agent, "setup_port_filters"),
+            mock.patch.object(self.agent, "treat_devices_added_or_updated",
+                              return_value=[]),
+            mock.patch.object(self.agent, "treat_devices_removed",
+                              return_value=False)
+        ):
+            stats = self.agent.loop_stats.start_iteration(1)
+            self.agent.process_network_ports(port_info, False)
+            self.agent.loop_stats.finish_iteration()
+        self.assertIn('firewall_refresh', stats.to_dict()['phases'])
+        self.assertEqual([stats], list(self.agent.loop_stats.history))
+
+    def test_treat_devices_added_updated_records_rpc_latency(self):
+        with mock.patch.object(self.agent.plugin_rpc,
+                               'get_devices_details_list', return_value=[]):
+            stats = self.agent.loop_stats.start_iteration(1)
+            self.agent.treat_devices_added_or_updated(['tap1'], False)
+        self.assertIn('get_devices_details_list', stats.to_dict()['rpc'])
+
     def test_report_state(self):
         with mock.patch.object(self.agent.state_rpc,
                                "report_state") as report_st:
@@ -1275,26 +1299,25 @@ class TestOvsNeutronAgent(base.BaseTestCase):
         with contextlib.nested(
             mock.patch.object(self.agent.plugin_rpc, 'tunnel_sync',
                               return_value=fake_tunnel_details),
-            mock.patch.object(self.agent, '_setup_tunnel_port')
-        ) as (tunnel_sync_rpc_fn, _setup_tunnel_port_fn):
+            mock.patch.object(self.agent, '_setup_tunnel_ports')
+        ) as (tunnel_sync_rpc_fn, _setup_tunnel_ports_fn):
             self.agent.tunnel_types = ['gre']
             self.agent.tunnel_sync()
-            expected_calls = [mock.call(self.agent.tun_br, 'gre-42',
-                                        '100.101.102.103', 'gre')]
-            _setup_tunnel_port_fn.assert_has_calls(expected_calls)
+            _setup_tunnel_ports_fn.assert_called_once_with(
+                self.agent.tun_br, [('gre-42', '100.101.102.103')], 'gre')
 
     def test_tunnel_sync_with_ml2_plugin(self):
         fake_tunnel_details = {'tunnels': [{'ip_address': '100.101.31.15'}]}
         with contextlib.nested(
             mock.patch.object(self.agent.plugin_rpc, 'tunnel_sync',
                               return_value=fake_tunnel_details),
-            mock.patch.object(self.agent, '_setup_tunnel_port')
-        ) as (tunnel_sync_rpc_fn, _setup_tunnel_port_fn):
+            mock.patch.object(self.agent, '_setup_tunnel_ports')
+        ) as (tunnel_sync_rpc_fn, _setup_tunnel_ports_fn):
             self.agent.tunnel_types = ['vxlan']
             self.agent.tunnel_sync()
-            expected_calls = [mock.call(self.agent.tun_br, 'vxlan-64651f0f',
-                                        '100.101.31.15', 'vxlan')]
-            _setup_tunnel_port_fn.assert_has_calls(expected_calls)
+            _setup_tunnel_ports_fn.assert_called_once_with(
+                self.agent.tun_br, [('vxlan-64651f0f', '100.101.31.15')],
+                'vxlan')
 
     def test_tunnel_sync_invalid_ip_address(self):
         fake_tunnel_details = {'tunnels': [{'ip_address': '300.300.300.300'},
@@ -1302,14 +1325,72 @@ class TestOvsNeutronAgent(base.BaseTestCase):
         with contextlib.nested(
             mock.patch.object(self.agent.plugin_rpc, 'tunnel_sync',
                               return_value=fake_tunnel_details),
-            mock.patch.object(self.agent, '_setup_tunnel_port')
-        ) as (tunnel_sync_rpc_fn, _setup_tunnel_port_fn):
+            mock.patch.object(self.agent, '_setup_tunnel_ports')
+        ) as (tunnel_sync_rpc_fn, _setup_tunnel_ports_fn):
             self.agent.tunnel_types = ['vxlan']
             self.agent.tunnel_sync()
-            _setup_tunnel_port_fn.assert_called_once_with(self.agent.tun_br,
-                                                          'vxlan-64646464',
-                                                          '100.100.100.100',
-                                                          'vxlan')
+            _setup_tunnel_ports_fn.assert_called_once_with(
+                self.agent.tun_br, [('vxlan-64646464', '100.100.100.100')],
+                'vxlan')
+
+    def test_tunnel_sync_skips_local_ip(self):
+        fake_tunnel_details = {'tunnels': [{'ip_address': '100.101.31.15'},
+                                           {'ip_address': '10.0.0.1'}]}
+        self.agent.local_ip = '10.0.0.1'
+        with contextlib.nested(
+            mock.patch.object(self.agent.plugin_rpc, 'tunnel_sync',
+                              return_value=fake_tunnel_details),
+            mock.patch.object(self.agent, '_setup_tunnel_ports')
+        ) as (tunnel_sync_rpc_fn, _setup_tunnel_ports_fn):
+            self.agent.tunnel_types = ['vxlan']
+            self.agent.tunnel_sync()
+            _setup_tunnel_ports_fn.assert_called_once_with(
+                self.agent.tun_br, [('vxlan-64651f0f', '100.101.31.15')],
+                'vxlan')
+
+    def test__setup_tunnel_ports_updates_flooding_once(self):
+        self.agent.tun_br = mock.MagicMock()
+        self.agent.l2_pop = False
+        self.agent.tun_br_ofports['gre'] = {}
+        self.agent.local_vlan_map = {
+            'net1': ovs_neutron_agent.LocalVLANMapping(1, 'gre', None, 101),
+            'net2': ovs_neutron_agent.LocalVLANMapping(2, 'gre', None, 102)}
+        self.agent.tun_br.add_tunnel_ports.return_value = {'gre-1': '5',
+                                                           'gre-2': '6'}
+        deferred_br = self.agent.tun_br.deferred.return_value.__enter__()
+        tunnels = [('gre-1', '10.0.0.2'), ('gre-2', '10.0.0.3')]
+        self.agent._setup_tunnel_ports(self.agent.tun_br, tunnels, 'gre')
+
+        self.agent.tun_br.add_tunnel_ports.assert_called_once_with(
+            tunnels, self.agent.local_ip, 'gre',
+            self.agent.vxlan_udp_port, self.agent.dont_fragment)
+        self.assertFalse(self.agent.tun_br.add_tunnel_port.called)
+        self.assertEqual({'10.0.0.2': '5', '10.0.0.3': '6'},
+                         self.agent.tun_br_ofports['gre'])
+        self.assertEqual(2, deferred_br.add_flow.call_count)
+        # One flood flow per local vlan, not per tunnel
+        self.assertEqual(2, deferred_br.mod_flow.call_count)
+
+    def test__setup_tunnel_ports_skips_failed_port(self):
+        self.agent.tun_br = mock.MagicMock()
+        self.agent.tun_br_ofports['gre'] = {}
+        self.agent.tun_br.add_tunnel_ports.return_value = {'gre-1': '5',
+                                                           'gre-2': '-1'}
+        deferred_br = self.agent.tun_br.deferred.return_value.__enter__()
+        with mock.patch.object(ovs_neutron_agent.LOG, 'error') as log_error:
+            self.agent._setup_tunnel_ports(
+                self.agent.tun_br,
+                [('gre-1', '10.0.0.2'), ('gre-2', '10.0.0.3')], 'gre')
+        log_error.assert_called_once_with(
+            _("Failed to set-up %(type)s tunnel port to %(ip)s"),
+            {'type': 'gre', 'ip': '10.0.0.3'})
+        self.assertEqual({'10.0.0.2': '5'}, self.agent.tun_br_ofports['gre'])
+        self.assertEqual(1, deferred_br.add_flow.call_count)
+
+    def test__setup_tunnel_ports_no_tunnels(self):
+        self.agent.tun_br = mock.Mock()
+        self.agent._setup_tunnel_ports(self.agent.tun_br, [], 'gre')
+        self.assertFalse(self.agent.tun_br.add_tunnel_ports.called)
 
     def test_tunnel_update(self):
         kwargs = {'tunnel_ip': '10.10.10.10',
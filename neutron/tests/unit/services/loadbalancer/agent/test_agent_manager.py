@@ -29,6 +29,7 @@ class TestManager(base.BaseTestCase):
 
         mock_conf = mock.Mock()
         mock_conf.device_driver = ['devdriver']
+        mock_conf.stats_collection_concurrency = 10
 
         self.mock_importer = mock.patch.object(manager, 'importutils').start()
 
@@ -65,18 +66,54 @@ class TestManager(base.BaseTestCase):
             self.assertFalse(sync.called)
 
     def test_collect_stats(self):
+        self.driver_mock.get_stats.side_effect = lambda pool_id: {
+            'bytes_in': int(pool_id)}
         self.mgr.collect_stats(mock.Mock())
-        self.rpc_mock.update_pool_stats.assert_has_calls([
-            mock.call('1', mock.ANY),
-            mock.call('2', mock.ANY)
-        ])
+        self.rpc_mock.update_pools_stats.assert_called_once_with(
+            {'1': {'bytes_in': 1}, '2': {'bytes_in': 2}})
+        self.assertFalse(self.rpc_mock.update_pool_stats.called)
+
+    def test_collect_stats_only_changed(self):
+        stats = {'1': {'bytes_in': 1}, '2': {'bytes_in': 2}}
+        self.driver_mock.get_stats.side_effect = lambda pool_id: dict(
+            stats[pool_id])
+        self.mgr.collect_stats(mock.Mock())
+        self.rpc_mock.reset_mock()
+
+        stats['2']['bytes_in'] = 20
+        self.mgr.collect_stats(mock.Mock())
+        self.rpc_mock.update_pools_stats.assert_called_once_with(
+            {'2': {'bytes_in': 20}})
+
+        self.rpc_mock.reset_mock()
+        self.mgr.collect_stats(mock.Mock())
+        self.assertFalse(self.rpc_mock.update_pools_stats.called)
+
+    def test_collect_stats_forgets_removed_pools(self):
+        self.driver_mock.get_stats.return_value = {'bytes_in': 1}
+        self.mgr.collect_stats(mock.Mock())
+        del self.mgr.instance_mapping['2']
+        self.mgr.collect_stats(mock.Mock())
+        self.assertEqual({'1': {'bytes_in': 1}}, self.mgr.pool_stats)
+
+    def test_collect_stats_rpc_failure_resends(self):
+        self.driver_mock.get_stats.return_value = {'bytes_in': 1}
+        self.rpc_mock.update_pools_stats.side_effect = Exception
+        self.mgr.collect_stats(mock.Mock())
+        self.assertTrue(self.mgr.needs_resync)
+        self.assertEqual({}, self.mgr.pool_stats)
+
+        self.rpc_mock.update_pools_stats.side_effect = None
+        self.mgr.collect_stats(mock.Mock())
+        self.rpc_mock.update_pools_stats.assert_called_with(
+            {'1': {'bytes_in': 1}, '2': {'bytes_in': 1}})
 
     def test_collect_stats_exception(self):
         self.driver_mock.get_stats.side_effect = Exception
 
         self.mgr.collect_stats(mock.Mock())
 
-        self.assertFalse(self.rpc_mock.called)
+        self.assertFalse(self.rpc_mock.update_pools_stats.called)
         self.assertTrue(self.mgr.needs_resync)
         self.assertTrue(self.log.exception.called)
 
@@ -87,13 +124,22 @@ class TestManager(base.BaseTestCase):
         ) as (reload, destroy):
 
             self.rpc_mock.get_ready_devices.return_value = ready
+            configs = dict((i, {'pool': {'id': i}}) for i in ready)
+            self.rpc_mock.get_logical_devices.return_value = configs
 
             self.mgr.sync_state()
 
+            self.rpc_mock.get_logical_devices.assert_called_once_with(
+                mock.ANY)
+            self.assertEqual(
+                set(ready),
+                set(self.rpc_mock.get_logical_devices.call_args[0][0]))
+            self.assertFalse(self.rpc_mock.get_logical_device.called)
             self.assertEqual(len(reloaded), len(reload.mock_calls))
             self.assertEqual(len(destroyed), len(destroy.mock_calls))
 
-            reload.assert_has_calls([mock.call(i) for i in reloaded])
+            reload.assert_has_calls([mock.call(i, configs[i])
+                                     for i in reloaded], any_order=True)
             destroy.assert_has_calls([mock.call(i) for i in destroyed])
             self.assertFalse(self.mgr.needs_resync)
 
@@ -131,6 +177,17 @@ class TestManager(base.BaseTestCase):
         self.assertIn(pool_id, self.mgr.instance_mapping)
         self.rpc_mock.pool_deployed.assert_called_once_with(pool_id)
 
+    def test_reload_pool_with_config(self):
+        config = {'driver': 'devdriver'}
+        pool_id = 'new_id'
+
+        self.mgr._reload_pool(pool_id, config)
+
+        self.assertFalse(self.rpc_mock.get_logical_device.called)
+        self.driver_mock.deploy_instance.assert_called_once_with(config)
+        self.assertIn(pool_id, self.mgr.instance_mapping)
+        self.rpc_mock.pool_deployed.assert_called_once_with(pool_id)
+
     def test_reload_pool_driver_not_found(self):
         config = {'driver': 'unknown_driver'}
         self.rpc_mock.get_logical_device.return_value = config
@@ -89,6 +89,23 @@ class TestApiCache(base.BaseTestCase):
             self.make_msg.return_value
         )
 
+    def test_get_logical_devices(self):
+        self.assertEqual(
+            self.api.get_logical_devices(['pool_id']),
+            self.mock_call.return_value
+        )
+
+        self.make_msg.assert_called_once_with(
+            'get_logical_devices',
+            pool_ids=['pool_id'],
+            host='host')
+
+        self.mock_call.assert_called_once_with(
+            mock.sentinel.context,
+            self.make_msg.return_value,
+            version='2.2'
+        )
+
     def test_update_status(self):
         self.assertEqual(
             self.api.update_status('pool', 'pool_id', 'ACTIVE'),
@@ -154,3 +171,21 @@ class TestApiCache(base.BaseTestCase):
             mock.sentinel.context,
             self.make_msg.return_value
         )
+
+    def test_update_pools_stats(self):
+        stats = {'pool_id': {'stat': 'stat'}}
+        self.assertEqual(
+            self.api.update_pools_stats(stats),
+            self.mock_call.return_value
+        )
+
+        self.make_msg.assert_called_once_with(
+            'update_pools_stats',
+            stats=stats,
+            host='host')
+
+        self.mock_call.assert_called_once_with(
+            mock.sentinel.context,
+            self.make_msg.return_value,
+            version='2.1'
+        )
@@ -42,9 +42,10 @@ class TestHaproxyCfg(base.BaseTestCase):
             b_f.return_value = [test_config[2]]
             b_b.return_value = [test_config[3]]
 
-            cfg.save_config('test_path', mock.Mock())
+            config = cfg.save_config('test_path', mock.Mock())
             replace.assert_called_once_with('test_path',
                                             '\n'.join(test_config))
+            self.assertEqual('\n'.join(test_config), config)
 
     def test_build_global(self):
         expected_opts = ['global',
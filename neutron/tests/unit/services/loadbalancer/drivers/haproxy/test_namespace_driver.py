@@ -32,6 +32,7 @@ class TestHaproxyNSDriver(base.BaseTestCase):
         conf.interface_driver = 'intdriver'
         conf.haproxy.user_group = 'test_group'
         conf.haproxy.send_gratuitous_arp = 3
+        conf.haproxy.reload_delay = 0
         conf.AGENT.root_helper = 'sudo_test'
         self.conf = conf
         self.mock_importer = mock.patch.object(namespace_driver,
@@ -69,15 +70,37 @@ class TestHaproxyNSDriver(base.BaseTestCase):
         with contextlib.nested(
             mock.patch.object(self.driver, '_get_state_file_path'),
             mock.patch.object(self.driver, '_spawn'),
+            mock.patch.object(namespace_driver.hacfg, 'build_config'),
             mock.patch('__builtin__.open')
-        ) as (gsp, spawn, mock_open):
+        ) as (gsp, spawn, build, mock_open):
             mock_open.return_value = ['5']
+            build.return_value = 'new config'
+            self.driver.pool_config_hash['pool_id'] = (
+                namespace_driver._hash_config('old config'))
 
             self.driver.update(self.fake_config)
 
+            build.assert_called_once_with(self.fake_config, gsp.return_value,
+                                          'test_group')
             mock_open.assert_called_once_with(gsp.return_value, 'r')
             spawn.assert_called_once_with(self.fake_config, ['-sf', '5'])
 
+    def test_update_unchanged_config(self):
+        with contextlib.nested(
+            mock.patch.object(self.driver, '_get_state_file_path'),
+            mock.patch.object(self.driver, '_spawn'),
+            mock.patch.object(namespace_driver.hacfg, 'build_config'),
+            mock.patch('__builtin__.open')
+        ) as (gsp, spawn, build, mock_open):
+            build.return_value = u'config'
+            self.driver.pool_config_hash['pool_id'] = (
+                namespace_driver._hash_config('config'))
+
+            self.driver.update(self.fake_config)
+
+            self.assertFalse(mock_open.called)
+            self.assertFalse(spawn.called)
+
     def test_spawn(self):
         with contextlib.nested(
             mock.patch.object(namespace_driver.hacfg, 'save_config'),
@@ -85,6 +108,7 @@ class TestHaproxyNSDriver(base.BaseTestCase):
             mock.patch('neutron.agent.linux.ip_lib.IPWrapper')
         ) as (mock_save, gsp, ip_wrap):
             gsp.side_effect = lambda x, y: y
+            mock_save.return_value = 'config'
 
             self.driver._spawn(self.fake_config)
 
@@ -95,6 +119,8 @@ class TestHaproxyNSDriver(base.BaseTestCase):
                 mock.call('sudo_test', 'qlbaas-pool_id'),
                 mock.call().netns.execute(cmd)
             ])
+            self.assertEqual(namespace_driver._hash_config('config'),
+                             self.driver.pool_config_hash['pool_id'])
 
     def test_undeploy_instance(self):
         with contextlib.nested(
@@ -108,10 +134,15 @@ class TestHaproxyNSDriver(base.BaseTestCase):
             gsp.side_effect = lambda x, y: '/pool/' + y
 
             self.driver.pool_to_port_id['pool_id'] = 'port_id'
+            self.driver.pool_config_hash['pool_id'] = 'hash'
+            self.driver.pending_refresh.add('pool_id')
             isdir.return_value = True
 
             self.driver.undeploy_instance('pool_id')
 
+            self.assertNotIn('pool_id', self.driver.pool_config_hash)
+            self.assertNotIn('pool_id', self.driver.pending_refresh)
+
             kill.assert_called_once_with('sudo_test', '/pool/pid')
             unplug.assert_called_once_with('qlbaas-pool_id', 'port_id')
             isdir.assert_called_once_with('/pool')
@@ -478,6 +509,48 @@ class TestHaproxyNSDriver(base.BaseTestCase):
             deploy.assert_called_once_with(
                 self.rpc_mock.get_logical_device.return_value)
 
+    def test_refresh_device_delayed(self):
+        self.conf.haproxy.reload_delay = 2
+        with mock.patch.object(namespace_driver.eventlet,
+                               'spawn_after') as spawn_after:
+            self.driver._refresh_device('pool_id1')
+            self.driver._refresh_device('pool_id1')
+            self.driver._refresh_device('pool_id2')
+
+            self.assertFalse(self.rpc_mock.get_logical_device.called)
+            spawn_after.assert_has_calls([
+                mock.call(2, self.driver._delayed_refresh_device, 'pool_id1'),
+                mock.call(2, self.driver._delayed_refresh_device, 'pool_id2')
+            ])
+            self.assertEqual(2, spawn_after.call_count)
+
+    def test_delayed_refresh_device(self):
+        self.driver.pending_refresh.add('pool_id1')
+        with mock.patch.object(self.driver, 'deploy_instance') as deploy:
+            self.driver._delayed_refresh_device('pool_id1')
+
+            self.rpc_mock.get_logical_device.assert_called_once_with(
+                'pool_id1')
+            deploy.assert_called_once_with(
+                self.rpc_mock.get_logical_device.return_value)
+            self.assertNotIn('pool_id1', self.driver.pending_refresh)
+
+    def test_delayed_refresh_device_cancelled(self):
+        with mock.patch.object(self.driver, 'deploy_instance') as deploy:
+            self.driver._delayed_refresh_device('pool_id1')
+
+            self.assertFalse(self.rpc_mock.get_logical_device.called)
+            self.assertFalse(deploy.called)
+
+    def test_delayed_refresh_device_error(self):
+        self.driver.pending_refresh.add('pool_id1')
+        with mock.patch.object(self.driver, 'deploy_instance') as deploy:
+            deploy.side_effect = Exception
+            self.driver._delayed_refresh_device('pool_id1')
+
+            self.rpc_mock.update_status.assert_called_once_with(
+                'pool', 'pool_id1', 'ERROR')
+
     def test_create_vip(self):
         with mock.patch.object(self.driver, '_refresh_device') as refresh:
             self.driver.create_vip({'pool_id': '1'})
@@ -514,8 +587,10 @@ class TestHaproxyNSDriver(base.BaseTestCase):
         with mock.patch.object(self.driver, 'undeploy_instance') as undeploy:
             with mock.patch.object(self.driver, 'exists') as exists:
                 exists.return_value = False
+                self.driver.pending_refresh.add('1')
                 self.driver.delete_pool({'id': '1'})
                 self.assertFalse(undeploy.called)
+                self.assertNotIn('1', self.driver.pending_refresh)
 
     def test_create_member(self):
         with mock.patch.object(self.driver, '_refresh_device') as refresh:
@@ -243,6 +243,25 @@ class TestLoadBalancerCallbacks(TestLoadBalancerPluginBase):
 
                     self.assertEqual(logical_config, expected)
 
+    def test_get_logical_devices(self):
+        with contextlib.nested(self.pool(), self.pool()) as (pool1, pool2):
+            with self.vip(pool=pool1):
+                ctx = context.get_admin_context()
+                pool_ids = [pool1['pool']['id'], pool2['pool']['id']]
+
+                logical_configs = self.callbacks.get_logical_devices(
+                    ctx, pool_ids=pool_ids + ['unknown_pool'], host='host')
+
+                self.assertEqual(set(pool_ids), set(logical_configs))
+                for pool_id in pool_ids:
+                    self.assertEqual(
+                        self.callbacks.get_logical_device(ctx, pool_id),
+                        logical_configs[pool_id])
+
+    def test_get_logical_devices_empty(self):
+        self.assertEqual({}, self.callbacks.get_logical_devices(
+            context.get_admin_context(), pool_ids=[], host='host'))
+
     def test_get_logical_device_inactive_member(self):
         with self.pool() as pool:
             with self.vip(pool=pool) as vip:
@@ -430,6 +449,39 @@ class TestLoadBalancerCallbacks(TestLoadBalancerPluginBase):
                                                              pool_id)
             self.assertEqual('ACTIVE', h['status'])
 
+    def test_update_pools_stats(self):
+        with self.pool() as pool:
+            with self.member(pool_id=pool['pool']['id']) as member:
+                pool_id = pool['pool']['id']
+                member_id = member['member']['id']
+                ctx = context.get_admin_context()
+                stats = {
+                    pool_id: {
+                        'bytes_in': 10,
+                        'bytes_out': 20,
+                        'active_connections': 1,
+                        'total_connections': 2,
+                        'members': {member_id: {'status': 'INACTIVE'}}
+                    },
+                    'unknown_pool': {'bytes_in': 1}
+                }
+                self.callbacks.update_pools_stats(ctx, stats=stats,
+                                                  host='host')
+                s = self.plugin_instance.stats(ctx, pool_id)['stats']
+                self.assertEqual(10, s['bytes_in'])
+                self.assertEqual(20, s['bytes_out'])
+                self.assertEqual(1, s['active_connections'])
+                self.assertEqual(2, s['total_connections'])
+                m = self.plugin_instance.get_member(ctx, member_id)
+                self.assertEqual('INACTIVE', m['status'])
+
+    def test_update_pools_stats_empty(self):
+        with mock.patch.object(self.plugin_instance,
+                               '_model_query') as model_query:
+            self.callbacks.update_pools_stats(context.get_admin_context(),
+                                              stats={}, host='host')
+            self.assertFalse(model_query.called)
+
 
 class TestLoadBalancerAgentApi(base.BaseTestCase):
     def setUp(self):
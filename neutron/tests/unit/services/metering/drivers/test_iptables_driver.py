@@ -373,3 +373,78 @@ class IptablesDriverTestCase(base.BaseTestCase):
                                         wrap=False)]
 
         self.v4filter_inst.assert_has_calls(calls)
+
+    def test_get_traffic_counters_bulk(self):
+        routers = TEST_ROUTERS[:1]
+        label_id = routers[0]['_metering_labels'][0]['id']
+        chain = 'neutron-meter-l-c5df2fe5-c60'
+        self.metering.add_metering_label(None, routers)
+
+        self.iptables_inst.get_traffic_counters_by_chain.side_effect = [
+            {chain: {'pkts': 10, 'bytes': 1000}},
+            {chain: {'pkts': 15, 'bytes': 1600}},
+            # the chain has been recreated and its counters restarted
+            {chain: {'pkts': 2, 'bytes': 100}}]
+
+        # the first reading is only a baseline
+        self.assertEqual({label_id: {'pkts': 0, 'bytes': 0}},
+                         self.metering.get_traffic_counters(None, routers))
+        self.assertEqual({label_id: {'pkts': 5, 'bytes': 600}},
+                         self.metering.get_traffic_counters(None, routers))
+        self.assertEqual({label_id: {'pkts': 2, 'bytes': 100}},
+                         self.metering.get_traffic_counters(None, routers))
+
+        self.iptables_inst.get_traffic_counters_by_chain.assert_called_with(
+            [chain], wrap=False)
+        self.assertFalse(self.iptables_inst.get_traffic_counters.called)
+
+    def test_get_traffic_counters_bulk_reset_on_label_removal(self):
+        routers = TEST_ROUTERS[:1]
+        label_id = routers[0]['_metering_labels'][0]['id']
+        chain = 'neutron-meter-l-c5df2fe5-c60'
+        self.iptables_inst.get_traffic_counters_by_chain.side_effect = [
+            {chain: {'pkts': 10, 'bytes': 1000}},
+            {chain: {'pkts': 3, 'bytes': 300}},
+            {chain: {'pkts': 4, 'bytes': 400}}]
+
+        self.metering.add_metering_label(None, routers)
+        self.metering.get_traffic_counters(None, routers)
+        self.metering.remove_metering_label(None, routers)
+        self.metering.add_metering_label(None, routers)
+
+        self.assertEqual({label_id: {'pkts': 0, 'bytes': 0}},
+                         self.metering.get_traffic_counters(None, routers))
+        self.assertEqual({label_id: {'pkts': 1, 'bytes': 100}},
+                         self.metering.get_traffic_counters(None, routers))
+
+    def test_get_traffic_counters_bulk_after_restart(self):
+        routers = TEST_ROUTERS[:1]
+        label_id = routers[0]['_metering_labels'][0]['id']
+        chain = 'neutron-meter-l-c5df2fe5-c60'
+        # the chain kept the counters of the previous agent run
+        self.iptables_inst.get_traffic_counters_by_chain.side_effect = [
+            {chain: {'pkts': 5000, 'bytes': 800000}},
+            {chain: {'pkts': 5010, 'bytes': 801000}}]
+
+        self.metering.add_metering_label(None, routers)
+
+        self.assertEqual({label_id: {'pkts': 0, 'bytes': 0}},
+                         self.metering.get_traffic_counters(None, routers))
+        self.assertEqual({label_id: {'pkts': 10, 'bytes': 1000}},
+                         self.metering.get_traffic_counters(None, routers))
+
+    def test_get_traffic_counters_per_label(self):
+        cfg.CONF.set_override('bulk_traffic_counters', False)
+        routers = TEST_ROUTERS[:1]
+        label_id = routers[0]['_metering_labels'][0]['id']
+        self.iptables_inst.get_traffic_counters.return_value = {
+            'pkts': 10, 'bytes': 1000}
+        self.metering.add_metering_label(None, routers)
+
+        self.assertEqual({label_id: {'pkts': 10, 'bytes': 1000}},
+                         self.metering.get_traffic_counters(None, routers))
+
+        self.iptables_inst.get_traffic_counters.assert_called_once_with(
+            'neutron-meter-l-c5df2fe5-c60', wrap=False, zero=True)
+        self.assertFalse(
+            self.iptables_inst.get_traffic_counters_by_chain.called)
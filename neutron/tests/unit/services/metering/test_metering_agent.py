@@ -111,6 +111,63 @@ class TestMeteringOperations(base.BaseTestCase,
         self.assertEqual(payload['pkts'], 88)
         self.assertEqual(payload['bytes'], 444)
 
+    def _meter_notifications(self, event_type='l3.meter'):
+        return [n['payload'] for n in fake_notifier.NOTIFICATIONS
+                if n['event_type'] == event_type]
+
+    def test_notification_report_batch(self):
+        cfg.CONF.set_override('batch_notifications', True)
+        label_id2 = _uuid()
+        self.agent.routers_updated(None, ROUTERS)
+
+        self.driver.get_traffic_counters.return_value = {
+            LABEL_ID: {'pkts': 88, 'bytes': 444},
+            label_id2: {'pkts': 1, 'bytes': 2}}
+        self.agent._metering_loop()
+
+        self.assertEqual([], self._meter_notifications())
+        batches = self._meter_notifications('l3.meter.batch')
+        self.assertEqual(1, len(batches))
+        self.assertEqual(self.agent.host, batches[0]['host'])
+        samples = dict((sample['label_id'], sample)
+                       for sample in batches[0]['samples'])
+        self.assertEqual(set([LABEL_ID, label_id2]), set(samples))
+        self.assertEqual(TENANT_ID, samples[LABEL_ID]['tenant_id'])
+        self.assertEqual(88, samples[LABEL_ID]['pkts'])
+        self.assertEqual(444, samples[LABEL_ID]['bytes'])
+
+    def test_notification_report_skip_zero_samples(self):
+        cfg.CONF.set_override('skip_zero_samples', True)
+        self.agent.routers_updated(None, ROUTERS)
+
+        self.driver.get_traffic_counters.return_value = {
+            LABEL_ID: {'pkts': 88, 'bytes': 444}}
+        self.agent._metering_loop()
+        self.assertEqual(1, len(self._meter_notifications()))
+
+        # no traffic since the previous report
+        self.driver.get_traffic_counters.return_value = {
+            LABEL_ID: {'pkts': 0, 'bytes': 0}}
+        self.agent.last_report = 0
+        self.agent._metering_loop()
+        self.assertEqual(1, len(self._meter_notifications()))
+
+    def test_notification_report_aggregation_intervals(self):
+        cfg.CONF.set_override('report_aggregation_intervals', 2)
+        self.agent.routers_updated(None, ROUTERS)
+
+        self.driver.get_traffic_counters.return_value = {
+            LABEL_ID: {'pkts': 10, 'bytes': 100}}
+        self.agent._metering_loop()
+        self.assertEqual([], self._meter_notifications())
+
+        self.agent.last_report = 0
+        self.agent._metering_loop()
+        notifications = self._meter_notifications()
+        self.assertEqual(1, len(notifications))
+        self.assertEqual(20, notifications[0]['pkts'])
+        self.assertEqual(200, notifications[0]['bytes'])
+
     def test_router_deleted(self):
         label_id = _uuid()
         self.driver.get_traffic_counters = mock.MagicMock()
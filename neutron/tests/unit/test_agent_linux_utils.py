@@ -49,6 +49,12 @@ class AgentUtilsExecuteTest(base.BaseTestCase):
         result = utils.execute(["ls", self.test_file])
         self.assertEqual(result, expected)
 
+    def test_process_count_incremented(self):
+        self.mock_popen.return_value = ["", ""]
+        count = utils.get_process_count()
+        utils.execute(["ls", self.test_file])
+        self.assertEqual(count + 1, utils.get_process_count())
+
     def test_with_helper(self):
         expected = "ls %s\n" % self.test_file
         self.mock_popen.return_value = [expected, ""]
@@ -13,10 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import contextlib
+
 import mock
 
 from neutron.agent.linux import interface
 from neutron.agent import netns_cleanup_util as util
+from neutron.openstack.common import jsonutils
 from neutron.tests import base
 
 
@@ -171,11 +174,12 @@ class TestNetnsCleanup(base.BaseTestCase):
                     if force:
                         expected.extend([
                             mock.call().netns.exists(ns),
-                            mock.call().get_devices(exclude_loopback=True)])
+                            mock.call().get_devices(exclude_loopback=True),
+                            mock.call().batch(
+                                [('link', 'delete', d.name)
+                                 for d in devices])])
                         self.assertTrue(kill_dhcp.called)
-                        unplug.assert_has_calls(
-                            [mock.call(conf, d) for d in
-                             devices[1:]])
+                        self.assertFalse(unplug.called)
 
                     expected.append(mock.call().garbage_collect_namespace())
                     ip_wrap.assert_has_calls(expected)
@@ -189,6 +193,39 @@ class TestNetnsCleanup(base.BaseTestCase):
     def test_destroy_namespace_not_empty_forced(self):
         self._test_destroy_namespace_helper(True, 2)
 
+    def test_unplug_devices_batch_failure(self):
+        conf = mock.Mock()
+        ip = mock.Mock()
+        dev1 = mock.Mock()
+        dev1.name = 'tap1'
+        dev2 = mock.Mock()
+        dev2.name = 'tap2'
+        ip.get_devices.side_effect = [[dev1, dev2], [dev2]]
+        ip.batch.side_effect = RuntimeError
+
+        with mock.patch.object(util, 'unplug_device') as unplug:
+            util.unplug_devices(conf, ip)
+
+            ip.batch.assert_called_once_with([('link', 'delete', 'tap1'),
+                                              ('link', 'delete', 'tap2')])
+            unplug.assert_called_once_with(conf, dev2)
+
+    def test_unplug_devices_no_devices(self):
+        ip = mock.Mock()
+        ip.get_devices.return_value = []
+        util.unplug_devices(mock.Mock(), ip)
+        self.assertFalse(ip.batch.called)
+
+    def test_describe_namespace(self):
+        conf = mock.Mock()
+        dev = mock.Mock()
+        dev.name = 'tap1'
+        with mock.patch('neutron.agent.linux.ip_lib.IPWrapper') as ip_wrap:
+            ip_wrap.return_value.get_devices.return_value = [dev]
+            self.assertEqual({'namespace': 'ns1', 'devices': ['tap1']},
+                             util.describe_namespace(conf, 'ns1'))
+            ip_wrap.assert_called_once_with(conf.AGENT.root_helper, 'ns1')
+
     def test_destroy_namespace_exception(self):
         ns = 'qrouter-6e322ac7-ab50-4f53-9cdc-d1d3c1164b6d'
         conf = mock.Mock()
@@ -205,6 +242,8 @@ class TestNetnsCleanup(base.BaseTestCase):
             with mock.patch('eventlet.sleep') as eventlet_sleep:
                 conf = mock.Mock()
                 conf.force = False
+                conf.workers = 2
+                conf.dry_run = False
                 methods_to_mock = dict(
                     eligible_for_deletion=mock.DEFAULT,
                     destroy_namespace=mock.DEFAULT,
@@ -237,6 +276,8 @@ class TestNetnsCleanup(base.BaseTestCase):
             with mock.patch('eventlet.sleep') as eventlet_sleep:
                 conf = mock.Mock()
                 conf.force = False
+                conf.workers = 2
+                conf.dry_run = False
                 methods_to_mock = dict(
                     eligible_for_deletion=mock.DEFAULT,
                     destroy_namespace=mock.DEFAULT,
@@ -258,3 +299,43 @@ class TestNetnsCleanup(base.BaseTestCase):
                         self.assertFalse(mocks['destroy_namespace'].called)
 
                         self.assertFalse(eventlet_sleep.called)
+
+    def test_main_dry_run(self):
+        namespaces = ['ns1', 'ns2']
+        with mock.patch('neutron.agent.linux.ip_lib.IPWrapper') as ip_wrap:
+            ip_wrap.get_namespaces.return_value = namespaces
+
+            with mock.patch('eventlet.sleep') as eventlet_sleep:
+                conf = mock.Mock()
+                conf.force = True
+                conf.workers = 2
+                conf.dry_run = True
+                methods_to_mock = dict(
+                    eligible_for_deletion=mock.DEFAULT,
+                    destroy_namespace=mock.DEFAULT,
+                    describe_namespace=mock.DEFAULT,
+                    setup_conf=mock.DEFAULT)
+
+                with mock.patch.multiple(util, **methods_to_mock) as mocks:
+                    mocks['eligible_for_deletion'].side_effect = (
+                        lambda conf, ns, force: ns == 'ns2')
+                    mocks['describe_namespace'].return_value = {
+                        'namespace': 'ns2', 'devices': ['tap1']}
+                    mocks['setup_conf'].return_value = conf
+                    with contextlib.nested(
+                        mock.patch('neutron.common.config.setup_logging'),
+                        mock.patch('sys.stdout')
+                    ) as (setup_logging, stdout):
+                        util.main()
+
+                        mocks['describe_namespace'].assert_called_once_with(
+                            conf, 'ns2')
+                        self.assertFalse(mocks['destroy_namespace'].called)
+                        self.assertFalse(eventlet_sleep.called)
+                        report = jsonutils.loads(
+                            stdout.write.call_args[0][0])
+                        self.assertEqual(
+                            {'force': True,
+                             'namespaces': [{'namespace': 'ns2',
+                                             'devices': ['tap1']}]},
+                            report)
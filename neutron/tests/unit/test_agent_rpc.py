@@ -14,9 +14,12 @@
 #    under the License.
 
 import mock
+from oslo.config import cfg
 from oslo import messaging
 
+from neutron.agent.common import config
 from neutron.agent import rpc
+from neutron.common import topics
 from neutron.openstack.common import context
 from neutron.tests import base
 
@@ -92,6 +95,20 @@ class AgentPluginReportState(base.BaseTestCase):
             self.assertIsInstance(cast.call_args[0][1]['args']['time'],
                                   str)
 
+    def test_plugin_report_state_topic(self):
+        config.register_agent_state_opts_helper(cfg.CONF)
+        self.assertEqual(topics.PLUGIN,
+                         rpc.PluginReportStateAPI(topics.PLUGIN).topic)
+        cfg.CONF.set_override('use_reports_topic', True, 'AGENT')
+        self.assertEqual(topics.REPORTS,
+                         rpc.PluginReportStateAPI(topics.PLUGIN).topic)
+        self.assertEqual('test', rpc.PluginReportStateAPI('test').topic)
+
+    def test_plugin_report_state_topic_without_agent_state_opts(self):
+        with mock.patch.object(rpc.cfg, 'CONF', new=cfg.ConfigOpts()):
+            self.assertEqual(topics.PLUGIN,
+                             rpc.PluginReportStateAPI(topics.PLUGIN).topic)
+
 
 class AgentRPCMethods(base.BaseTestCase):
     def test_create_consumers(self):
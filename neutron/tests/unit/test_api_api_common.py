@@ -16,10 +16,16 @@
 # @author: Zhongyue Luo, Intel Corporation.
 #
 
+import urllib
+import urlparse
+
+from oslo.config import cfg
 from testtools import matchers
+import webob
 from webob import exc
 
 from neutron.api import api_common as common
+from neutron.common import exceptions as n_exc
 from neutron.tests import base
 
 
@@ -95,3 +101,79 @@ class APICommonTestCase(base.BaseTestCase):
                           self.controller._prepare_request_body,
                           body,
                           params)
+
+
+class KeysetMarkerTestCase(base.BaseTestCase):
+
+    def test_encode_decode(self):
+        item = {'id': 'fake-id', 'name': 'net1', 'shared': False}
+        token = common.encode_keyset_marker(
+            item, [('name', True), ('id', True)])
+        marker = common.decode_keyset_marker(token)
+        self.assertEqual('net1', marker.name)
+        self.assertEqual('fake-id', marker.id)
+        self.assertEqual(set(['name', 'id']), set(marker.keys()))
+        self.assertRaises(AttributeError, getattr, marker, 'shared')
+
+    def test_decode_plain_marker(self):
+        self.assertIsNone(common.decode_keyset_marker(
+            'b3f5fe2c-aba0-4e06-8e0a-d7a2d2bc0d89'))
+        self.assertIsNone(common.decode_keyset_marker('not a token'))
+
+
+class PaginationNativeHelperTestCase(base.BaseTestCase):
+
+    def _get_helper(self, marker=None):
+        params = {'limit': '2'}
+        if marker:
+            params['marker'] = marker
+        request = webob.Request.blank('/networks?' + urllib.urlencode(params))
+        return common.PaginationNativeHelper(request)
+
+    def test_keyset_marker_passed_to_plugin(self):
+        cfg.CONF.set_override('allow_keyset_pagination', True)
+        token = common.encode_keyset_marker({'id': 'fake-id'},
+                                            [('id', True)])
+        helper = self._get_helper(token)
+        args = {}
+        helper.update_args(args)
+        self.assertIsInstance(args['marker'], common.KeysetMarker)
+        self.assertEqual('fake-id', args['marker'].id)
+
+    def test_keyset_marker_not_decoded_when_disabled(self):
+        token = common.encode_keyset_marker({'id': 'fake-id'},
+                                            [('id', True)])
+        helper = self._get_helper(token)
+        args = {'sorts': [('name', True)]}
+        helper.update_args(args)
+        self.assertEqual(token, args['marker'])
+
+    def test_keyset_marker_sort_keys_mismatch(self):
+        cfg.CONF.set_override('allow_keyset_pagination', True)
+        token = common.encode_keyset_marker({'id': 'fake-id'},
+                                            [('id', True)])
+        helper = self._get_helper(token)
+        self.assertRaises(n_exc.BadRequest, helper.update_args,
+                          {'sorts': [('name', True)]})
+
+    def test_plain_marker_passed_to_plugin(self):
+        helper = self._get_helper('fake-id')
+        args = {}
+        helper.update_args(args)
+        self.assertEqual('fake-id', args['marker'])
+
+    def test_links_use_keyset_tokens(self):
+        cfg.CONF.set_override('allow_keyset_pagination', True)
+        helper = self._get_helper()
+        helper.update_args({'sorts': [('name', True)]})
+        fields = ['id']
+        fields_to_add = []
+        helper.update_fields(fields, fields_to_add)
+        self.assertEqual(['name'], fields_to_add)
+        links = helper.get_links([{'id': 'a', 'name': 'n1'},
+                                  {'id': 'b', 'name': 'n2'}])
+        next_link = [l['href'] for l in links if l['rel'] == 'next'][0]
+        marker = urlparse.parse_qs(
+            urlparse.urlparse(next_link).query)['marker'][0]
+        marker = common.decode_keyset_marker(marker)
+        self.assertEqual(('n2', 'b'), (marker.name, marker.id))
@@ -0,0 +1,109 @@
+# Copyright 2014 OpenStack Foundation.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+
+import mock
+import sqlalchemy
+import webob
+import webob.dec
+
+from neutron.api import profiler
+from neutron.common import request_stats
+from neutron.openstack.common import jsonutils
+from neutron.tests import base
+
+
+class TestRequestStats(base.BaseTestCase):
+
+    def test_phase_outside_request_is_noop(self):
+        with request_stats.phase('plugin'):
+            pass
+        request_stats.record_sql(1.0)
+        self.assertIsNone(request_stats.current())
+
+    def test_phases_and_sql_are_recorded(self):
+        request_stats.start()
+        with request_stats.phase('plugin'):
+            pass
+        request_stats.timed('policy')(lambda: None)()
+        request_stats.record_sql(0.5)
+        request_stats.record_sql(0.25)
+        stats = request_stats.stop()
+        self.assertIsNone(request_stats.current())
+        self.assertEqual(set(['plugin', 'policy']), set(stats.phases))
+        self.assertEqual(2, stats.sql_count)
+        self.assertEqual(0.75, stats.sql_time)
+        self.assertIsNotNone(stats.elapsed)
+
+
+class TestRequestProfiler(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestRequestProfiler, self).setUp()
+        self.engine = sqlalchemy.create_engine('sqlite://')
+        mock.patch('neutron.db.api.get_engine',
+                   return_value=self.engine).start()
+
+    def _app(self, **kwargs):
+        @webob.dec.wsgify
+        def app(req):
+            with request_stats.phase('plugin'):
+                for i in range(3):
+                    self.engine.execute('select 1')
+            return webob.Response(body='ok')
+        return profiler.RequestProfiler(app, **kwargs)
+
+    def test_stats_in_header(self):
+        response = webob.Request.blank('/v2.0/networks').get_response(
+            self._app())
+        header = response.headers[profiler.PROFILE_HEADER]
+        values = dict(item.split('=') for item in header.split('; '))
+        self.assertEqual('3', values['sql_count'])
+        self.assertIn('plugin', values)
+        self.assertIn('total', values)
+
+    def test_no_header_when_disabled(self):
+        response = webob.Request.blank('/v2.0/networks').get_response(
+            self._app(headers='false'))
+        self.assertNotIn(profiler.PROFILE_HEADER, response.headers)
+
+    def test_stats_file(self):
+        stats_file = os.path.join(self.temp_dir, 'stats')
+        app = self._app(stats_file=stats_file)
+        for i in range(2):
+            webob.Request.blank('/v2.0/networks').get_response(app)
+        with open(stats_file) as f:
+            records = [jsonutils.loads(line) for line in f]
+        self.assertEqual(2, len(records))
+        self.assertEqual('/v2.0/networks', records[0]['path'])
+        self.assertEqual('GET', records[0]['method'])
+        self.assertEqual(200, records[0]['status'])
+        self.assertEqual(3, records[0]['sql_count'])
+
+    def test_slow_sampled_request_is_profiled(self):
+        profile_dir = os.path.join(self.temp_dir, 'profiles')
+        app = self._app(profile_dir=profile_dir, profile_sample_rate='1',
+                        profile_threshold='0')
+        req = webob.Request.blank('/v2.0/networks')
+        req.environ['openstack.request_id'] = 'req-1'
+        req.get_response(app)
+        self.assertEqual(['req-1.prof'], os.listdir(profile_dir))
+
+    def test_fast_request_profile_is_discarded(self):
+        profile_dir = os.path.join(self.temp_dir, 'profiles')
+        app = self._app(profile_dir=profile_dir, profile_sample_rate='1',
+                        profile_threshold='60')
+        webob.Request.blank('/v2.0/networks').get_response(app)
+        self.assertFalse(os.path.exists(profile_dir))
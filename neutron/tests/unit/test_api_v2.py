@@ -30,6 +30,7 @@ from neutron.api.v2 import attributes
 from neutron.api.v2 import base as v2_base
 from neutron.api.v2 import router
 from neutron.common import exceptions as n_exc
+from neutron.common import request_stats
 from neutron import context
 from neutron import manager
 from neutron.openstack.common import policy as common_policy
@@ -554,6 +555,25 @@ class JSONV2TestCase(APIv2TestBase, testlib_api.WebTestCase):
     def test_list_noauth(self):
         self._test_list(None, _uuid())
 
+    def test_list_records_request_phases(self):
+        instance = self.plugin.return_value
+        instance.get_networks.return_value = []
+        request_stats.start()
+        self.addCleanup(request_stats.stop)
+        self.api.get(_get_path('networks', fmt=self.fmt))
+        phases = request_stats.current().phases
+        self.assertIn('plugin', phases)
+        self.assertIn('serialize', phases)
+
+    def test_list_streamed(self):
+        cfg.CONF.set_override('stream_list_responses', True)
+        tenant_id = _uuid()
+        self._test_list(tenant_id, tenant_id)
+
+    def test_list_streamed_other_tenant(self):
+        cfg.CONF.set_override('stream_list_responses', True)
+        self._test_list(_uuid(), _uuid())
+
     def test_list_keystone(self):
         tenant_id = _uuid()
         self._test_list(tenant_id, tenant_id)
@@ -1050,6 +1070,59 @@ class JSONV2TestCase(APIv2TestBase, testlib_api.WebTestCase):
         tenant_id = _uuid()
         self._test_get(tenant_id + "another", tenant_id, 200)
 
+    def test_get_without_revision_has_no_etag(self):
+        res = self._test_get(None, _uuid(), 200)
+        self.assertNotIn('ETag', res.headers)
+
+    def test_get_with_etag(self):
+        instance = self.plugin.return_value
+        instance.get_network_revision = mock.Mock(return_value=3)
+        res = self._test_get(None, _uuid(), 200)
+        self.assertEqual('"3"', res.headers['ETag'])
+
+    def test_get_if_none_match_not_modified(self):
+        instance = self.plugin.return_value
+        instance.get_network_revision = mock.Mock(return_value=3)
+        instance.get_network.return_value = {'tenant_id': _uuid()}
+        res = self.api.get(_get_path('networks', id=_uuid(), fmt=self.fmt),
+                           headers={'If-None-Match': '"3"'})
+        self.assertEqual(exc.HTTPNotModified.code, res.status_int)
+        self.assertEqual('"3"', res.headers['ETag'])
+        fields = instance.get_network.call_args[1]['fields']
+        self.assertIn('tenant_id', fields)
+        self.assertNotIn('name', fields)
+
+    def test_get_if_none_match_not_authorized(self):
+        tenant_id = _uuid()
+        instance = self.plugin.return_value
+        instance.get_network_revision = mock.Mock(return_value=3)
+        instance.get_network.return_value = {'tenant_id': tenant_id,
+                                             'shared': False}
+        env = {'neutron.context': context.Context('', tenant_id + 'bad')}
+        res = self.api.get(_get_path('networks', id=_uuid(), fmt=self.fmt),
+                           headers={'If-None-Match': '"3"'},
+                           extra_environ=env, expect_errors=True)
+        self.assertEqual(exc.HTTPNotFound.code, res.status_int)
+        self.assertNotIn('ETag', res.headers)
+
+    def test_get_if_none_match_modified(self):
+        instance = self.plugin.return_value
+        instance.get_network_revision = mock.Mock(return_value=4)
+        instance.get_network.return_value = {'tenant_id': _uuid()}
+        res = self.api.get(_get_path('networks', id=_uuid(), fmt=self.fmt),
+                           headers={'If-None-Match': '"3"'})
+        self.assertEqual(200, res.status_int)
+        self.assertEqual('"4"', res.headers['ETag'])
+
+    def test_get_if_none_match_missing_resource(self):
+        instance = self.plugin.return_value
+        instance.get_network_revision = mock.Mock(return_value=None)
+        instance.get_network.side_effect = n_exc.NetworkNotFound(net_id='x')
+        res = self.api.get(_get_path('networks', id=_uuid(), fmt=self.fmt),
+                           headers={'If-None-Match': '"3"'},
+                           expect_errors=True)
+        self.assertEqual(exc.HTTPNotFound.code, res.status_int)
+
     def test_get_keystone_strip_admin_only_attribute(self):
         tenant_id = _uuid()
         # Inject rule in policy engine
@@ -0,0 +1,92 @@
+# Copyright 2014 OpenStack Foundation.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet
+import mock
+from oslo.config import cfg
+from oslo import messaging
+
+from neutron.common import rpc as n_rpc
+from neutron.tests import base
+
+
+class TestMethodPool(base.BaseTestCase):
+
+    def test_concurrency_is_bounded(self):
+        pool = n_rpc.MethodPool('heavy', 2)
+        running = []
+        max_running = []
+
+        def call(i):
+            running.append(i)
+            max_running.append(len(running))
+            eventlet.sleep(0.01)
+            running.remove(i)
+            return i
+
+        threads = [eventlet.spawn(pool.run, call, i) for i in range(5)]
+        self.assertEqual(range(5), [t.wait() for t in threads])
+        self.assertEqual(2, max(max_running))
+        stats = pool.get_stats()
+        self.assertEqual(5, stats['completed'])
+        self.assertEqual(0, stats['active'])
+        self.assertEqual(0, stats['waiting'])
+        self.assertTrue(stats['max_wait'] > 0)
+
+    def test_slot_released_on_error(self):
+        pool = n_rpc.MethodPool('heavy', 1)
+
+        def fail():
+            raise ValueError()
+        self.assertRaises(ValueError, pool.run, fail)
+        self.assertEqual(1, pool.run(lambda: 1))
+
+
+class TestRPCDispatcher(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestRPCDispatcher, self).setUp()
+        mock.patch.object(n_rpc, '_METHOD_POOLS', new={}).start()
+
+        class Endpoint(object):
+            def heavy(self, context, arg):
+                return arg
+
+            def light(self, context, arg):
+                return arg
+
+        self.dispatcher = n_rpc.RPCDispatcher(messaging.Target(),
+                                              [Endpoint()], mock.Mock())
+        self.dispatcher.serializer.deserialize_entity.side_effect = (
+            lambda ctxt, arg: arg)
+        self.dispatcher.serializer.serialize_entity.side_effect = (
+            lambda ctxt, arg: arg)
+        cfg.CONF.set_override('rpc_heavy_methods', ['heavy'])
+
+    def _dispatch(self, method):
+        return self.dispatcher._dispatch(
+            {}, {'method': method, 'args': {'arg': method}})
+
+    def test_no_pool_by_default(self):
+        self.assertEqual('heavy', self._dispatch('heavy'))
+        self.assertEqual({}, n_rpc.get_method_pool_stats())
+
+    def test_heavy_methods_run_in_pool(self):
+        cfg.CONF.set_override('rpc_heavy_method_concurrency', 4)
+        self.assertEqual('heavy', self._dispatch('heavy'))
+        self.assertEqual('light', self._dispatch('light'))
+        stats = n_rpc.get_method_pool_stats()
+        self.assertEqual(['heavy'], stats.keys())
+        self.assertEqual(1, stats['heavy']['completed'])
+        self.assertEqual(4, stats['heavy']['size'])
@@ -935,6 +935,27 @@ class TestPortsV2(NeutronDbPluginV2TestCase):
                                self.port()) as ports:
             self._test_list_resources('port', ports)
 
+    def test_list_ports_with_column_fields_skips_dict_building(self):
+        with self.port() as port:
+            plugin = manager.NeutronManager.get_plugin()
+            with mock.patch.object(plugin, '_make_port_dict') as make_dict:
+                req = self.new_list_request(
+                    'ports', params='fields=id&fields=device_id')
+                res = self.deserialize(self.fmt, req.get_response(self.api))
+            self.assertFalse(make_dict.called)
+            self.assertEqual([{'id': port['port']['id'],
+                               'device_id': port['port']['device_id']}],
+                             res['ports'])
+
+    def test_list_ports_with_relationship_fields(self):
+        with self.port() as port:
+            req = self.new_list_request(
+                'ports', params='fields=id&fields=fixed_ips')
+            res = self.deserialize(self.fmt, req.get_response(self.api))
+            self.assertEqual([{'id': port['port']['id'],
+                               'fixed_ips': port['port']['fixed_ips']}],
+                             res['ports'])
+
     def test_list_ports_filtered_by_fixed_ip(self):
         # for this test we need to enable overlapping ips
         cfg.CONF.set_default('allow_overlapping_ips', True)
@@ -1009,6 +1030,22 @@ fixed_ips=ip_address%%3D%s&fixed_ips=ip_address%%3D%s&fixed_ips=subnet_id%%3D%s
                                             (port1, port2, port3),
                                             ('mac_address', 'asc'), 2, 2)
 
+    def test_list_ports_with_keyset_pagination(self):
+        if self._skip_native_pagination:
+            self.skipTest("Skip test for not implemented pagination feature")
+        cfg.CONF.set_override('allow_keyset_pagination', True)
+        cfg.CONF.set_default('allow_overlapping_ips', True)
+        with contextlib.nested(self.port(mac_address='00:00:00:00:00:01'),
+                               self.port(mac_address='00:00:00:00:00:02'),
+                               self.port(mac_address='00:00:00:00:00:03')
+                               ) as (port1, port2, port3):
+            plugin = manager.NeutronManager.get_plugin()
+            with mock.patch.object(plugin, '_get_port') as get_port:
+                self._test_list_with_pagination('port',
+                                                (port1, port2, port3),
+                                                ('mac_address', 'asc'), 2, 2)
+            self.assertFalse(get_port.called)
+
     def test_list_ports_with_pagination_emulated(self):
         helper_patcher = mock.patch(
             'neutron.api.v2.base.Controller._get_pagination_helper',
@@ -1250,6 +1287,76 @@ fixed_ips=ip_address%%3D%s&fixed_ips=ip_address%%3D%s&fixed_ips=subnet_id%%3D%s
             res = self._create_port(self.fmt, net_id=net_id, **kwargs)
             self.assertEqual(res.status_int, webob.exc.HTTPConflict.code)
 
+    def test_create_ports_bulk_duplicate_mac(self):
+        with self.network() as net:
+            overrides = {0: {'mac_address': '12:34:56:78:90:ab'},
+                         1: {'mac_address': '12:34:56:78:90:ab'}}
+            res = self._create_port_bulk(self.fmt, 2, net['network']['id'],
+                                         'test', True, override=overrides)
+            self._validate_behavior_on_bulk_failure(
+                res, 'ports', webob.exc.HTTPConflict.code)
+
+    def test_generate_macs_retries_duplicates(self):
+        plugin = manager.NeutronManager.get_plugin()
+        ctx = context.get_admin_context()
+        with self.port() as port:
+            mac = port['port']['mac_address']
+            net_id = port['port']['network_id']
+            with mock.patch.object(neutron.db.db_base_plugin_v2.utils,
+                                   'get_random_mac',
+                                   side_effect=[mac, 'fa:16:3e:00:00:01',
+                                                'fa:16:3e:00:00:02',
+                                                'fa:16:3e:00:00:02']):
+                macs = plugin._generate_macs(ctx, net_id, 2)
+            self.assertEqual(['fa:16:3e:00:00:01', 'fa:16:3e:00:00:02'],
+                             sorted(macs))
+
+    def test_generate_macs_fails_early_on_full_pool(self):
+        plugin = manager.NeutronManager.get_plugin()
+        ctx = context.get_admin_context()
+        with self.port() as port:
+            mac = port['port']['mac_address']
+            usage = {'network_id': port['port']['network_id'],
+                     'used': 2 ** 24, 'size': 2 ** 24, 'ratio': 1.0}
+            with contextlib.nested(
+                mock.patch.object(neutron.db.db_base_plugin_v2.utils,
+                                  'get_random_mac', return_value=mac),
+                mock.patch.object(neutron.db.db_base_plugin_v2.
+                                  NeutronDbPluginV2, 'get_mac_pool_usage',
+                                  return_value=usage)
+            ) as (get_random_mac, get_usage):
+                self.assertRaises(n_exc.MacAddressGenerationFailure,
+                                  plugin._generate_macs, ctx,
+                                  port['port']['network_id'], 1)
+            self.assertEqual(1, get_random_mac.call_count)
+
+    def test_get_mac_pool_usage(self):
+        cfg.CONF.set_override('base_mac', 'fa:16:3e:00:00:00')
+        plugin = manager.NeutronManager.get_plugin()
+        ctx = context.get_admin_context()
+        with self.port() as port:
+            usage = plugin.get_mac_pool_usage(ctx,
+                                              port['port']['network_id'])
+            self.assertEqual(1, usage['used'])
+            self.assertEqual(2 ** 24, usage['size'])
+            cfg.CONF.set_override('base_mac', '12:34:56:78:00:00')
+            usage = plugin.get_mac_pool_usage(ctx,
+                                              port['port']['network_id'])
+            self.assertEqual(0, usage['used'])
+            self.assertEqual(2 ** 16, usage['size'])
+
+    def test_generate_macs_exhaustion(self):
+        cfg.CONF.set_override('mac_generation_retries', 2)
+        plugin = manager.NeutronManager.get_plugin()
+        ctx = context.get_admin_context()
+        with self.port() as port:
+            mac = port['port']['mac_address']
+            with mock.patch.object(neutron.db.db_base_plugin_v2.utils,
+                                   'get_random_mac', return_value=mac):
+                self.assertRaises(n_exc.MacAddressGenerationFailure,
+                                  plugin._generate_macs, ctx,
+                                  port['port']['network_id'], 1)
+
     def test_mac_generation(self):
         cfg.CONF.set_override('base_mac', "12:34:56:00:00:00")
         with self.port() as port:
@@ -1701,9 +1808,13 @@ fixed_ips=ip_address%%3D%s&fixed_ips=ip_address%%3D%s&fixed_ips=subnet_id%%3D%s
     def _test_delete_ports_by_device_id_second_call_failure(self, plugin):
         ctx = context.get_admin_context()
         with self.subnet() as subnet:
+            # The ports are listed in insertion order, or in MAC address
+            # order when the network and MAC address index is used
             with contextlib.nested(
-                self.port(subnet=subnet, device_id='owner1', do_delete=False),
-                self.port(subnet=subnet, device_id='owner1'),
+                self.port(subnet=subnet, device_id='owner1', do_delete=False,
+                          mac_address='fa:16:3e:00:00:01'),
+                self.port(subnet=subnet, device_id='owner1',
+                          mac_address='fa:16:3e:00:00:02'),
                 self.port(subnet=subnet, device_id='owner2'),
             ) as (p1, p2, p3):
                 orig = plugin.delete_port
@@ -1796,6 +1907,105 @@ class TestNetworksV2(NeutronDbPluginV2TestCase):
             self.assertEqual(res['network']['name'],
                              data['network']['name'])
 
+    def test_show_network_conditional_get(self):
+        with self.network() as network:
+            net_id = network['network']['id']
+            res = self.new_show_request('networks', net_id).get_response(
+                self.api)
+            self.assertEqual(webob.exc.HTTPOk.code, res.status_int)
+            etag = res.headers['ETag']
+
+            req = self.new_show_request('networks', net_id)
+            req.headers['If-None-Match'] = etag
+            res = req.get_response(self.api)
+            self.assertEqual(webob.exc.HTTPNotModified.code, res.status_int)
+            self.assertEqual(etag, res.headers['ETag'])
+
+            data = {'network': {'name': 'a_brand_new_name'}}
+            self.new_update_request('networks', data,
+                                    net_id).get_response(self.api)
+            req = self.new_show_request('networks', net_id)
+            req.headers['If-None-Match'] = etag
+            res = req.get_response(self.api)
+            self.assertEqual(webob.exc.HTTPOk.code, res.status_int)
+            self.assertNotEqual(etag, res.headers['ETag'])
+
+    def test_network_etag_depends_on_fields(self):
+        with self.network() as network:
+            net_id = network['network']['id']
+            res = self.new_show_request('networks', net_id).get_response(
+                self.api)
+            req = self.new_show_request('networks', net_id, fields=['name'])
+            req.headers['If-None-Match'] = res.headers['ETag']
+            res = req.get_response(self.api)
+            self.assertEqual(webob.exc.HTTPOk.code, res.status_int)
+
+    def test_show_network_conditional_get_subnet_changes(self):
+        with self.network() as network:
+            net_id = network['network']['id']
+            res = self.new_show_request('networks', net_id).get_response(
+                self.api)
+            etag = res.headers['ETag']
+            with self.subnet(network=network):
+                req = self.new_show_request('networks', net_id)
+                req.headers['If-None-Match'] = etag
+                res = req.get_response(self.api)
+                self.assertEqual(webob.exc.HTTPOk.code, res.status_int)
+                self.assertEqual(
+                    1, len(self.deserialize(self.fmt,
+                                            res)['network']['subnets']))
+                etag = res.headers['ETag']
+            req = self.new_show_request('networks', net_id)
+            req.headers['If-None-Match'] = etag
+            res = req.get_response(self.api)
+            self.assertEqual(webob.exc.HTTPOk.code, res.status_int)
+            self.assertEqual(
+                [], self.deserialize(self.fmt, res)['network']['subnets'])
+
+    def test_network_revision_bumped_on_status_change(self):
+        plugin = manager.NeutronManager.get_plugin()
+        ctx = context.get_admin_context()
+        with self.network() as network:
+            net_id = network['network']['id']
+            revision = plugin.get_network_revision(ctx, net_id)
+            with ctx.session.begin(subtransactions=True):
+                plugin._get_network(ctx, net_id).status = 'DOWN'
+            self.assertEqual(revision + 1,
+                             plugin.get_network_revision(ctx, net_id))
+
+    def test_network_revision_bumped_by_concurrent_updates(self):
+        plugin = manager.NeutronManager.get_plugin()
+        ctx1 = context.get_admin_context()
+        ctx2 = context.get_admin_context()
+        with self.network() as network:
+            net_id = network['network']['id']
+            revision = plugin.get_network_revision(ctx1, net_id)
+            net1 = plugin._get_network(ctx1, net_id)
+            net2 = plugin._get_network(ctx2, net_id)
+            for ctx, net in ((ctx1, net1), (ctx2, net2)):
+                with ctx.session.begin(subtransactions=True):
+                    net.bump_revision()
+            self.assertEqual(revision + 2,
+                             plugin.get_network_revision(ctx1, net_id))
+
+    def test_loaded_network_revision_refreshed_on_subnet_change(self):
+        plugin = manager.NeutronManager.get_plugin()
+        ctx = context.get_admin_context()
+        with self.network() as network:
+            net_id = network['network']['id']
+            net = plugin._get_network(ctx, net_id)
+            revision = net.revision_number
+            with ctx.session.begin(subtransactions=True):
+                ctx.session.add(models_v2.Subnet(
+                    network_id=net_id, ip_version=4, cidr='10.0.0.0/24'))
+            self.assertEqual(revision + 1, net.revision_number)
+
+    def test_network_revision_not_visible_to_other_tenants(self):
+        plugin = manager.NeutronManager.get_plugin()
+        with self.network() as network:
+            self.assertIsNone(plugin.get_network_revision(
+                context.Context('', 'somebody'), network['network']['id']))
+
     def test_update_shared_network_noadmin_returns_403(self):
         with self.network(shared=True) as network:
             data = {'network': {'name': 'a_brand_new_name'}}
@@ -3530,6 +3740,26 @@ class TestSubnetsV2(NeutronDbPluginV2TestCase):
                                             (subnet1, subnet2, subnet3),
                                             ('cidr', 'asc'), 2, 2)
 
+    def test_list_subnets_with_pagination_native_nullable_key(self):
+        if self._skip_native_pagination:
+            self.skipTest("Skip test for not implemented sorting feature")
+        with contextlib.nested(self.subnet(cidr='10.0.0.0/24',
+                                           gateway_ip=None),
+                               self.subnet(cidr='11.0.0.0/24',
+                                           gateway_ip=None),
+                               self.subnet(cidr='12.0.0.0/24')
+                               ) as (subnet1, subnet2, subnet3):
+            # subnets without a gateway sort first in ascending order,
+            # ordered by id
+            no_gateway = sorted((subnet1, subnet2),
+                                key=lambda subnet: subnet['subnet']['id'])
+            self._test_list_with_pagination('subnet',
+                                            no_gateway + [subnet3],
+                                            ('gateway_ip', 'asc'), 1, 4)
+            self._test_list_with_pagination('subnet',
+                                            [subnet3] + no_gateway,
+                                            ('gateway_ip', 'desc'), 1, 4)
+
     def test_list_subnets_with_pagination_emulated(self):
         helper_patcher = mock.patch(
             'neutron.api.v2.base.Controller._get_pagination_helper',
@@ -3859,7 +4089,7 @@ class DbModelTestCase(base.BaseTestCase):
         actual_repr_output = repr(network)
         exp_start_with = "<neutron.db.models_v2.Network"
         exp_middle = "[object at %x]" % id(network)
-        exp_end_with = (" {tenant_id=None, id=None, "
+        exp_end_with = (" {tenant_id=None, id=None, revision_number=None, "
                         "name='net_net', status='OK', "
                         "admin_state_up=True, shared=None}>")
         final_exp = exp_start_with + exp_middle + exp_end_with
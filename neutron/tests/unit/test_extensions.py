@@ -14,6 +14,8 @@
 #    under the License.
 
 import abc
+import imp
+import os
 
 import mock
 import routes
@@ -597,6 +599,65 @@ class PluginAwareExtensionManagerTest(base.BaseTestCase):
                           '', plugin_info)
 
 
+class ExtensionManifestTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(ExtensionManifestTest, self).setUp()
+        self.manifest_file = os.path.join(self.temp_dir, 'manifest.json')
+        config.cfg.CONF.set_override('api_extensions_manifest',
+                                     self.manifest_file)
+
+        class FoxInSocksPlugin(object):
+            supported_extension_aliases = ["FOXNSOX"]
+
+            def method_to_support_foxnsox_extension(self):
+                pass
+
+        self.plugin_info = {constants.CORE: FoxInSocksPlugin()}
+
+    def _create_ext_mgr(self):
+        with mock.patch('imp.load_source',
+                        side_effect=imp.load_source) as load_source:
+            ext_mgr = extensions.PluginAwareExtensionManager(
+                extensions_path, self.plugin_info)
+        loaded = set(os.path.basename(call[0][1])
+                     for call in load_source.call_args_list)
+        return ext_mgr, loaded
+
+    def test_manifest_skips_unneeded_extensions(self):
+        ext_mgr, loaded = self._create_ext_mgr()
+        self.assertIn('foxinsocks.py', loaded)
+        self.assertIn('v2attributes.py', loaded)
+        with open(self.manifest_file) as f:
+            entries = jsonutils.loads(f.read())
+        aliases = set(entry['alias'] for entry in entries.values())
+        self.assertIn('FOXNSOX', aliases)
+        self.assertIn('v2attrs', aliases)
+
+        ext_mgr, loaded = self._create_ext_mgr()
+        self.assertEqual(set(['foxinsocks.py']), loaded)
+        self.assertEqual(['FOXNSOX'], ext_mgr.extensions.keys())
+
+    def test_manifest_ignores_changed_files(self):
+        ext_mgr, loaded = self._create_ext_mgr()
+        manifest = extensions.ExtensionManifest(self.manifest_file)
+        for entry in manifest.entries.values():
+            entry['size'] += 1
+        manifest.dirty = True
+        manifest.save()
+
+        ext_mgr, loaded = self._create_ext_mgr()
+        self.assertIn('v2attributes.py', loaded)
+        self.assertEqual(['FOXNSOX'], ext_mgr.extensions.keys())
+
+    def test_unreadable_manifest_is_ignored(self):
+        with open(self.manifest_file, 'w') as f:
+            f.write('not json')
+        ext_mgr, loaded = self._create_ext_mgr()
+        self.assertIn('v2attributes.py', loaded)
+        self.assertEqual(['FOXNSOX'], ext_mgr.extensions.keys())
+
+
 class ExtensionControllerTest(testlib_api.WebTestCase):
 
     def setUp(self):
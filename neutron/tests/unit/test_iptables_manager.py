@@ -824,6 +824,62 @@ class IptablesManagerStateFulTestCase(base.BaseTestCase):
     def test_get_traffic_counters_with_zero_with_ipv6(self):
         self._test_get_traffic_counters_with_zero_helper(True)
 
+    def test_get_traffic_counters_by_chain(self):
+        filter_table = self.iptables.ipv4['filter']
+        filter_table.add_chain('meter-l-1', wrap=False)
+        filter_table.add_chain('meter-l-2', wrap=False)
+        filter_table.add_chain('meter-l-3', wrap=False)
+        iptables_dump = (
+            '# Generated by iptables-save\n'
+            '*filter\n'
+            ':meter-l-1 - [0:0]\n'
+            ':meter-l-2 - [0:0]\n'
+            ':meter-l-3 - [0:0]\n'
+            '[12:1000] -A %(bn)s-OUTPUT -j meter-l-1\n'
+            '[400:65901] -A meter-l-1\n'
+            '[100:200] -A meter-l-2 -d 10.0.0.0/24\n'
+            '[5:10] -A meter-l-2 -s 10.0.0.0/24\n'
+            'COMMIT\n' % IPTABLES_ARG)
+        expected_calls_and_values = [
+            (mock.call(['iptables-save', '-c', '-t', 'filter'],
+                       root_helper=self.root_helper),
+             iptables_dump)]
+        tools.setup_mock_calls(self.execute, expected_calls_and_values)
+
+        accs = self.iptables.get_traffic_counters_by_chain(
+            ['meter-l-1', 'meter-l-2', 'meter-l-3', 'meter-l-4'], wrap=False)
+
+        self.assertEqual({'meter-l-1': {'pkts': 400, 'bytes': 65901},
+                          'meter-l-2': {'pkts': 105, 'bytes': 210},
+                          'meter-l-3': {'pkts': 0, 'bytes': 0}}, accs)
+        tools.verify_mock_calls(self.execute, expected_calls_and_values)
+
+    def test_get_traffic_counters_by_chain_wrapped_with_ipv6(self):
+        self.iptables = iptables_manager.IptablesManager(
+            root_helper=self.root_helper, namespace='ns', use_ipv6=True)
+        self.execute = mock.patch.object(self.iptables, "execute").start()
+        iptables_dump = ('[3:30] -A %(bn)s-OUTPUT -j ACCEPT\n'
+                         '[4:40] -A %(bn)s-INPUT -j ACCEPT\n' % IPTABLES_ARG)
+        expected_calls_and_values = [
+            (mock.call(['ip', 'netns', 'exec', 'ns', 'iptables-save', '-c',
+                        '-t', 'filter'],
+                       root_helper=self.root_helper),
+             iptables_dump),
+            (mock.call(['ip', 'netns', 'exec', 'ns', 'iptables-save', '-c',
+                        '-t', 'nat'],
+                       root_helper=self.root_helper),
+             ''),
+            (mock.call(['ip', 'netns', 'exec', 'ns', 'ip6tables-save', '-c',
+                        '-t', 'filter'],
+                       root_helper=self.root_helper),
+             iptables_dump)]
+        tools.setup_mock_calls(self.execute, expected_calls_and_values)
+
+        accs = self.iptables.get_traffic_counters_by_chain(['OUTPUT'])
+
+        self.assertEqual({'OUTPUT': {'pkts': 6, 'bytes': 60}}, accs)
+        tools.verify_mock_calls(self.execute, expected_calls_and_values)
+
     def _test_find_last_entry(self, find_str):
         filter_list = [':neutron-filter-top - [0:0]',
                        ':%(bn)s-FORWARD - [0:0]',
@@ -848,6 +904,38 @@ class IptablesManagerStateFulTestCase(base.BaseTestCase):
         ret_str = self._test_find_last_entry(find_str)
         self.assertIsNone(ret_str)
 
+    def test_set_rules_by_tag(self):
+        nat = self.iptables.ipv4['nat']
+        nat.add_rule('PREROUTING', '-d 1.1.1.1 -j DNAT --to 10.0.0.1',
+                     tag='floating_ip')
+        nat.add_rule('PREROUTING', '-d 2.2.2.2 -j DNAT --to 10.0.0.2',
+                     tag='floating_ip')
+        nat.add_rule('snat', '-j $float-snat')
+        kept = nat.rules[0]
+
+        nat.set_rules_by_tag(
+            'floating_ip',
+            [('PREROUTING', '-d 1.1.1.1 -j DNAT --to 10.0.0.1'),
+             ('float-snat', '-s 10.0.0.3 -j SNAT --to 3.3.3.3')])
+
+        tagged = [(r.chain, r.rule) for r in nat.rules
+                  if r.tag == 'floating_ip']
+        self.assertEqual([('PREROUTING', '-d 1.1.1.1 -j DNAT --to 10.0.0.1'),
+                          ('float-snat', '-s 10.0.0.3 -j SNAT --to 3.3.3.3')],
+                         tagged)
+        self.assertIs(kept, nat.rules[0])
+        self.assertIn(iptables_manager.IptablesRule(
+            'snat', '-j %s-float-snat' % iptables_manager.binary_name),
+            nat.rules)
+
+        nat.set_rules_by_tag('floating_ip', [])
+        self.assertFalse([r for r in nat.rules if r.tag == 'floating_ip'])
+
+    def test_set_rules_by_tag_unknown_chain(self):
+        self.assertRaises(LookupError,
+                          self.iptables.ipv4['nat'].set_rules_by_tag,
+                          'floating_ip', [('nonexistent', '-j DROP')])
+
 
 class IptablesManagerStateLessTestCase(base.BaseTestCase):
 
@@ -602,6 +602,41 @@ class TestBasicRouterOperations(base.BaseTestCase):
         self.mock_ip.netns.execute.assert_any_call(
             arping_cmd, check_exit_code=True)
 
+    def test_send_gratuitous_arp_packet_single_sender(self):
+        self.send_arp_p.stop()
+        self.conf.set_override('send_arp_rate_limit', 0)
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        with contextlib.nested(
+            mock.patch.object(l3_agent.eventlet, 'spawn_n'),
+            mock.patch.object(agent, '_arping')) as (spawn_n, arping):
+            agent._send_gratuitous_arp_packet('ns', 'qg-1', '20.0.0.101')
+            agent._send_gratuitous_arp_packet('ns', 'qg-1', '20.0.0.102')
+            agent._send_gratuitous_arp_packet('ns', 'qg-1', '20.0.0.101')
+            # only one sender is started for the whole burst
+            spawn_n.assert_called_once_with(
+                agent._send_queued_gratuitous_arps)
+            spawn_n.reset_mock()
+            agent._send_queued_gratuitous_arps()
+        self.assertEqual(
+            [mock.call(arping, 'ns', 'qg-1', '20.0.0.101', False),
+             mock.call(arping, 'ns', 'qg-1', '20.0.0.102', False)],
+            spawn_n.call_args_list)
+        self.assertFalse(agent._garp_sender_running)
+
+    def test_send_gratuitous_arp_packet_rate_limited(self):
+        self.send_arp_p.stop()
+        self.conf.set_override('send_arp_rate_limit', 4)
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        agent._garp_queue[('ns', 'qg-1', '20.0.0.101', False)] = None
+        agent._garp_queue[('ns', 'qg-1', '20.0.0.102', False)] = None
+        with contextlib.nested(
+            mock.patch.object(l3_agent.eventlet, 'spawn_n'),
+            mock.patch.object(l3_agent.eventlet, 'sleep')
+        ) as (spawn_n, sleep):
+            agent._send_queued_gratuitous_arps()
+        self.assertEqual(2, spawn_n.call_count)
+        sleep.assert_has_calls([mock.call(0.25), mock.call(0.25)])
+
     def test_arping_namespace(self):
         self._test_arping(namespace=True)
 
@@ -804,13 +839,15 @@ class TestBasicRouterOperations(base.BaseTestCase):
         # Test basic case
         ports[0]['subnet']['id'] = _get_subnet_id(ports[0])
         agent._set_subnet_arp_info(ri, ports[0])
-        self.mock_ip_dev.neigh.add.assert_called_once_with(
-            4, '1.2.3.4', '00:11:22:33:44:55')
+        self.mock_ip.batch.assert_called_once_with(
+            [('neigh', 'replace', '1.2.3.4', 'lladdr', '00:11:22:33:44:55',
+              'nud', 'permanent', 'dev',
+              agent.get_internal_device_name(ports[0]['id']))])
 
         # Test negative case
         router['distributed'] = False
         agent._set_subnet_arp_info(ri, ports[0])
-        self.mock_ip_dev.neigh.add.never_called()
+        self.assertEqual(1, self.mock_ip.batch.call_count)
 
     def test_add_arp_entry(self):
         agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
@@ -858,6 +895,46 @@ class TestBasicRouterOperations(base.BaseTestCase):
             4, '1.5.25.15', '00:44:33:22:11:55')
         agent.router_deleted(None, router['id'])
 
+    def test_update_arp_entries(self):
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        router = prepare_router_data(num_internal_ports=2)
+        ports = router[l3_constants.INTERFACE_KEY]
+        entries = [{'ip_address': '1.5.25.15',
+                    'mac_address': '00:44:33:22:11:55',
+                    'subnet_id': _get_subnet_id(ports[0]),
+                    'operation': 'add'},
+                   {'ip_address': '1.5.26.16',
+                    'mac_address': '00:44:33:22:11:66',
+                    'subnet_id': _get_subnet_id(ports[1]),
+                    'operation': 'delete'},
+                   {'ip_address': '1.5.27.17',
+                    'mac_address': '00:44:33:22:11:77',
+                    'subnet_id': FAKE_ID,
+                    'operation': 'add'}]
+        payload = {'arp_entries': entries, 'router_id': router['id']}
+        agent._router_added(router['id'], router)
+        self.mock_ip.reset_mock()
+        agent.update_arp_entries(None, payload)
+        agent.router_deleted(None, router['id'])
+        self.mock_ip.batch.assert_called_once_with(
+            [('neigh', 'replace', '1.5.25.15', 'lladdr', '00:44:33:22:11:55',
+              'nud', 'permanent', 'dev',
+              agent.get_internal_device_name(ports[0]['id'])),
+             ('neigh', 'del', '1.5.26.16', 'lladdr', '00:44:33:22:11:66',
+              'dev', agent.get_internal_device_name(ports[1]['id']))])
+
+    def test_update_arp_entries_failure_triggers_fullsync(self):
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        router = prepare_router_data(num_internal_ports=1)
+        ri = l3_agent.RouterInfo(router['id'], self.conf.root_helper,
+                                 self.conf.use_namespaces, router=router)
+        subnet_id = _get_subnet_id(router[l3_constants.INTERFACE_KEY][0])
+        agent.fullsync = False
+        self.mock_ip.batch.side_effect = RuntimeError()
+        agent._update_arp_entries(
+            ri, [('1.5.25.15', '00:44:33:22:11:55', subnet_id, 'add')])
+        self.assertTrue(agent.fullsync)
+
     def test_process_cent_router(self):
         router = prepare_router_data()
         ri = l3_agent.RouterInfo(router['id'], self.conf.root_helper,
@@ -963,7 +1040,10 @@ class TestBasicRouterOperations(base.BaseTestCase):
                 ri, {'id': _uuid()})
         self.assertEqual({fip_id: l3_constants.FLOATINGIP_STATUS_ACTIVE},
                          fip_statuses)
-        device.addr.add.assert_called_once_with(4, '15.1.2.3/32', '15.1.2.3')
+        self.mock_ip.batch.assert_called_once_with(
+            [('addr', 'add', '15.1.2.3/32', 'brd', '15.1.2.3',
+              'scope', 'global', 'dev', mock.ANY)])
+        self.assertFalse(device.addr.add.called)
 
     def test_process_router_floating_ip_nat_rules_add(self):
         fip = {
@@ -981,10 +1061,9 @@ class TestBasicRouterOperations(base.BaseTestCase):
         agent.process_router_floating_ip_nat_rules(ri)
 
         nat = ri.iptables_manager.ipv4['nat']
-        nat.clear_rules_by_tag.assert_called_once_with('floating_ip')
         rules = agent.floating_forward_rules('15.1.2.3', '192.168.0.1')
-        for chain, rule in rules:
-            nat.add_rule.assert_any_call(chain, rule, tag='floating_ip')
+        nat.set_rules_by_tag.assert_called_once_with('floating_ip', rules)
+        self.assertFalse(nat.clear_rules_by_tag.called)
 
     def test_process_router_cent_floating_ip_add(self):
         fake_floatingips = {'floatingips': [
@@ -1044,7 +1123,9 @@ class TestBasicRouterOperations(base.BaseTestCase):
         fip_statuses = agent.process_router_floating_ip_addresses(
             ri, {'id': _uuid()})
         self.assertEqual({}, fip_statuses)
-        device.addr.delete.assert_called_once_with(4, '15.1.2.3/32')
+        self.mock_ip.batch.assert_called_once_with(
+            [('addr', 'del', '15.1.2.3/32', 'dev', mock.ANY)])
+        self.assertFalse(device.addr.delete.called)
 
     def test_process_router_floating_ip_nat_rules_remove(self):
         ri = mock.MagicMock()
@@ -1055,8 +1136,7 @@ class TestBasicRouterOperations(base.BaseTestCase):
         agent.process_router_floating_ip_nat_rules(ri)
 
         nat = ri.iptables_manager.ipv4['nat']
-        nat = ri.iptables_manager.ipv4['nat`']
-        nat.clear_rules_by_tag.assert_called_once_with('floating_ip')
+        nat.set_rules_by_tag.assert_called_once_with('floating_ip', [])
 
     @mock.patch('neutron.agent.linux.ip_lib.IPDevice')
     def test_process_router_floating_ip_addresses_remap(self, IPDevice):
@@ -1081,6 +1161,7 @@ class TestBasicRouterOperations(base.BaseTestCase):
         self.assertEqual({fip_id: l3_constants.FLOATINGIP_STATUS_ACTIVE},
                          fip_statuses)
 
+        self.assertFalse(self.mock_ip.batch.called)
         self.assertFalse(device.addr.add.called)
         self.assertFalse(device.addr.delete.called)
 
@@ -1104,9 +1185,39 @@ class TestBasicRouterOperations(base.BaseTestCase):
 
         self.assertIsNone(fip_statuses.get(fip_id))
 
+    @mock.patch('neutron.agent.linux.ip_lib.IPDevice')
+    def test_process_router_floating_ip_batch_error_retries(self, IPDevice):
+        IPDevice.return_value = device = mock.Mock()
+        self.mock_ip.batch.side_effect = RuntimeError
+        # 15.1.2.3 made it in before the batch failed, 15.1.2.5 was removed
+        device.addr.list.side_effect = [[{'cidr': '15.1.2.5/32'}],
+                                        [{'cidr': '15.1.2.3/32'}]]
+        fips = [{'id': _uuid(), 'port_id': _uuid(),
+                 'floating_ip_address': '15.1.2.3',
+                 'fixed_ip_address': '192.168.0.2'},
+                {'id': _uuid(), 'port_id': _uuid(),
+                 'floating_ip_address': '15.1.2.4',
+                 'fixed_ip_address': '192.168.0.3'}]
+        ri = mock.MagicMock()
+        ri.router.get.return_value = fips
+        ri.router['distributed'].__nonzero__ = lambda self: False
+
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+
+        fip_statuses = agent.process_router_floating_ip_addresses(
+            ri, {'id': _uuid()})
+
+        self.assertEqual(
+            {fips[0]['id']: l3_constants.FLOATINGIP_STATUS_ACTIVE,
+             fips[1]['id']: l3_constants.FLOATINGIP_STATUS_ACTIVE},
+            fip_statuses)
+        device.addr.add.assert_called_once_with(4, '15.1.2.4/32', '15.1.2.4')
+        self.assertFalse(device.addr.delete.called)
+
     @mock.patch('neutron.agent.linux.ip_lib.IPDevice')
     def test_process_router_floating_ip_with_device_add_error(self, IPDevice):
         IPDevice.return_value = device = mock.Mock()
+        self.mock_ip.batch.side_effect = RuntimeError
         device.addr.add.side_effect = processutils.ProcessExecutionError
         device.addr.list.return_value = []
         fip_id = _uuid()
@@ -1269,6 +1380,27 @@ class TestBasicRouterOperations(base.BaseTestCase):
         self.assertNotIn('prefix',
                          self.utils_replace_file.call_args[0][1].split())
 
+    def test_process_router_ipv6_interface_radvd_conf_unchanged(self):
+        router = prepare_router_data()
+        ri = self._process_router_ipv6_interface_added(router)
+        radvd_conf = self.utils_replace_file.call_args[0][1]
+        self.external_process.reset_mock()
+        self.utils_replace_file.reset_mock()
+
+        # process the router again as a restarted agent would
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        agent.external_gateway_added = mock.Mock()
+        ri.internal_ports = []
+        with mock.patch('neutron.agent.linux.utils.get_value_from_conf_file',
+                        return_value=radvd_conf):
+            agent.process_router(ri)
+
+        expected_calls = self._expected_call_lookup_ri_process(ri, 'radvd')
+        expected_calls.append(mock.call().enable(mock.ANY, False))
+        self.assertEqual(expected_calls, self.external_process.mock_calls)
+        self.assertNotIn(radvd_conf, [c[0][1] for c in
+                                      self.utils_replace_file.call_args_list])
+
     def test_process_router_ipv6_slaac_interface_added(self):
         router = prepare_router_data()
         ri = self._process_router_ipv6_interface_added(
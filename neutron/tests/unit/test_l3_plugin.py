@@ -22,6 +22,7 @@ import netaddr
 from oslo.config import cfg
 from webob import exc
 
+from neutron.api.rpc.agentnotifiers import l3_rpc_agent_api
 from neutron.api.rpc.handlers import l3_rpc
 from neutron.api.v2 import attributes
 from neutron.common import constants as l3_constants
@@ -673,6 +674,18 @@ class L3NatTestCaseBase(L3NatTestCaseMixin):
             body = self._show('routers', r['router']['id'])
             self.assertEqual(body['router']['name'], rname2)
 
+    def test_router_update_bumps_revision(self):
+        plugin = manager.NeutronManager.get_service_plugins().get(
+            service_constants.L3_ROUTER_NAT)
+        ctx = context.get_admin_context()
+        with self.router() as r:
+            router_id = r['router']['id']
+            revision = plugin.get_router_revision(ctx, router_id)
+            self._update('routers', router_id,
+                         {'router': {'name': 'nachorouter'}})
+            self.assertEqual(revision + 1,
+                             plugin.get_router_revision(ctx, router_id))
+
     def test_router_update_gateway(self):
         with self.router() as r:
             with self.subnet() as s1:
@@ -2096,6 +2109,55 @@ class L3RpcCallbackTestCase(base.BaseTestCase):
         self.assertEqual(expected_message, actual_message)
 
 
+class L3AgentNotifyAPITestCase(base.BaseTestCase):
+
+    def setUp(self):
+        super(L3AgentNotifyAPITestCase, self).setUp()
+        self.notifier = l3_rpc_agent_api.L3AgentNotifyAPI()
+        self.arp_notification = mock.patch.object(
+            self.notifier, '_arp_notification').start()
+
+    def test_queue_arp_entry_batches_per_router(self):
+        arp_table = {'ip_address': '10.0.0.2',
+                     'mac_address': 'fa:16:3e:00:00:02',
+                     'subnet_id': 'foo_subnet_id'}
+        with mock.patch('eventlet.spawn_n') as spawn_n:
+            self.notifier.queue_arp_entry(
+                mock.ANY, 'router1', arp_table, 'add', 2)
+            self.notifier.queue_arp_entry(
+                mock.ANY, 'router1', arp_table, 'delete', 2)
+            self.notifier.queue_arp_entry(
+                mock.ANY, 'router2', arp_table, 'add', 2)
+        self.assertEqual(1, spawn_n.call_count)
+        self.assertFalse(self.arp_notification.called)
+
+        self.notifier.send_arp_entries()
+        self.assertEqual(2, self.arp_notification.call_count)
+        self.arp_notification.assert_any_call(
+            mock.ANY, 'update_arp_entries', 'router1',
+            {'router_id': 'router1',
+             'arp_entries': [dict(arp_table, operation='add'),
+                             dict(arp_table, operation='delete')]},
+            '1.3')
+        self.arp_notification.assert_any_call(
+            mock.ANY, 'update_arp_entries', 'router2',
+            {'router_id': 'router2',
+             'arp_entries': [dict(arp_table, operation='add')]},
+            '1.3')
+
+        # Nothing left to send once the queue has been flushed.
+        self.arp_notification.reset_mock()
+        self.notifier.send_arp_entries()
+        self.assertFalse(self.arp_notification.called)
+
+    def test_send_arp_entries_failure_does_not_stop_other_routers(self):
+        self.notifier._pending_arp_entries['router1'].append({})
+        self.notifier._pending_arp_entries['router2'].append({})
+        self.arp_notification.side_effect = [RuntimeError(), None]
+        self.notifier.send_arp_entries()
+        self.assertEqual(2, self.arp_notification.call_count)
+
+
 class L3AgentDbIntTestCase(L3BaseForIntTests, L3AgentDbTestCaseBase):
 
     """Unit tests for methods called by the L3 agent for
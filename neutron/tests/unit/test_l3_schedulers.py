@@ -207,6 +207,32 @@ class L3SchedulerBaseTestCase(base.BaseTestCase):
             self.scheduler.bind_routers(mock.ANY, routers, mock.ANY)
         mock_bind.assert_called_once_with(mock.ANY, 'foo_router', mock.ANY)
 
+    def test_choose_router_agents(self):
+        agents = [mock.Mock(id='agent1'), mock.Mock(id='agent2')]
+        load = {'agent1': 0, 'agent2': 0}
+        with mock.patch.object(self.scheduler, '_choose_router_agent',
+                               return_value=agents[1]) as choose:
+            chosen = self.scheduler.choose_router_agents(
+                self.plugin, mock.ANY,
+                [('r1', agents), ('r2', agents[1:])], load)
+        self.assertEqual({'r1': agents[1], 'r2': agents[1]}, chosen)
+        self.assertEqual({'agent1': 0, 'agent2': 2}, load)
+        choose.assert_has_calls([mock.call(self.plugin, mock.ANY, agents),
+                                 mock.call(self.plugin, mock.ANY,
+                                           agents[1:])])
+
+    def test_least_routers_choose_router_agents(self):
+        scheduler = l3_agent_scheduler.LeastRoutersScheduler()
+        agents = [mock.Mock(id='agent1'), mock.Mock(id='agent2')]
+        load = {'agent1': 1, 'agent2': 0}
+        chosen = scheduler.choose_router_agents(
+            self.plugin, mock.ANY,
+            [('r1', agents), ('r2', agents), ('r3', agents)], load)
+        self.assertEqual({'r1': agents[1], 'r2': agents[0],
+                          'r3': agents[1]}, chosen)
+        self.assertEqual({'agent1': 2, 'agent2': 2}, load)
+        self.assertFalse(self.plugin.get_l3_agent_with_min_routers.called)
+
     def test_bind_routers_dvr(self):
         routers = [{'id': 'foo_router', 'distributed': True}]
         agent = agents_db.Agent(id='foo_agent')
@@ -422,6 +422,30 @@ class TestIpWrapper(base.BaseTestCase):
         ip_lib.IPWrapper('sudo').add_device_to_namespace(dev)
         self.assertEqual(dev.mock_calls, [])
 
+    def test_batch(self):
+        with mock.patch.object(ip_lib.utils, 'execute') as execute:
+            ip_lib.IPWrapper('sudo', 'ns').batch(
+                [('neigh', 'replace', '10.0.0.3', 'lladdr',
+                  'fa:16:3e:00:00:01', 'nud', 'permanent', 'dev', 'qr-x'),
+                 ('neigh', 'del', '10.0.0.4', 'dev', 'qr-x')])
+        execute.assert_called_once_with(
+            ['ip', 'netns', 'exec', 'ns', 'ip', '-force', '-batch', '-'],
+            root_helper='sudo',
+            process_input='neigh replace 10.0.0.3 lladdr fa:16:3e:00:00:01 '
+                          'nud permanent dev qr-x\n'
+                          'neigh del 10.0.0.4 dev qr-x\n',
+            log_fail_as_error=True)
+
+    def test_batch_empty(self):
+        with mock.patch.object(ip_lib.utils, 'execute') as execute:
+            ip_lib.IPWrapper('sudo', 'ns').batch([])
+        self.assertFalse(execute.called)
+
+    def test_batch_requires_root_helper(self):
+        self.assertRaises(exceptions.SudoRequired,
+                          ip_lib.IPWrapper(namespace='ns').batch,
+                          [('neigh', 'del', '10.0.0.4', 'dev', 'qr-x')])
+
 
 class TestIpRule(base.BaseTestCase):
     def setUp(self):
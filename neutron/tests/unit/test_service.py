@@ -0,0 +1,73 @@
+# Copyright 2014 OpenStack Foundation.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import contextlib
+
+import mock
+from oslo.config import cfg
+
+from neutron import service
+from neutron.tests import base
+
+
+class TestServeRpc(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestServeRpc, self).setUp()
+        self.plugin = mock.Mock()
+        self.plugin.start_rpc_listeners.return_value = ['plugin']
+        self.plugin.start_rpc_state_reports_listener.return_value = [
+            'reports']
+        mock.patch('neutron.manager.NeutronManager.get_plugin',
+                   return_value=self.plugin).start()
+        mock.patch('neutron.db.api.get_engine').start()
+        self.launcher_cls = mock.patch(
+            'neutron.openstack.common.service.ProcessLauncher').start()
+        self.launcher = self.launcher_cls.return_value
+
+    def test_state_reports_consumed_by_rpc_worker(self):
+        rpc = service.serve_rpc()
+        self.assertIsInstance(rpc, service.RpcWorker)
+        self.assertEqual(['plugin', 'reports'], rpc._servers)
+        self.assertFalse(self.launcher_cls.called)
+
+    def test_state_reports_not_supported(self):
+        self.plugin.rpc_state_report_workers_supported.return_value = False
+        cfg.CONF.set_override('rpc_state_report_workers', 2)
+        rpc = service.serve_rpc()
+        self.assertEqual(['plugin'], rpc._servers)
+        self.assertFalse(self.launcher_cls.called)
+
+    def test_dedicated_state_report_workers(self):
+        cfg.CONF.set_override('rpc_state_report_workers', 2)
+        cfg.CONF.set_override('rpc_workers', 3)
+        self.assertEqual(self.launcher, service.serve_rpc())
+        self.assertEqual(1, self.launcher_cls.call_count)
+        calls = self.launcher.launch_service.call_args_list
+        reports_worker, rpc_worker = [c[0][0] for c in calls]
+        self.assertIsInstance(reports_worker, service.RpcReportsWorker)
+        self.assertEqual(2, calls[0][1]['workers'])
+        self.assertEqual(3, calls[1][1]['workers'])
+        self.assertFalse(rpc_worker._state_reports)
+
+        with contextlib.nested(
+            mock.patch.object(reports_worker, '_plugin', self.plugin)):
+            reports_worker.start()
+        self.assertEqual(['reports'], reports_worker._servers)
+
+    def test_dedicated_state_report_workers_in_process_rpc(self):
+        cfg.CONF.set_override('rpc_state_report_workers', 1)
+        self.assertEqual(self.launcher, service.serve_rpc())
+        self.assertTrue(self.plugin.start_rpc_listeners.called)
+        self.assertFalse(self.plugin.start_rpc_state_reports_listener.called)
@@ -0,0 +1,56 @@
+# Copyright 2014 OpenStack Foundation.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from neutron.common import startup_timing
+from neutron.tests import base
+
+
+class TestStartupTiming(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestStartupTiming, self).setUp()
+        startup_timing.reset()
+        self.addCleanup(startup_timing.reset)
+
+    def test_timed_phases_are_reported_in_order(self):
+        with mock.patch('time.time', side_effect=[0.0, 1.5, 2.0, 2.25,
+                                                  3.0, 3.5]):
+            with startup_timing.timed('plugins'):
+                pass
+            with startup_timing.timed('extensions'):
+                pass
+            with startup_timing.timed('plugins'):
+                pass
+        report = startup_timing.get_report()
+        self.assertEqual(['plugins', 'extensions'], report.keys())
+        self.assertEqual(2.0, report['plugins'])
+        self.assertEqual(0.25, report['extensions'])
+
+    def test_phase_is_recorded_on_error(self):
+        def fail():
+            with startup_timing.timed('db_facade'):
+                raise ValueError()
+        self.assertRaises(ValueError, fail)
+        self.assertIn('db_facade', startup_timing.get_report())
+
+    def test_log_report(self):
+        with mock.patch.object(startup_timing, 'LOG') as log:
+            startup_timing.log_report()
+            self.assertFalse(log.info.called)
+            with startup_timing.timed('api_app'):
+                pass
+            startup_timing.log_report()
+            self.assertTrue(log.info.called)
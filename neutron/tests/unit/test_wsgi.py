@@ -26,6 +26,7 @@ import webob.exc
 from neutron.api.v2 import attributes
 from neutron.common import constants
 from neutron.common import exceptions as exception
+from neutron.openstack.common import jsonutils
 from neutron.tests import base
 from neutron import wsgi
 
@@ -608,6 +609,34 @@ class JSONDictSerializerTest(base.BaseTestCase):
 
         self.assertEqual(result, expected_json)
 
+    def test_serialize_stream(self):
+        items = [{'id': i, 'name': u'\u7f51%d' % i} for i in range(5)]
+        links = [{'rel': 'next', 'href': 'http://localhost/v2.0/n'}]
+        serializer = wsgi.JSONDictSerializer()
+        with mock.patch.object(wsgi, 'STREAM_CHUNK_ITEMS', new=2):
+            chunks = list(serializer.serialize_stream(
+                {'networks': iter(items), 'networks_links': links},
+                'networks'))
+        # opening, three chunks of items, closing, links, end
+        self.assertEqual(7, len(chunks))
+        self.assertEqual({'networks': items, 'networks_links': links},
+                         jsonutils.loads(''.join(chunks)))
+
+    def test_serialize_stream_empty(self):
+        serializer = wsgi.JSONDictSerializer()
+        result = ''.join(serializer.serialize_stream({'networks': iter([])},
+                                                     'networks'))
+        self.assertEqual({'networks': []}, jsonutils.loads(result))
+
+    def test_serialize_stream_without_ujson(self):
+        items = [{'id': 1, 'tags': ('a', 'b')}]
+        serializer = wsgi.JSONDictSerializer()
+        with mock.patch.object(wsgi, 'ujson', new=None):
+            result = ''.join(serializer.serialize_stream(
+                {'networks': iter(items)}, 'networks'))
+        self.assertEqual({'networks': [{'id': 1, 'tags': ['a', 'b']}]},
+                         jsonutils.loads(result))
+
 
 class TextDeserializerTest(base.BaseTestCase):
 
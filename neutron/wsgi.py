@@ -40,6 +40,7 @@ from neutron import context
 from neutron.db import api
 from neutron.openstack.common import excutils
 from neutron.openstack.common import gettextutils
+from neutron.openstack.common import importutils
 from neutron.openstack.common import jsonutils
 from neutron.openstack.common import log as logging
 from neutron.openstack.common import service as common_service
@@ -79,6 +80,13 @@ CONF.register_opts(socket_opts)
 
 LOG = logging.getLogger(__name__)
 
+# Optional faster encoder for the items of streamed collections
+ujson = importutils.try_import('ujson')
+
+# Number of collection items serialized into each chunk of a streamed
+# response body
+STREAM_CHUNK_ITEMS = 100
+
 
 class WorkerService(object):
     """Wraps a worker to be handled by ProcessLauncher"""
@@ -387,13 +395,49 @@ class DictSerializer(ActionDispatcher):
         return ""
 
 
+def _sanitizer(obj):
+    return unicode(obj)
+
+
 class JSONDictSerializer(DictSerializer):
     """Default JSON request body serialization."""
 
     def default(self, data):
-        def sanitizer(obj):
-            return unicode(obj)
-        return jsonutils.dumps(data, default=sanitizer)
+        return jsonutils.dumps(data, default=_sanitizer)
+
+    def _dumps_item(self, item):
+        if ujson:
+            try:
+                return ujson.encode(item)
+            except (TypeError, OverflowError):
+                pass
+        return jsonutils.dumps(item, default=_sanitizer)
+
+    def serialize_stream(self, data, collection):
+        """Serialize data as a sequence of JSON chunks.
+
+        :param data: dict to serialize
+        :param collection: key of data whose value is an iterable of items.
+                           The items are consumed and encoded one at a
+                           time, so the whole collection is never held
+                           in memory as a single string.
+        """
+        yield '{%s: [' % jsonutils.dumps(collection)
+        chunk = []
+        first = True
+        for item in data[collection]:
+            chunk.append(self._dumps_item(item))
+            if len(chunk) >= STREAM_CHUNK_ITEMS:
+                yield ('' if first else ', ') + ', '.join(chunk)
+                chunk = []
+                first = False
+        if chunk:
+            yield ('' if first else ', ') + ', '.join(chunk)
+        yield ']'
+        for key, value in data.iteritems():
+            if key != collection:
+                yield ', %s: %s' % (jsonutils.dumps(key), self.default(value))
+        yield '}'
 
 
 class XMLDictSerializer(DictSerializer):